@@ -5,15 +5,19 @@ import sys
 
 import matplotlib.pyplot as plt
 
+import config
+from core.access import GroundStation, access_windows
+from core.conjunction import screen_conjunctions, trajectories
+
 # Import your functional plotting library
 from visualization.plotter import (animate_orbit, load_data, plot_attitude,
-                                   plot_orbit_3d, plot_telemetry)
+                                   plot_elements, plot_orbit_3d, plot_telemetry)
 
 
 def get_latest_csv(directory="Data"):
-    """Finds the most recently modified CSV file in the directory."""
-    # Get list of all csv files in 'Data/'
-    files = glob.glob(os.path.join(directory, "*.csv"))
+    """Finds the most recently modified telemetry file (CSV or .npy) in the directory."""
+    # Get list of all telemetry files in 'Data/'
+    files = glob.glob(os.path.join(directory, "*.csv")) + glob.glob(os.path.join(directory, "*.npy"))
     
     if not files:
         return None
@@ -22,11 +26,27 @@ def get_latest_csv(directory="Data"):
     latest_file = max(files, key=os.path.getmtime)
     return latest_file
 
+def trail_length(text):
+    """--trail value: seconds, 'orbit' or 'all' (whole history)."""
+    if text == 'orbit':
+        return text
+    return None if text == 'all' else float(text)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Analyze Satellite Simulation Results")
     # nargs='?' makes this argument optional
-    parser.add_argument('file', nargs='?', type=str, help='Path to CSV file (optional)')
+    parser.add_argument('file', nargs='?', type=str, help='Path to telemetry file, CSV or .npy (optional)')
     parser.add_argument('--animate', '-a', action='store_true', help='Enable 3D animation')
+    parser.add_argument('--trail', type=trail_length, default='orbit',
+                        help="Animation trail length in seconds, 'orbit' or 'all' (default: one orbit)")
+    parser.add_argument('--export', type=str, default=None, help='Render the animation headless to a .gif or a frame directory')
+    parser.add_argument('--sat', '-s', action='append', help='Satellite to load (repeatable, default: all)')
+    parser.add_argument('--tstart', type=float, default=None, help='Start of the time window (s)')
+    parser.add_argument('--tend', type=float, default=None, help='End of the time window (s)')
+    parser.add_argument('--conjunctions', type=float, default=None, metavar='DISTANCE',
+                        help='Screen for close approaches below DISTANCE (m) and print them')
+    parser.add_argument('--access', action='store_true', help='Print the access windows over config.GROUND_STATIONS')
+    parser.add_argument('--elements', action='store_true', help='Plot the osculating orbital elements')
     args = parser.parse_args()
 
     filepath = args.file
@@ -37,7 +57,7 @@ if __name__ == "__main__":
         filepath = get_latest_csv()
         
         if not filepath:
-            print("Error: No CSV files found in Data/ directory.")
+            print("Error: No telemetry files found in Data/ directory.")
             sys.exit(1)
             
         print(f"-> Found: {filepath}")
@@ -45,24 +65,43 @@ if __name__ == "__main__":
     # --- Loading & Plotting ---
     print(f"Loading data from {filepath}...")
     try:
-        df = load_data(filepath)
+        df = load_data(filepath, names=args.sat, tstart=args.tstart, tend=args.tend)
     except FileNotFoundError:
         print(f"Error: The file '{filepath}' does not exist.")
         sys.exit(1)
 
+    if args.conjunctions is not None:
+        print(f"Screening for conjunctions below {args.conjunctions:g} m...")
+        times, names, positions, velocities = trajectories(df)
+        encounters = screen_conjunctions(times, positions, velocities, args.conjunctions, names)
+        print(encounters.to_string(index=False) if len(encounters) else "-> None found")
+
+    if args.access:
+        print("Computing ground station access...")
+        times, names, positions, velocities = trajectories(df)
+        stations = [GroundStation(**station) for station in config.GROUND_STATIONS]
+        windows = access_windows(times, positions, velocities, stations, names)
+        print(windows.to_string(index=False) if len(windows) else "-> No access")
+
     print("Generating Telemetry...")
     plot_telemetry(df)
 
     print("Generating Attitude...")  # <--- Add this section
     plot_attitude(df)
     
+    if args.elements:
+        print("Generating Orbital Elements...")
+        plot_elements(df)
+
     print("Generating 3D Orbit...")
     plot_orbit_3d(df)
 
     ani = None
-    if args.animate:
+    if args.export:
+        animate_orbit(df, save_path=args.export, trail_length=args.trail)
+    elif args.animate:
         print("Animating the orbits")
-        ani = animate_orbit(df)
+        ani = animate_orbit(df, trail_length=args.trail)
     
     # Show all plots at once
     plt.show()
\ No newline at end of file
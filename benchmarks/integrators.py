@@ -0,0 +1,78 @@
+"""
+Compares the in-house integrators against the solve_ivp path.
+
+Every integrator propagates the same three satellites for DURATION seconds in
+DT steps. Accuracy is the worst position / angular velocity error against a
+tight-tolerance DOP853 reference.
+
+Usage: python -m benchmarks.integrators [--duration 600]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import config
+from core.engine import PhysicsEngine, ScipyIntegrator, make_integrator
+from environments import TwoBodyJ2
+from objects import Satellite
+from utils import Quaternion
+
+CASES = [
+    ('solve_ivp', {}),
+    ('rk4', {}),
+    ('rk8', {}),
+    ('rk23', {}),
+    ('rk45', {}),
+]
+
+
+def make_constellation():
+    """The three satellites from main.py."""
+    return [
+        Satellite('Sat1', 500, np.diag([10, 10, 2]),
+                  (0, 0, 1500000 + config.EARTH_RADIUS), (9000, 0, 0),
+                  Quaternion(1, 2, 3, 4), (0, 0, 0)),
+        Satellite('Sat2', 500, np.diag([400, 300, 500]),
+                  (0, 0, 400000 + config.EARTH_RADIUS), (7800*np.cos(45), 7800*np.sin(45), 0),
+                  Quaternion(1, 2, 3, 4), (1e-6, 3e-6, -1e-6)),
+        Satellite('Sat3', 500, np.diag([2, 2, 10]),
+                  (8328870., 0., 0.), (0., -5281.6014113, 4521.0159543),
+                  Quaternion(1, 2, 3, 4), (1e-12, 0, 0)),
+    ]
+
+
+def run(engine, constellation, duration, dt):
+    t = 0.0
+    start = time.perf_counter()
+    while t < duration:
+        for sat in constellation:
+            engine.propagate(sat, t, dt)
+        t += dt
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Integrator speed/accuracy comparison")
+    parser.add_argument('--duration', type=float, default=600.0, help='Simulated seconds per case')
+    parser.add_argument('--dt', type=float, default=config.DT, help='Propagation step (s)')
+    args = parser.parse_args()
+
+    env = TwoBodyJ2(config.EARTH_RADIUS, config.EARTH_MASS, config.EARTH_J2)
+
+    reference = make_constellation()
+    run(PhysicsEngine(env, ScipyIntegrator('DOP853', rtol=1e-12, atol=1e-12)), reference, args.duration, args.dt)
+
+    print(f"{'integrator':<12}{'wall (s)':>10}{'nfev':>10}{'pos err (m)':>14}{'w err (rad/s)':>16}")
+    for name, options in CASES:
+        integrator = make_integrator(name, **options)
+        constellation = make_constellation()
+        wall = run(PhysicsEngine(env, integrator), constellation, args.duration, args.dt)
+
+        pos_err = max(np.linalg.norm(s.position - r.position) for s, r in zip(constellation, reference))
+        rate_err = max(np.linalg.norm(s.angular_velocity - r.angular_velocity) for s, r in zip(constellation, reference))
+        print(f"{name:<12}{wall:>10.3f}{integrator.nfev:>10d}{pos_err:>14.3e}{rate_err:>16.3e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+Benchmark suite for the simulation hot paths.
+
+Micro benchmarks time single calls of the kernels (quaternion ops, the
+environment forces/torques, the equations of motion); macro benchmarks time
+whole scenarios (N satellites propagated for T seconds, telemetry logging and
+loading). Every case reports the best per-unit time over several repeats,
+which is the most stable statistic on a shared machine.
+
+Results are written as JSON. When a baseline file exists, every case is
+compared against it and cases slower than the baseline by more than the
+tolerance are flagged as regressions (exit code 1).
+
+Usage:
+    python -m benchmarks.suite                       # run, compare to benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline       # run and make this the baseline
+    python -m benchmarks.suite --filter eom --quick  # subset, fewer repeats
+"""
+import os
+
+# Pin the BLAS thread pools before NumPy is imported, so timings do not
+# depend on the core count of the machine
+for _var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(_var, '1')
+
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+import config
+from core import DataLogger, PhysicsEngine
+from core.analytic import MeanElementPropagator
+from environments import ChebyshevEphemeris, TabulatedAtmosphere, TwoBodyJ2
+from objects import Constellation, Satellite
+from utils import Quaternion, quat_multiply, quat_rate, quat_rotate, quat_to_dcm
+from visualization.plotter import load_data
+
+from .integrators import make_constellation
+
+BASELINE = os.path.join('benchmarks', 'baseline.json')
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+MIN_REPEAT_TIME = 0.05 # s, each repeat runs the case at least this long
+SEED = 12345
+
+BENCHMARKS = []
+
+
+def benchmark(name, group, unit='call'):
+    """
+    Registers a benchmark. The decorated function does the setup and returns
+    (fn, units): fn() runs the timed work, which covers `units` units.
+    """
+    def register(setup):
+        BENCHMARKS.append({'name': name, 'group': group, 'unit': unit, 'setup': setup})
+        return setup
+    return register
+
+
+def make_satellites(n, seed=SEED):
+    """n satellites cloned from the main.py three, with seeded position/rate offsets."""
+    rng = np.random.default_rng(seed)
+    templates = make_constellation()
+    satellites = []
+    for i in range(n):
+        template = templates[i % len(templates)]
+        satellites.append(Satellite(
+            f'{template.name}_{i}', template.mass, template.inertia,
+            template.position + rng.normal(0.0, 1e4, 3),
+            template.velocity + rng.normal(0.0, 1.0, 3),
+            template.attitude,
+            template.angular_velocity + rng.normal(0.0, 1e-4, 3)
+        ))
+    return satellites
+
+
+def make_environment(drag=False, third_bodies=False):
+    atmosphere = TabulatedAtmosphere.exponential() if drag else None
+    ephemeris = ChebyshevEphemeris(config.EPOCH, 0.0, 86400.0) if third_bodies else None
+    return TwoBodyJ2(config.EARTH_RADIUS, config.EARTH_MASS, config.EARTH_J2, atmosphere, ephemeris)
+
+
+# Micro benchmarks
+
+@benchmark('quaternion.multiply', 'micro')
+def _quaternion_multiply():
+    p, q = Quaternion(1, 2, 3, 4), Quaternion(0.3, -0.1, 0.7, 0.2)
+    return (lambda: p @ q), 1
+
+@benchmark('quaternion.rotate_vector', 'micro')
+def _quaternion_rotate():
+    q, v = Quaternion(1, 2, 3, 4), np.array([1.0, -2.0, 0.5])
+    return (lambda: q.rotate_vector(v)), 1
+
+@benchmark('quaternion.normalize', 'micro')
+def _quaternion_normalize():
+    q = Quaternion(1, 2, 3, 4)
+    return q.normalize, 1
+
+@benchmark('quaternion.to_dcm', 'micro')
+def _quaternion_to_dcm():
+    q = Quaternion(1, 2, 3, 4)
+    return q.to_dcm, 1
+
+@benchmark('quaternion.rate_of_change', 'micro')
+def _quaternion_rate():
+    q, omega = Quaternion(1, 2, 3, 4), np.array([1e-3, -2e-3, 5e-4])
+    return (lambda: q.rate_of_change(omega)), 1
+
+@benchmark('quaternion.kernels_batch_1000', 'micro', unit='quaternion')
+def _quaternion_kernels_batch():
+    rng = np.random.default_rng(SEED)
+    q = rng.normal(size=(1000, 4))
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    v, omega = rng.normal(size=(1000, 3)), rng.normal(size=(1000, 3))
+    out4, out3, out33 = np.empty((1000, 4)), np.empty((1000, 3)), np.empty((1000, 3, 3))
+
+    def run():
+        quat_multiply(q, q, out4)
+        quat_rotate(q, v, out3)
+        quat_to_dcm(q, out33)
+        quat_rate(q, omega, out4)
+    return run, 1000
+
+@benchmark('environment.get_forces', 'micro')
+def _get_forces():
+    env, sat = make_environment(), make_constellation()[1]
+    return (lambda: env.get_forces(0.0, sat.state, sat)), 1
+
+@benchmark('environment.get_torques', 'micro')
+def _get_torques():
+    env, sat = make_environment(), make_constellation()[1]
+    return (lambda: env.get_torques(0.0, sat.state, sat)), 1
+
+@benchmark('environment.get_forces_batch_100', 'micro', unit='satellite')
+def _get_forces_batch():
+    env, constellation = make_environment(), Constellation(make_satellites(100))
+    return (lambda: env.get_forces_batch(0.0, constellation.states, constellation)), 100
+
+@benchmark('environment.get_torques_batch_100', 'micro', unit='satellite')
+def _get_torques_batch():
+    env, constellation = make_environment(), Constellation(make_satellites(100))
+    return (lambda: env.get_torques_batch(0.0, constellation.states, constellation)), 100
+
+@benchmark('environment.get_forces_torques_drag', 'micro')
+def _drag():
+    env, sat = make_environment(drag=True), make_constellation()[1]
+    sat.ballistic_coefficient = 60.0
+    return (lambda: (env.get_forces(0.0, sat.state, sat), env.get_torques(0.0, sat.state, sat))), 1
+
+@benchmark('environment.get_forces_torques_drag_batch_100', 'micro', unit='satellite')
+def _drag_batch():
+    env, constellation = make_environment(drag=True), Constellation(make_satellites(100))
+    constellation.ballistic_coefficients[:] = 60.0
+    return (lambda: (env.get_forces_batch(0.0, constellation.states, constellation),
+                     env.get_torques_batch(0.0, constellation.states, constellation))), 100
+
+@benchmark('environment.get_forces_third_body_srp', 'micro')
+def _third_body():
+    env, sat = make_environment(third_bodies=True), make_constellation()[1]
+    sat.srp_area = 2.0
+    return (lambda: env.get_forces(0.0, sat.state, sat)), 1
+
+@benchmark('environment.get_forces_third_body_srp_batch_100', 'micro', unit='satellite')
+def _third_body_batch():
+    env, constellation = make_environment(third_bodies=True), Constellation(make_satellites(100))
+    constellation.srp_areas[:] = 2.0
+    return (lambda: env.get_forces_batch(0.0, constellation.states, constellation)), 100
+
+@benchmark('engine.eom', 'micro')
+def _eom():
+    engine, sat = PhysicsEngine(make_environment()), make_constellation()[1]
+    return (lambda: engine.eom(0.0, sat.state, sat)), 1
+
+@benchmark('engine.eom_batch_100', 'micro', unit='satellite')
+def _eom_batch():
+    engine, constellation = PhysicsEngine(make_environment()), Constellation(make_satellites(100))
+    y = constellation.states.reshape(-1).copy()
+    return (lambda: engine.eom_batch(0.0, y, constellation)), 100
+
+# Macro benchmarks
+
+def _propagation(n_sats, duration, mode):
+    def setup():
+        engine = PhysicsEngine(make_environment())
+        satellites = make_satellites(n_sats)
+        constellation = Constellation(satellites)
+        initial = constellation.states.copy()
+
+        def run():
+            constellation.states[:] = initial
+            t = 0.0
+            while t < duration:
+                if mode == 'batch':
+                    engine.propagate_batch(constellation, t, config.DT)
+                else:
+                    for sat in constellation:
+                        engine.propagate(sat, t, config.DT)
+                t += config.DT
+        # Unit: one satellite-second of simulated time
+        return run, n_sats * duration
+    return setup
+
+for _n, _duration in ((3, 60), (30, 60)):
+    for _mode in ('single', 'batch'):
+        benchmark(f'propagate.{_mode}_{_n}sat_{_duration}s', 'macro', unit='satellite-second')(
+            _propagation(_n, _duration, _mode))
+
+@benchmark('propagate.analytic_1000sat_600s', 'macro', unit='satellite-second')
+def _analytic():
+    propagator = MeanElementPropagator()
+    states = Constellation(make_satellites(1000)).states.copy()
+    times = np.arange(0.0, 600.0, config.DT)
+    return (lambda: propagator.propagate(states, 0.0, times)), 1000 * times.size
+
+
+def _logging(fmt, n_sats=30, steps=200):
+    def setup():
+        constellation = Constellation(make_satellites(n_sats))
+        directory = tempfile.mkdtemp(prefix='bench_')
+        path = os.path.join(directory, f'telemetry.{fmt}')
+
+        def run():
+            logger = DataLogger(path)
+            for k in range(steps):
+                logger.log_constellation(float(k), constellation)
+            logger.close()
+        return run, n_sats * steps, (lambda: shutil.rmtree(directory, ignore_errors=True))
+    return setup
+
+def _loading(fmt, n_sats=30, steps=2000):
+    def setup():
+        constellation = Constellation(make_satellites(n_sats))
+        directory = tempfile.mkdtemp(prefix='bench_')
+        path = os.path.join(directory, f'telemetry.{fmt}')
+        logger = DataLogger(path)
+        for k in range(steps):
+            logger.log_constellation(float(k), constellation)
+        logger.close()
+
+        def run():
+            load_data(path)
+            # Drop the reader's sidecar index so every repeat does the same work
+            if os.path.exists(path + '.idx.json'):
+                os.remove(path + '.idx.json')
+        return run, n_sats * steps, (lambda: shutil.rmtree(directory, ignore_errors=True))
+    return setup
+
+for _fmt in ('csv', 'npy'):
+    benchmark(f'logging.write_{_fmt}', 'macro', unit='row')(_logging(_fmt))
+    benchmark(f'logging.load_{_fmt}', 'macro', unit='row')(_loading(_fmt))
+
+
+def measure(fn, repeat):
+    """
+    Best and median time of one fn() call over `repeat` repeats, each repeat
+    looping fn enough times to last MIN_REPEAT_TIME.
+    """
+    fn() # Warm-up (imports, caches, first-touch allocations)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_REPEAT_TIME:
+            break
+        number = max(2 * number, int(number * MIN_REPEAT_TIME / max(elapsed, 1e-9)))
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return min(samples), float(np.median(samples)), number
+
+
+def run_benchmarks(pattern=None, repeat=5):
+    results = {}
+    for case in BENCHMARKS:
+        if pattern and pattern not in case['name']:
+            continue
+        setup = case['setup']()
+        fn, units = setup[0], setup[1]
+        try:
+            best, median, number = measure(fn, repeat)
+        finally:
+            if len(setup) > 2:
+                setup[2]()
+        results[case['name']] = {
+            'group': case['group'],
+            'unit': case['unit'],
+            'seconds_per_unit': best / units,
+            'median_seconds_per_unit': median / units,
+            'units_per_second': units / best,
+            'loops': number,
+            'repeats': repeat,
+        }
+        print(f"{case['name']:<40}{best / units * 1e6:>14.3f} us/{case['unit']}")
+    return results
+
+
+def machine_info():
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    {name: ratio} of current / baseline time, and the names whose ratio is
+    above 1 + tolerance.
+    """
+    ratios, regressions = {}, []
+    for name, entry in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+        ratio = entry['seconds_per_unit'] / reference['seconds_per_unit']
+        ratios[name] = ratio
+        if ratio > 1.0 + tolerance:
+            regressions.append(name)
+    return ratios, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation benchmark suite")
+    parser.add_argument('--filter', default=None, help='Only run cases whose name contains this string')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repeats per case')
+    parser.add_argument('--quick', action='store_true', help='Shortcut for --repeat 2')
+    parser.add_argument('--output', default=None, help='Results JSON (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', default=BASELINE, help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Also write the results to the baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed slowdown before a case is flagged (fraction)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.filter, 2 if args.quick else args.repeat)
+    report = {'machine': machine_info(), 'results': results}
+
+    status = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        ratios, regressions = compare(results, baseline, args.tolerance)
+        report['baseline'] = {'path': args.baseline, 'machine': baseline.get('machine'),
+                              'ratios': ratios, 'regressions': regressions, 'tolerance': args.tolerance}
+
+        print(f"\n{'case':<40}{'vs baseline':>14}")
+        for name, ratio in ratios.items():
+            flag = '  REGRESSION' if name in regressions else ''
+            print(f"{name:<40}{ratio:>13.2f}x{flag}")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.tolerance:.0%}")
+            status = 1
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
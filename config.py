@@ -2,13 +2,47 @@
 DT = 1.0  # s 
 T0 = 0 # s (Make these datetimes)
 TF = 10000 # s
+PROPAGATION_MODE = 'batch' # 'single' (one solve per satellite per DT), 'batch' (whole constellation per DT), 'multirate' (orbit per DT, attitude sub-cycled at ATTITUDE_DT) or 'arc' (one dense-output solve over [T0, TF] per satellite) or 'analytic' (J2 mean elements, orbit only, core.analytic)
+ATTITUDE_DT = 0.1 # s, attitude sub-step in 'multirate' mode
+ORBIT_DT = None # s, orbit step in 'multirate' mode, not capped by DT; telemetry is then taken from the orbit's dense output (None = DT).
+                # Controller and checkpoint events still end an orbit step. Multirate only beats 'batch' when the attitude needs
+                # ATTITUDE_DT-sized steps anyway (fast spinners): the attitude sub-cycling dominates the cost otherwise
+LOG_FORMAT = 'csv' # Telemetry format: 'csv' or 'npy' (binary, much faster to write and load)
+LOG_ASYNC = False # Write telemetry from a background thread
+# Per-satellite logging policy (None = every column of every satellite at every DT).
+# Keys are satellite names or 'default'; values are core.logger.LogPolicy kwargs:
+#   'rates': {group: period_s} for the groups 'orbit', 'attitude', 'mass'
+#   'windows': [(t_start, t_end), ...] logged at full rate
+#   'triggers': [{'condition': f(time, values) -> bool, 'pre': s, 'post': s}, ...]
+# e.g. {'default': {'rates': {'orbit': 60.0, 'mass': 600.0}},
+#       'Sat1': {'rates': {'orbit': 60.0, 'attitude': 1.0}, 'windows': [(1000, 1200)]}}
+LOG_POLICY = None
+INTEGRATOR = 'solve_ivp' # 'solve_ivp', 'rk4', 'rk8', 'rk23' or 'rk45' (see core.engine.INTEGRATORS)
+INTEGRATOR_OPTIONS = {} # e.g. {'step': 1.0} for rk4/rk8, {'rtol': 1e-6, 'atol': 1e-9} for the others
+PROFILE = False # Instrument the run (core.profiling.Profiler): writes <output>.profile.json and a Chrome trace <output>.trace.json
+CHECKPOINT_INTERVAL = None # s of sim time between checkpoints (<output>.ckpt.npz, resume with main.py --resume); None = off. Not used in 'arc' or 'analytic' mode
+CACHE_DIR = None # Result cache directory (core.cache): re-runs of the same scenario reuse the stored telemetry, longer ones continue from it; None = off. Not used in 'arc' or 'analytic' mode
+CACHE_MAX_BYTES = 2e9 # Disk budget of the result cache; least recently used runs are deleted first
 
 # Environment params
 G = 6.67430e-11
 EARTH_MASS = 5.972e24
 EARTH_J2 = 1.08263e-3
 EARTH_RADIUS = 6378137.0  # m (Equatorial)
+ATMOSPHERE = None # Drag density model: None (no drag, default) or 'exponential' (tabulated, environments.atmosphere); opt in to add drag forces and torques
+GRAVITY_FIELD = None # Path to a fully normalized coefficient file (ICGEM .gfc, 'n m C S' table or .npz); None = TwoBodyJ2
+GRAVITY_DEGREE = 20 # Degree truncation of GRAVITY_FIELD
+GRAVITY_ORDER = None # Order truncation (None = GRAVITY_DEGREE)
+EPOCH = '2026-01-01T00:00:00' # UTC date of sim time 0, for the Sun/Moon ephemeris
+THIRD_BODIES = () # Third-body gravity (environments.ephemeris), off by default; opt in with ('sun', 'moon'). SRP needs 'sun'
+SHADOW_MODEL = 'conical' # Earth shadow for SRP: 'conical' (umbra + penumbra) or 'cylindrical'
 
 # System configs
-EST_FREQ = 10 # Hz
-CONT_FREQ = 5 # Hz
\ No newline at end of file
+# For the 10 Hz / 5 Hz GNC loop set EST_FREQ = 10 and CONT_FREQ = 5 and fill in estimate() / control() in
+# main.py (placeholders for now). The controller ends a physics step at every update; the estimator does not.
+EST_FREQ = None # Hz, estimator task rate; runs on the interpolated state without splitting the physics step (None = no estimator task)
+CONT_FREQ = None # Hz, controller task rate; control inputs are held between updates, so the physics step ends at every update (None = no controller task)
+GROUND_STATIONS = [ # core.access.GroundStation kwargs (deg, m), used by analyze.py --access
+    {'name': 'Svalbard', 'latitude': 78.23, 'longitude': 15.41, 'altitude': 500.0, 'min_elevation': 5.0},
+    {'name': 'Kourou', 'latitude': 5.25, 'longitude': -52.80, 'altitude': 10.0, 'min_elevation': 5.0},
+]
\ No newline at end of file
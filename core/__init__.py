@@ -1,4 +1,4 @@
-from .engine import PhysicsEngine
+from .engine import PhysicsEngine, make_integrator
 from .logger import DataLogger
 
-__all__ = ['PhysicsEngine', 'DataLogger']
\ No newline at end of file
+__all__ = ['PhysicsEngine', 'make_integrator', 'DataLogger']
\ No newline at end of file
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+from utils.constants import EARTH_ROTATION_RATE
+from utils.frames import eci_to_ecef, enu_basis, geodetic_to_ecef, look_angles
+
+from .conjunction import hermite
+
+WINDOW_COLUMNS = ['station', 'satellite', 'rise', 'set', 'duration', 'max_elevation']
+
+
+class GroundStation:
+    """
+    A ground site with an elevation mask.
+
+    :param name: Station name
+    :param latitude: Geodetic latitude (deg)
+    :param longitude: Longitude (deg, East positive)
+    :param altitude: Height above the ellipsoid (m)
+    :param min_elevation: Elevation mask (deg)
+    """
+    def __init__(self, name, latitude, longitude, altitude=0.0, min_elevation=0.0):
+        self.name = name
+        self.latitude = np.radians(latitude)
+        self.longitude = np.radians(longitude)
+        self.altitude = altitude
+        self.min_elevation = np.radians(min_elevation)
+        self.position = geodetic_to_ecef(self.latitude, self.longitude, altitude)
+        self.basis = enu_basis(self.latitude, self.longitude)
+
+    def look_angles(self, position_ecef):
+        """Azimuth, elevation (rad) and range (m) of (..., 3) ECEF positions."""
+        return look_angles(self.position, self.basis, position_ecef)
+
+    def elevation(self, position_ecef):
+        """Elevation (rad) of (..., 3) ECEF positions."""
+        return self.look_angles(position_ecef)[1]
+
+
+def _candidate_samples(station, times, positions, velocities, coarse, margin):
+    """
+    (N, T) mask of the samples inside coarse intervals where the satellite
+    may be above the station's mask.
+
+    On a sphere through the station, a satellite at radius r is above
+    elevation e when its central angle psi from the station is below
+    lambda(r) = acos(R cos(e) / r) - e. The margin psi - lambda changes
+    at most at |v| / r + w_E plus the rate of lambda through r, so an
+    interval whose end margins cannot reach zero in between is skipped
+    without looking at its inner samples.
+    """
+    t = times[coarse]
+    r_ecef = eci_to_ecef(positions[:, coarse], t)
+    r = np.linalg.norm(r_ecef, axis=2)
+    speed = np.linalg.norm(velocities[:, coarse], axis=2)
+    R = np.linalg.norm(station.position)
+    up = station.position / R
+    k = R * np.cos(station.min_elevation)
+
+    psi = np.arccos(np.clip((r_ecef @ up) / r, -1.0, 1.0))
+    ratio = np.minimum(k / r, 1.0)
+    lam = np.arccos(ratio) - station.min_elevation
+    rate = speed / r + EARTH_ROTATION_RATE + ratio / np.sqrt(np.maximum(1.0 - ratio**2, 1e-12)) * speed / r
+
+    m = psi - lam
+    h = np.diff(t)
+    reach = 1.1 * np.maximum(rate[:, :-1], rate[:, 1:]) * h # 10% safety on the rate bound
+    flagged = 0.5 * (m[:, :-1] + m[:, 1:] - reach) < margin
+
+    # Mark the samples coarse[k]..coarse[k + 1] of every flagged interval
+    N, T = positions.shape[:2]
+    edges = np.zeros((N, T + 1), dtype=np.int64)
+    n, c = np.nonzero(flagged)
+    np.add.at(edges, (n, coarse[c]), 1)
+    np.add.at(edges, (n, coarse[c + 1] + 1), -1)
+    return np.cumsum(edges[:, :T], axis=1) > 0
+
+
+def _elevation_at(station, times, positions, velocities, n, k, t):
+    """Elevation (rad) of satellites n at times t inside samples [k, k + 1]."""
+    h = times[k + 1] - times[k]
+    s = ((t - times[k]) / h)[:, None]
+    p, _, _ = hermite(positions[n, k], velocities[n, k], positions[n, k + 1], velocities[n, k + 1], h, s)
+    return station.elevation(eci_to_ecef(p[:, 0], t))
+
+
+def access_windows(times, positions, velocities, stations, names=None, step=60.0, tol=1e-3):
+    """
+    Rise/set windows of every satellite over every ground station.
+
+    1. Bracketing: satellites are checked on a coarse grid (about every
+       `step` seconds) with a geometric bound on how fast they can enter a
+       station's visibility cone; only the logged samples inside intervals
+       that may contain a pass are evaluated.
+    2. Root-finding: each sign change of (elevation - mask) between two
+       logged samples is refined by bisection on the cubic Hermite
+       interpolation of the state, to `tol` seconds, for all brackets at
+       once.
+
+    Passes already in progress at the first or last sample start or end
+    there.
+
+    :param times: (T,) sample times (s)
+    :param positions: (N, T, 3) ECI positions (m)
+    :param velocities: (N, T, 3) ECI velocities (m/s)
+    :param stations: GroundStation list
+    :param names: Satellite names (default: indices)
+    :param step: Coarse bracketing step (s)
+    :param tol: Time tolerance of rise and set (s)
+    :return: DataFrame of windows (WINDOW_COLUMNS; max_elevation in deg,
+        from the logged samples of the pass), sorted by rise time
+    """
+    times = np.asarray(times, dtype=float)
+    N, T = positions.shape[:2]
+    names = list(range(N)) if names is None else list(names)
+    stride = max(1, int(round(step / np.median(np.diff(times))))) if T > 1 else 1
+    coarse = np.arange(0, T, stride)
+    if coarse[-1] != T - 1:
+        coarse = np.append(coarse, T - 1)
+
+    windows = []
+    for station in stations:
+        # 1. Elevation at the candidate samples only, sorted by (satellite, sample)
+        if T > 1:
+            mask = _candidate_samples(station, times, positions, velocities, coarse, np.radians(0.5))
+        else:
+            mask = np.ones((N, T), dtype=bool)
+        n, k = np.nonzero(mask)
+        if n.size == 0:
+            continue
+        elevation = station.elevation(eci_to_ecef(positions[n, k], times[k]))
+        above = elevation > station.min_elevation
+
+        # 2. Brackets between consecutive samples, and run edges
+        follows = (n[1:] == n[:-1]) & (k[1:] == k[:-1] + 1)
+        rising = follows & ~above[:-1] & above[1:]
+        setting = follows & above[:-1] & ~above[1:]
+        run_start = np.concatenate(([True], ~follows))
+        run_end = np.concatenate((~follows, [True]))
+
+        brackets = np.flatnonzero(rising | setting)
+        lo, hi = times[k[brackets]], times[k[brackets] + 1]
+        bn, bk = n[brackets], k[brackets]
+        rises_up = rising[brackets]
+        for _ in range(int(np.ceil(np.log2(max(np.max(hi - lo, initial=0.0), tol) / tol)))):
+            mid = 0.5 * (lo + hi)
+            up = _elevation_at(station, times, positions, velocities, bn, bk, mid) > station.min_elevation
+            # Move the end with the same visibility as the midpoint
+            move_hi = up == rises_up
+            hi = np.where(move_hi, mid, hi)
+            lo = np.where(move_hi, lo, mid)
+        crossing = 0.5 * (lo + hi)
+
+        # 3. Pair rises and sets per satellite (they alternate in time)
+        start_above = np.flatnonzero(run_start & above)
+        end_above = np.flatnonzero(run_end & above)
+        rise_n = np.concatenate((bn[rises_up], n[start_above]))
+        rise_t = np.concatenate((crossing[rises_up], times[k[start_above]]))
+        set_n = np.concatenate((bn[~rises_up], n[end_above]))
+        set_t = np.concatenate((crossing[~rises_up], times[k[end_above]]))
+        rise_order = np.lexsort((rise_t, rise_n))
+        set_order = np.lexsort((set_t, set_n))
+        sat, rise, set_ = rise_n[rise_order], rise_t[rise_order], set_t[set_order]
+
+        # Highest logged elevation of each pass
+        key = n * T + k
+        first = np.searchsorted(key, sat * T + np.searchsorted(times, rise, side='left'), side='left')
+        last = np.searchsorted(key, sat * T + np.searchsorted(times, set_, side='right') - 1, side='right')
+        peak = np.full(sat.size, station.min_elevation)
+        for p in np.flatnonzero(last > first):
+            peak[p] = max(peak[p], elevation[first[p]:last[p]].max())
+
+        windows.append(pd.DataFrame({
+            'station': station.name,
+            'satellite': [names[i] for i in sat],
+            'rise': rise,
+            'set': set_,
+            'duration': set_ - rise,
+            'max_elevation': np.degrees(peak),
+        }, columns=WINDOW_COLUMNS))
+
+    if not windows:
+        return pd.DataFrame(columns=WINDOW_COLUMNS)
+    return pd.concat(windows, ignore_index=True).sort_values('rise', kind='stable').reset_index(drop=True)
@@ -0,0 +1,103 @@
+import numpy as np
+
+import config
+from utils.orbits import cartesian_to_kepler, kepler_to_cartesian, mean_to_true, true_to_mean
+
+
+class MeanElementPropagator:
+    """
+    Analytic J2 mean-element propagator for fast, coarse constellation
+    sweeps.
+
+    Orbits are propagated as Keplerian ellipses whose RAAN, argument of
+    perigee and mean anomaly drift at the first-order J2 secular rates;
+    a, e and i are constant. There is no drag, third body or short-period
+    J2 term, so positions differ from the numerical engine by the
+    short-period amplitude plus a slow along-track drift (about 10-50 km
+    over a few orbits in LEO): fine for coverage or geometry sweeps, not
+    for precise work. Attitude and angular velocity are carried unchanged.
+
+    Everything is vectorized over (N satellites) x (T times); one call
+    replaces N * T integrator steps.
+
+    :param radius: Reference radius of J2 (m)
+    :param mass: Central body mass (kg)
+    :param j2: J2 coefficient
+    """
+    def __init__(self, radius=config.EARTH_RADIUS, mass=config.EARTH_MASS, j2=config.EARTH_J2):
+        self.radius = radius
+        self.mass = mass
+        self.j2 = j2
+        self.mu = config.G * mass
+
+    def rates(self, a, e, i):
+        """
+        Secular rates (rad/s) of RAAN, argument of perigee and mean anomaly
+        (the latter including the mean motion).
+        """
+        n = np.sqrt(self.mu / a**3)
+        k = 0.75 * n * self.j2 * (self.radius / (a * (1.0 - e**2)))**2
+        cos_i2 = np.cos(i)**2
+        raan_rate = -2.0 * k * np.cos(i)
+        perigee_rate = k * (5.0 * cos_i2 - 1.0)
+        mean_anomaly_rate = n + k * np.sqrt(1.0 - e**2) * (3.0 * cos_i2 - 1.0)
+        return raan_rate, perigee_rate, mean_anomaly_rate
+
+    def elements(self, states):
+        """
+        Mean elements (a, e, i, Omega, omega, M), each (N,), of (N, >=6)
+        states [r, v, ...].
+
+        The semi-major axis has its first-order J2 short-period term
+        removed (Kozai), since it sets the mean motion and so the
+        along-track drift; the other osculating elements are used as mean.
+        """
+        states = np.atleast_2d(states)
+        a, e, i, Omega, omega, nu = cartesian_to_kepler(states[:, 0:3], states[:, 3:6], self.mu)
+
+        p = a * (1.0 - e**2)
+        a_r3 = ((1.0 + e * np.cos(nu)) * a / p)**3 # (a / r)^3
+        sin_i2 = np.sin(i)**2
+        a = a - self.j2 * self.radius**2 / a * (
+            (1.0 - 1.5 * sin_i2) * (a_r3 - (1.0 - e**2)**-1.5) + 1.5 * sin_i2 * a_r3 * np.cos(2.0 * (omega + nu))
+        )
+        return a, e, i, Omega, omega, true_to_mean(nu, e)
+
+    def propagate_elements(self, elements, epoch, times):
+        """
+        Positions and velocities of every satellite at every time.
+
+        :param elements: Mean elements (a, e, i, Omega, omega, M) at epoch, each (N,)
+        :param epoch: Epoch of the elements (s)
+        :param times: (T,) output times (s)
+        :return: (positions, velocities), each (N, T, 3)
+        """
+        a, e, i, Omega, omega, M = (np.asarray(x, dtype=float)[:, None] for x in elements)
+        dt = np.asarray(times, dtype=float)[None, :] - epoch
+        raan_rate, perigee_rate, mean_anomaly_rate = self.rates(a, e, i)
+
+        nu = mean_to_true(M + mean_anomaly_rate * dt, e)
+        return kepler_to_cartesian(a, e, i, Omega + raan_rate * dt, omega + perigee_rate * dt, nu, self.mu)
+
+    def propagate(self, states, epoch, times):
+        """
+        Full 13-element states [r, v, q, w] of (N, 13) initial states at
+        `epoch`, at every time.
+
+        :return: (N, T, 13) states
+        """
+        states = np.atleast_2d(states)
+        positions, velocities = self.propagate_elements(self.elements(states), epoch, times)
+        out = np.empty(positions.shape[:2] + (13,))
+        out[..., 0:3] = positions
+        out[..., 3:6] = velocities
+        out[..., 6:13] = states[:, None, 6:13]
+        return out
+
+    def propagate_constellation(self, constellation, epoch, times):
+        """(N, T, 13) states of a Constellation (or Satellite list) from its current states."""
+        if hasattr(constellation, 'states'):
+            states = constellation.states
+        else:
+            states = np.array([sat.state for sat in constellation])
+        return self.propagate(states, epoch, times)
@@ -0,0 +1,154 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from .checkpoint import ARRAYS, environment_parameters
+
+# Settings that do not change the results (TF is handled by partial reuse)
+IGNORED_SETTINGS = ('TF', 'LOG_ASYNC', 'PROFILE', 'CHECKPOINT_INTERVAL', 'GROUND_STATIONS', 'CACHE_DIR', 'CACHE_MAX_BYTES')
+# Source trees hashed into the key, so that editing a model invalidates its results
+SOURCE_PACKAGES = ('core', 'environments', 'objects', 'utils')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _default(value):
+    """JSON fallback for the values found in run definitions."""
+    if isinstance(value, np.ndarray):
+        return 'sha1:' + hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    code = getattr(value, '__code__', None)
+    if code is not None: # e.g. a logging trigger condition: identified by its bytecode and constants
+        return f"code:{value.__qualname__}:" + hashlib.sha1(code.co_code + repr(code.co_consts).encode()).hexdigest()
+    raise TypeError(f"Cannot hash {type(value).__name__} {value!r} into a run definition")
+
+
+def source_digest(paths=None):
+    """SHA-1 of the Python sources under `paths` (default: SOURCE_PACKAGES)."""
+    digest = hashlib.sha1()
+    for path in paths if paths is not None else SOURCE_PACKAGES:
+        path = os.path.join(ROOT, path)
+        files = [path] if os.path.isfile(path) else sorted(glob.glob(os.path.join(path, '**', '*.py'), recursive=True))
+        for filepath in files:
+            digest.update(os.path.relpath(filepath, ROOT).encode())
+            with open(filepath, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def run_definition(constellation, engine, settings, sources=None):
+    """
+    Everything that determines a run's telemetry, as a JSON-able dict:
+    the settings (upper-case attributes of a config module, minus
+    IGNORED_SETTINGS), the initial constellation arrays, the environment and
+    integrator parameters, and a digest of the simulation sources.
+
+    :param settings: Config module (or any object with upper-case attributes)
+    :param sources: Source files/directories to digest (default: SOURCE_PACKAGES)
+    """
+    return {
+        'settings': {name: getattr(settings, name) for name in dir(settings)
+                     if name.isupper() and name not in IGNORED_SETTINGS},
+        'names': list(constellation.names),
+        'bodies': {name: getattr(constellation, name) for name in ARRAYS},
+        'environment': environment_parameters(engine.env),
+        'integrators': [environment_parameters(engine.integrator), environment_parameters(engine.attitude_integrator)],
+        'sources': source_digest(sources),
+    }
+
+
+class ResultCache:
+    """
+    Content-addressed store of finished runs.
+
+    An entry is keyed by the SHA-256 of a run definition (run_definition)
+    and holds the run's telemetry file, a checkpoint of its final state
+    (core.checkpoint) and its end time. Since TF is not part of the key, a
+    longer run of the same scenario finds the shorter one and continues from
+    its final state instead of starting over.
+
+    Entries live in one directory each; the least recently used are deleted
+    once the cache grows past max_bytes.
+
+    :param directory: Cache directory
+    :param max_bytes: Disk budget (bytes)
+    """
+    def __init__(self, directory, max_bytes=2e9):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(definition):
+        """Stable hex key of a run definition."""
+        text = json.dumps(definition, sort_keys=True, default=_default)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _path(self, key, name=''):
+        return os.path.join(self.directory, key, name)
+
+    def _read_meta(self, key):
+        try:
+            with open(self._path(key, 'entry.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key, meta):
+        tmp = self._path(key, 'entry.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._path(key, 'entry.json'))
+
+    def lookup(self, key):
+        """
+        Entry of a key, or None, marking it as used.
+
+        :return: {'tf': end time, 'telemetry': file, 'checkpoint': final-state checkpoint, ...}
+        """
+        meta = self._read_meta(key)
+        if meta is None:
+            return None
+        meta['last_used'] = time.time()
+        self._write_meta(key, meta)
+        return dict(meta, telemetry=self._path(key, meta['telemetry']), checkpoint=self._path(key, 'final.ckpt.npz'))
+
+    def store(self, key, tf, telemetry_path, checkpoint_path):
+        """
+        Adds (or replaces) an entry: copies the telemetry file, moves the
+        final-state checkpoint into the cache, then evicts old entries.
+        """
+        os.makedirs(self._path(key), exist_ok=True)
+        telemetry = 'telemetry' + os.path.splitext(telemetry_path)[1]
+        # Entry becomes invalid first, so an interrupted store is a miss, not a mismatched pair
+        if os.path.exists(self._path(key, 'entry.json')):
+            os.remove(self._path(key, 'entry.json'))
+        shutil.copyfile(telemetry_path, self._path(key, telemetry))
+        shutil.move(checkpoint_path, self._path(key, 'final.ckpt.npz'))
+        self._write_meta(key, {'tf': float(tf), 'telemetry': telemetry, 'last_used': time.time()})
+        self.evict(keep=key)
+
+    def _size(self, key):
+        return sum(entry.stat().st_size for entry in os.scandir(self._path(key)) if entry.is_file())
+
+    def evict(self, keep=None):
+        """Deletes least recently used entries until the cache fits in max_bytes (never `keep`)."""
+        entries = []
+        for key in os.listdir(self.directory):
+            if os.path.isdir(self._path(key)):
+                meta = self._read_meta(key)
+                entries.append((meta['last_used'] if meta else 0.0, key, self._size(key)))
+        total = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                shutil.rmtree(self._path(key), ignore_errors=True)
+                total -= size
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Constellation arrays saved in a checkpoint (all of them, so a resumed run
+# also keeps the held control inputs and any mass change)
+ARRAYS = ('states', 'masses', 'inertias', 'inv_inertias', 'ballistic_coefficients', 'centers_of_pressure',
+          'srp_areas', 'control_forces', 'control_torques')
+# Integrator attributes that carry over between calls (adaptive step size, counters)
+INTEGRATOR_STATE = ('h', 'nfev', 'naccept', 'nreject')
+# Attributes that only set how far a model is fitted (the ephemeris span end),
+# not its values inside the span: a run may be continued past the original TF
+SPAN_ATTRIBUTES = ('tf',)
+
+
+def environment_parameters(env, depth=3):
+    """
+    JSON-able description of an environment: class name, scalar attributes,
+    SHA-1 digests of array attributes, and the same for nested objects
+    (atmosphere, ephemeris) down to `depth`. Private attributes (caches,
+    buffers) and SPAN_ATTRIBUTES are left out, so two environments built
+    the same way compare equal.
+    """
+    description = {'class': type(env).__name__}
+    for name, value in sorted(vars(env).items()):
+        if name.startswith('_') or name in SPAN_ATTRIBUTES or callable(value):
+            continue
+        if value is None or isinstance(value, (bool, int, float, str)):
+            description[name] = value
+        elif isinstance(value, (tuple, list)) and all(isinstance(v, (bool, int, float, str)) for v in value):
+            description[name] = list(value)
+        elif isinstance(value, np.ndarray):
+            description[name] = 'sha1:' + hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest()
+        elif isinstance(value, np.generic):
+            description[name] = value.item()
+        elif depth > 0 and hasattr(value, '__dict__'):
+            description[name] = environment_parameters(value, depth - 1)
+    # json round trip so that a fresh description compares equal to a loaded one
+    return json.loads(json.dumps(description))
+
+
+def _integrators(engine):
+    return {'integrator': engine.integrator, 'attitude_integrator': engine.attitude_integrator}
+
+
+def save_checkpoint(path, t, constellation, engine, logger, scheduler=None, extra=None):
+    """
+    Writes a snapshot of a running simulation to a compressed .npz file.
+
+    Saved: every constellation array, the sim time, the integrators' carried
+    state, the environment parameters, the telemetry file and its position
+    (plus the logging policies' state) and the scheduler's next activations.
+    The file is written next to `path` and renamed over it, so a crash while
+    saving leaves the previous checkpoint intact.
+
+    :param path: Checkpoint file (.npz)
+    :param t: Sim time of the snapshot (s)
+    :param extra: Additional JSON-able data stored with the snapshot
+    """
+    meta = {
+        't': float(t),
+        'names': list(constellation.names),
+        'telemetry': {'filepath': logger.filepath, 'fmt': logger.fmt, **logger.get_state()},
+        'integrators': {
+            key: {name: getattr(integrator, name) for name in INTEGRATOR_STATE if hasattr(integrator, name)}
+            for key, integrator in _integrators(engine).items()
+        },
+        'environment': environment_parameters(engine.env),
+        'scheduler': scheduler.state() if scheduler is not None else None,
+        'extra': extra,
+    }
+    arrays = {name: getattr(constellation, name) for name in ARRAYS}
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez_compressed(f, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path):
+    """
+    Reads a checkpoint.
+
+    :return: (meta, arrays): the metadata dict and {name: array} of the constellation arrays
+    """
+    with np.load(path) as data:
+        meta = json.loads(str(data['meta']))
+        arrays = {name: data[name] for name in ARRAYS}
+    return meta, arrays
+
+
+def restore_checkpoint(path, constellation, engine, scheduler=None):
+    """
+    Loads a checkpoint into a simulation built the same way as the saved one
+    (same satellites and environment; checked). Reopen the telemetry with
+    DataLogger.resume(meta['telemetry']['filepath'], meta['telemetry']).
+
+    :return: meta
+    """
+    meta, arrays = load_checkpoint(path)
+    if list(constellation.names) != meta['names']:
+        raise ValueError(f"Checkpoint '{path}' has satellites {meta['names']}, not {list(constellation.names)}")
+    environment = environment_parameters(engine.env)
+    if environment != meta['environment']:
+        raise ValueError(f"Checkpoint '{path}' was saved with a different environment:\n"
+                         f"  saved:   {meta['environment']}\n  current: {environment}")
+
+    # 1. Bodies (in place: the satellites are views into these arrays)
+    for name in ARRAYS:
+        getattr(constellation, name)[:] = arrays[name]
+
+    # 2. Integrators
+    for key, integrator in _integrators(engine).items():
+        for name, value in meta['integrators'][key].items():
+            setattr(integrator, name, value)
+
+    # 3. Task schedule
+    if scheduler is not None and meta['scheduler'] is not None:
+        scheduler.restore(meta['scheduler'])
+    return meta
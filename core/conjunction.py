@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+ENCOUNTER_COLUMNS = ['sat1', 'sat2', 'tca', 'miss_distance', 'relative_speed']
+
+
+def trajectories(data):
+    """
+    Per-satellite arrays on the times every satellite was logged at (e.g.
+    from visualization.plotter.load_data or TelemetryReader.to_frame).
+
+    :param data: Telemetry DataFrame with time, name, rx..vz columns
+    :return: (times (T,), names, positions (N, T, 3), velocities (N, T, 3))
+    """
+    data = data.dropna(subset=['rx', 'vx'])
+    data = data[data['time'] >= 0] # Drop the initial-condition row (time -1)
+    groups = [(name, group.sort_values('time', kind='stable')) for name, group in data.groupby('name', sort=False)]
+
+    times = groups[0][1]['time'].to_numpy()
+    for _, group in groups[1:]:
+        times = np.intersect1d(times, group['time'].to_numpy())
+
+    names, positions, velocities = [], [], []
+    for name, group in groups:
+        rows = np.searchsorted(group['time'].to_numpy(), times)
+        names.append(name)
+        positions.append(group[['rx', 'ry', 'rz']].to_numpy()[rows])
+        velocities.append(group[['vx', 'vy', 'vz']].to_numpy()[rows])
+    return times, names, np.stack(positions), np.stack(velocities)
+
+
+def hermite(p0, v0, p1, v1, h, s):
+    """
+    Cubic Hermite interpolant of (M, 3) endpoint states over steps h (M,)
+    at fractions s (M, K): position, d/ds and d2/ds2, each (M, K, 3).
+    """
+    s = s[..., None]
+    s2, s3 = s * s, s * s * s
+    m0, m1 = (h[:, None] * v0)[:, None], (h[:, None] * v1)[:, None]
+    p0, p1 = p0[:, None], p1[:, None]
+    p = (2*s3 - 3*s2 + 1) * p0 + (s3 - 2*s2 + s) * m0 + (-2*s3 + 3*s2) * p1 + (s3 - s2) * m1
+    dp = (6*s2 - 6*s) * p0 + (3*s2 - 4*s + 1) * m0 + (-6*s2 + 6*s) * p1 + (3*s2 - 2*s) * m1
+    d2p = (12*s - 6) * p0 + (6*s - 4) * m0 + (-12*s + 6) * p1 + (6*s - 2) * m1
+    return p, dp, d2p
+
+
+def refine_tca(times, positions, velocities, i, j, k, samples=33, iterations=4):
+    """
+    Time and distance of closest approach of pairs (i, j) around sample k,
+    from a cubic Hermite interpolation of the relative state over
+    [k - 1, k] and [k, k + 1]: coarse search on a grid of each interval,
+    then Newton iterations on d|dr|^2/dt = 0. Vectorized over the pairs.
+
+    :return: (tca, miss_distance, relative_speed), each (M,)
+    """
+    T = times.size
+    best = None
+    for lo in (np.maximum(k - 1, 0), np.minimum(k, T - 2)):
+        hi = lo + 1
+        h = times[hi] - times[lo]
+        p0, p1 = positions[i, lo] - positions[j, lo], positions[i, hi] - positions[j, hi]
+        v0, v1 = velocities[i, lo] - velocities[j, lo], velocities[i, hi] - velocities[j, hi]
+
+        # 1. Coarse search
+        grid = np.broadcast_to(np.linspace(0.0, 1.0, samples), (lo.size, samples))
+        p, _, _ = hermite(p0, v0, p1, v1, h, grid)
+        s = grid[np.arange(lo.size), np.argmin(np.einsum('mkc,mkc->mk', p, p), axis=1)][:, None]
+
+        # 2. Newton on g(s) = p . dp/ds
+        for _ in range(iterations):
+            p, dp, d2p = hermite(p0, v0, p1, v1, h, s)
+            g = np.einsum('mkc,mkc->mk', p, dp)
+            dg = np.einsum('mkc,mkc->mk', dp, dp) + np.einsum('mkc,mkc->mk', p, d2p)
+            step = np.where(dg > 0.0, g / np.where(dg > 0.0, dg, 1.0), 0.0)
+            s = np.clip(s - step, 0.0, 1.0)
+
+        p, dp, _ = hermite(p0, v0, p1, v1, h, s)
+        result = (times[lo] + s[:, 0] * h, np.linalg.norm(p[:, 0], axis=1), np.linalg.norm(dp[:, 0], axis=1) / h)
+        if best is None:
+            best = result
+        else:
+            closer = result[1] < best[1]
+            best = tuple(np.where(closer, new, old) for new, old in zip(result, best))
+    return best
+
+
+def screen_conjunctions(times, positions, velocities, threshold, names=None, stride=1, prefilter=True):
+    """
+    Finds every close approach below `threshold` between the satellites of
+    a trajectory set.
+
+    1. Apogee/perigee filter: a pair can only come within `threshold` if
+       the radial shells [min |r|, max |r|] of the two satellites overlap
+       once padded by it.
+    2. Spatial screening: every `stride`-th sample a k-d tree of all the
+       positions returns the pairs within a screening radius, the threshold
+       padded by how far two satellites can close in between two screened
+       samples (max relative speed * half the screening interval). Each
+       slice is O(N log N), so the cost never goes through all N^2 pairs.
+    3. Refinement: for each candidate pair, local minima of the sampled
+       distance around the candidate slices are refined to the time of
+       closest approach (TCA) on the Hermite interpolation of the states.
+
+    :param times: (T,) sample times (s)
+    :param positions: (N, T, 3) positions (m)
+    :param velocities: (N, T, 3) velocities (m/s)
+    :param threshold: Miss distance reported (m)
+    :param names: Satellite names (default: indices)
+    :param stride: Screen every stride-th sample
+    :param prefilter: Apply the apogee/perigee filter
+    :return: DataFrame of encounters (ENCOUNTER_COLUMNS), sorted by TCA
+    """
+    times = np.asarray(times, dtype=float)
+    N, T = positions.shape[:2]
+    names = list(range(N)) if names is None else list(names)
+    if N < 2 or T < 2:
+        return pd.DataFrame(columns=ENCOUNTER_COLUMNS)
+
+    # 1. Radial shells
+    radius = np.linalg.norm(positions, axis=2)
+    r_min, r_max = radius.min(axis=1), radius.max(axis=1)
+
+    # 2. Screening slices
+    slices = np.arange(0, T, stride)
+    if slices[-1] != T - 1:
+        slices = np.append(slices, T - 1)
+    v_max = np.sqrt(np.max(np.einsum('ntc,ntc->nt', velocities, velocities)))
+    # Relative speed <= 2 v_max, over at most half a screening interval
+    radius_screen = threshold + v_max * np.max(np.diff(times[slices]))
+
+    candidates = []
+    for s, k in enumerate(slices):
+        pairs = cKDTree(positions[:, k]).query_pairs(radius_screen, output_type='ndarray')
+        if pairs.size:
+            candidates.append(np.column_stack((pairs, np.full(len(pairs), s))))
+    if not candidates:
+        return pd.DataFrame(columns=ENCOUNTER_COLUMNS)
+    candidates = np.concatenate(candidates)
+    i, j = candidates[:, 0], candidates[:, 1]
+    if prefilter:
+        overlap = np.maximum(r_min[i], r_min[j]) - np.minimum(r_max[i], r_max[j]) <= threshold
+        candidates = candidates[overlap]
+
+    # 3. Sample windows around the candidate slices, merged per pair
+    order = np.lexsort((candidates[:, 2], candidates[:, 1], candidates[:, 0]))
+    candidates = candidates[order]
+    lo = slices[np.maximum(candidates[:, 2] - 1, 0)]
+    hi = slices[np.minimum(candidates[:, 2] + 1, slices.size - 1)]
+    new_pair = np.ones(len(candidates), dtype=bool)
+    new_pair[1:] = (candidates[1:, 0] != candidates[:-1, 0]) | (candidates[1:, 1] != candidates[:-1, 1])
+    new_window = new_pair.copy()
+    new_window[1:] |= lo[1:] > hi[:-1] # Slices are sorted within a pair
+    starts = np.flatnonzero(new_window)
+    stops = np.append(starts[1:], len(candidates))
+
+    # Local minima of the sampled distance in each window
+    minima = []
+    for start, stop in zip(starts, stops):
+        a, b = candidates[start, 0], candidates[start, 1]
+        first, last = lo[start], hi[start:stop].max()
+        dr = positions[a, first:last + 1] - positions[b, first:last + 1]
+        d = np.einsum('tc,tc->t', dr, dr)
+        padded = np.concatenate(([np.inf], d, [np.inf]))
+        local = np.flatnonzero((d <= padded[:-2]) & (d < padded[2:]))
+        minima.extend((a, b, first + m) for m in local)
+    if not minima:
+        return pd.DataFrame(columns=ENCOUNTER_COLUMNS)
+    i, j, k = np.array(minima).T
+
+    # 4. TCA refinement
+    tca, miss, speed = refine_tca(times, positions, velocities, i, j, k)
+    keep = miss < threshold
+    encounters = pd.DataFrame({
+        'sat1': [names[n] for n in i[keep]],
+        'sat2': [names[n] for n in j[keep]],
+        'tca': tca[keep],
+        'miss_distance': miss[keep],
+        'relative_speed': speed[keep],
+    }, columns=ENCOUNTER_COLUMNS)
+    return encounters.sort_values('tca', kind='stable').reset_index(drop=True)
@@ -1,16 +1,379 @@
 import numpy as np
+import scipy.integrate
 from scipy.integrate import solve_ivp
 
 import config
-from utils import Quaternion
+from utils import quat_normalize, quat_rate
+
+
+class Integrator:
+    """
+    Base class for the integrators used by PhysicsEngine.
+
+    An integrator advances a state vector y from t0 to t1 IN PLACE. The
+    counters nfev/naccept/nreject accumulate over the integrator's lifetime;
+    nreject is None when the integrator cannot tell its rejected steps.
+    """
+    DENSE_OUTPUT = False # integrate() can return an interpolant of the solution
+
+    def __init__(self):
+        self.nfev = 0
+        self.naccept = 0
+        self.nreject = 0
+
+    def integrate(self, fun, t0, t1, y, args=(), dense_output=False):
+        """
+        Advances y from t0 to t1, overwriting y with the final state.
+
+        :param fun: Right-hand side, fun(t, y, *args) -> dy/dt
+        :param t0: Start time (s)
+        :param t1: End time (s)
+        :param y: State vector (float ndarray), updated in place
+        :param args: Extra arguments passed to fun
+        :param dense_output: Return the solution's interpolant, sol(t) -> y for t in [t0, t1]
+            (DENSE_OUTPUT integrators; the others return None)
+        """
+        raise NotImplementedError
+
+
+class ScipyIntegrator(Integrator):
+    """
+    Wraps scipy.integrate.solve_ivp. A new solver is built for every call.
+
+    solve_ivp does not report rejected steps. For the explicit Runge-Kutta
+    methods (RK23, RK45, DOP853) they follow from the RHS count: every call
+    spends 2 evaluations on the initial derivative and step guess, then
+    n_stages per attempted step, plus DENSE_STAGES per accepted step when
+    dense output is requested. Implicit methods leave nreject as None.
+    """
+    DENSE_OUTPUT = True
+    # Extra RHS evaluations per accepted step for the dense interpolant
+    DENSE_STAGES = {'DOP853': 3}
+
+    def __init__(self, method='RK45', rtol=1e-6, atol=1e-9):
+        super().__init__()
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        solver = getattr(scipy.integrate, method, None) if isinstance(method, str) else method
+        self._stages = getattr(solver, 'n_stages', None)
+        self._dense_stages = self.DENSE_STAGES.get(getattr(solver, '__name__', None), 0)
+        if self._stages is None:
+            self.nreject = None
+
+    def integrate(self, fun, t0, t1, y, args=(), dense_output=False):
+        sol = solve_ivp(
+            fun=fun,
+            t_span=(t0, t1),
+            y0=y,
+            method=self.method,
+            args=args,
+            rtol=self.rtol,
+            atol=self.atol,
+            dense_output=dense_output
+        )
+        accepted = sol.t.size - 1
+        self.nfev += sol.nfev
+        self.naccept += accepted
+        if self._stages is not None:
+            dense_fev = self._dense_stages * accepted if dense_output else 0
+            self.nreject += (sol.nfev - 2 - dense_fev) // self._stages - accepted
+        y[:] = sol.y[:, -1]
+        return sol.sol
+
+
+class RungeKutta(Integrator):
+    """
+    Explicit fixed-step Runge-Kutta method defined by a Butcher tableau.
+
+    The interval [t0, t1] is covered by equal substeps no longer than `step`
+    (one substep when step is None). Stage buffers are allocated once per
+    state size and reused on every call.
+    """
+    A = None
+    B = None
+    C = None
+
+    def __init__(self, step=None):
+        super().__init__()
+        self.step = step
+        self._K = None
+        self._y_stage = None
+
+    def _buffers(self, n):
+        if self._K is None or self._K.shape[1] != n:
+            self._K = np.empty((len(self.B), n))
+            self._y_stage = np.empty(n)
+        return self._K, self._y_stage
+
+    def integrate(self, fun, t0, t1, y, args=(), dense_output=False):
+        span = t1 - t0
+        n_steps = 1 if self.step is None else max(1, int(np.ceil(abs(span) / self.step - 1e-12)))
+        h = span / n_steps
+        t = t0
+        for i in range(n_steps):
+            self._step(fun, t, y, h, args)
+            t = t0 + (i + 1) * h
+
+    def _step(self, fun, t, y, h, args):
+        K, y_stage = self._buffers(y.size)
+        A, B, C = self.A, self.B, self.C
+
+        K[0] = fun(t, y, *args)
+        for i in range(1, len(B)):
+            np.dot(A[i, :i], K[:i], out=y_stage)
+            y_stage *= h
+            y_stage += y
+            K[i] = fun(t + C[i] * h, y_stage, *args)
+
+        np.dot(B, K, out=y_stage)
+        y_stage *= h
+        y += y_stage
+
+        self.nfev += len(B)
+        self.naccept += 1
+
+
+class RK4(RungeKutta):
+    """Classic 4th order Runge-Kutta."""
+    A = np.array([
+        [0.0, 0.0, 0.0, 0.0],
+        [0.5, 0.0, 0.0, 0.0],
+        [0.0, 0.5, 0.0, 0.0],
+        [0.0, 0.0, 1.0, 0.0]
+    ])
+    B = np.array([1/6, 1/3, 1/3, 1/6])
+    C = np.array([0.0, 0.5, 0.5, 1.0])
+
+
+class RK8(RungeKutta):
+    """8th order Runge-Kutta (the 12 stage propagating formula of DOP853).
+
+    Tableau of Hairer, Norsett & Wanner (the same coefficients as solve_ivp's
+    DOP853), vendored so that RK8 does not depend on SciPy internals.
+    """
+    C = np.array([
+        0.0, 0.526001519587677318785587544488e-01, 0.789002279381515978178381316732e-01,
+        0.118350341907227396726757197510, 0.281649658092772603273242802490, 0.333333333333333333333333333333,
+        0.25, 0.307692307692307692307692307692, 0.651282051282051282051282051282,
+        0.6, 0.857142857142857142857142857142, 1.0
+    ])
+    A = np.zeros((12, 12))
+    A[1, 0] = 5.26001519587677318785587544488e-2
+    A[2, 0] = 1.97250569845378994544595329183e-2
+    A[2, 1] = 5.91751709536136983633785987549e-2
+    A[3, 0] = 2.95875854768068491816892993775e-2
+    A[3, 2] = 8.87627564304205475450678981324e-2
+    A[4, 0] = 2.41365134159266685502369798665e-1
+    A[4, 2] = -8.84549479328286085344864962717e-1
+    A[4, 3] = 9.24834003261792003115737966543e-1
+    A[5, 0] = 3.7037037037037037037037037037e-2
+    A[5, 3] = 1.70828608729473871279604482173e-1
+    A[5, 4] = 1.25467687566822425016691814123e-1
+    A[6, 0] = 3.7109375e-2
+    A[6, 3] = 1.70252211019544039314978060272e-1
+    A[6, 4] = 6.02165389804559606850219397283e-2
+    A[6, 5] = -1.7578125e-2
+    A[7, 0] = 3.70920001185047927108779319836e-2
+    A[7, 3] = 1.70383925712239993810214054705e-1
+    A[7, 4] = 1.07262030446373284651809199168e-1
+    A[7, 5] = -1.53194377486244017527936158236e-2
+    A[7, 6] = 8.27378916381402288758473766002e-3
+    A[8, 0] = 6.24110958716075717114429577812e-1
+    A[8, 3] = -3.36089262944694129406857109825
+    A[8, 4] = -8.68219346841726006818189891453e-1
+    A[8, 5] = 2.75920996994467083049415600797e1
+    A[8, 6] = 2.01540675504778934086186788979e1
+    A[8, 7] = -4.34898841810699588477366255144e1
+    A[9, 0] = 4.77662536438264365890433908527e-1
+    A[9, 3] = -2.48811461997166764192642586468
+    A[9, 4] = -5.90290826836842996371446475743e-1
+    A[9, 5] = 2.12300514481811942347288949897e1
+    A[9, 6] = 1.52792336328824235832596922938e1
+    A[9, 7] = -3.32882109689848629194453265587e1
+    A[9, 8] = -2.03312017085086261358222928593e-2
+    A[10, 0] = -9.3714243008598732571704021658e-1
+    A[10, 3] = 5.18637242884406370830023853209
+    A[10, 4] = 1.09143734899672957818500254654
+    A[10, 5] = -8.14978701074692612513997267357
+    A[10, 6] = -1.85200656599969598641566180701e1
+    A[10, 7] = 2.27394870993505042818970056734e1
+    A[10, 8] = 2.49360555267965238987089396762
+    A[10, 9] = -3.0467644718982195003823669022
+    A[11, 0] = 2.27331014751653820792359768449
+    A[11, 3] = -1.05344954667372501984066689879e1
+    A[11, 4] = -2.00087205822486249909675718444
+    A[11, 5] = -1.79589318631187989172765950534e1
+    A[11, 6] = 2.79488845294199600508499808837e1
+    A[11, 7] = -2.85899827713502369474065508674
+    A[11, 8] = -8.87285693353062954433549289258
+    A[11, 9] = 1.23605671757943030647266201528e1
+    A[11, 10] = 6.43392746015763530355970484046e-1
+    B = np.array([
+        5.42937341165687622380535766363e-2, 0.0, 0.0,
+        0.0, 0.0, 4.45031289275240888144113950566,
+        1.89151789931450038304281599044, -5.8012039600105847814672114227, 3.1116436695781989440891606237e-1,
+        -1.52160949662516078556178806805e-1, 2.01365400804030348374776537501e-1, 4.47106157277725905176885569043e-2
+    ])
+    # Weights of the embedded 5th order error estimate (unused at a fixed step)
+    E = np.array([
+        0.1312004499419488073250102996e-1, 0.0, 0.0,
+        0.0, 0.0, -0.1225156446376204440720569753e+1,
+        -0.4957589496572501915214079952, 0.1664377182454986536961530415e+1, -0.3503288487499736816886487290,
+        0.3341791187130174790297318841, 0.8192320648511571246570742613e-1, -0.2235530786388629525884427845e-1
+    ])
+
+class EmbeddedRungeKutta(RungeKutta):
+    """
+    Adaptive explicit Runge-Kutta pair with local error control.
+
+    E holds the difference between the propagating and embedded weights.
+    The step size is carried over between calls, so a run of short
+    integrate() calls does not restart the step selection every time.
+    """
+    E = None
+    order = None
+    fsal = False
+
+    def __init__(self, rtol=1e-6, atol=1e-9, max_step=np.inf):
+        super().__init__()
+        self.rtol = rtol
+        self.atol = atol
+        self.max_step = max_step
+        self.h = None
+        self._y_new = None
+        self._err = None
+
+    def _buffers(self, n):
+        K, y_stage = super()._buffers(n)
+        if self._y_new is None or self._y_new.size != n:
+            self._y_new = np.empty(n)
+            self._err = np.empty(n)
+        return K, y_stage
+
+    def integrate(self, fun, t0, t1, y, args=(), dense_output=False):
+        K, y_stage = self._buffers(y.size)
+        y_new, err = self._y_new, self._err
+        A, B, C, E = self.A, self.B, self.C, self.E
+        n_stages = len(B)
+        direction = np.sign(t1 - t0) or 1.0
+        exponent = -1.0 / (self.order + 1)
+
+        h = min(self.h or abs(t1 - t0), self.max_step)
+        t = t0
+        K[0] = fun(t, y, *args)
+        self.nfev += 1
+
+        while direction * (t1 - t) > 0:
+            h = min(h, abs(t1 - t))
+            h_signed = direction * h
+
+            for i in range(1, n_stages):
+                np.dot(A[i, :i], K[:i], out=y_stage)
+                y_stage *= h_signed
+                y_stage += y
+                K[i] = fun(t + C[i] * h_signed, y_stage, *args)
+            self.nfev += n_stages - 1
+
+            np.dot(B, K, out=y_new)
+            y_new *= h_signed
+            y_new += y
+
+            # Scaled RMS error of the embedded estimate
+            np.dot(E, K, out=err)
+            err *= h_signed
+            np.maximum(np.abs(y), np.abs(y_new), out=y_stage)
+            y_stage *= self.rtol
+            y_stage += self.atol
+            err /= y_stage
+            error_norm = np.sqrt(np.mean(err**2))
+
+            if error_norm <= 1.0:
+                t = t + h_signed
+                y[:] = y_new
+                self.naccept += 1
+                if self.fsal:
+                    K[0] = K[n_stages - 1]
+                else:
+                    K[0] = fun(t, y, *args)
+                    self.nfev += 1
+                factor = 10.0 if error_norm == 0 else min(10.0, 0.9 * error_norm**exponent)
+            else:
+                self.nreject += 1
+                factor = max(0.2, 0.9 * error_norm**exponent)
+
+            h = min(h * factor, self.max_step)
+
+        self.h = h
+
+
+class RK45(EmbeddedRungeKutta):
+    """Dormand-Prince 5(4) pair (the same tableau as solve_ivp's RK45)."""
+    order = 4
+    fsal = True
+    A = np.array([
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        [1/5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        [3/40, 9/40, 0.0, 0.0, 0.0, 0.0, 0.0],
+        [44/45, -56/15, 32/9, 0.0, 0.0, 0.0, 0.0],
+        [19372/6561, -25360/2187, 64448/6561, -212/729, 0.0, 0.0, 0.0],
+        [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656, 0.0, 0.0],
+        [35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0]
+    ])
+    B = np.array([35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0])
+    C = np.array([0.0, 1/5, 3/10, 4/5, 8/9, 1.0, 1.0])
+    E = np.array([71/57600, 0.0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40])
+
+
+class RK23(EmbeddedRungeKutta):
+    """Bogacki-Shampine 3(2) pair."""
+    order = 2
+    fsal = True
+    A = np.array([
+        [0.0, 0.0, 0.0, 0.0],
+        [1/2, 0.0, 0.0, 0.0],
+        [0.0, 3/4, 0.0, 0.0],
+        [2/9, 1/3, 4/9, 0.0]
+    ])
+    B = np.array([2/9, 1/3, 4/9, 0.0])
+    C = np.array([0.0, 1/2, 3/4, 1.0])
+    E = np.array([5/72, -1/12, -1/9, 1/8])
+
+
+INTEGRATORS = {
+    'solve_ivp': ScipyIntegrator,
+    'rk4': RK4,
+    'rk8': RK8,
+    'rk23': RK23,
+    'rk45': RK45,
+}
+
+
+def make_integrator(name, **kwargs):
+    """
+    Builds an integrator by name (see INTEGRATORS).
+
+    :param name: 'solve_ivp', 'rk4', 'rk8', 'rk23' or 'rk45'
+    :param kwargs: Passed to the integrator (step for fixed-step methods,
+                   rtol/atol for the adaptive ones)
+    """
+    try:
+        cls = INTEGRATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown integrator '{name}'. Options: {list(INTEGRATORS)}")
+    return cls(**kwargs)
 
 
 class PhysicsEngine:
     """
     Docstring for PhysicsEngine
     """
-    def __init__(self, env):
+    def __init__(self, env, integrator=None, attitude_integrator=None):
         self.env = env
+        # Defaults to the original per-step solve_ivp call
+        self.integrator = integrator if integrator is not None else ScipyIntegrator()
+        # Sub-cycles the attitude in multi-rate propagation
+        self.attitude_integrator = attitude_integrator if attitude_integrator is not None else RK4(step=config.ATTITUDE_DT)
     
     def eom(self, t, x, body): # Can add control input later
         """
@@ -21,9 +384,8 @@ class PhysicsEngine:
         :param x: Description
         :param mass: Description
         """
-        position = x[0:3]
         velocity = x[3:6]
-        attitude = Quaternion(*x[6:10]) # Normalized at initialization
+        attitude = quat_normalize(x[6:10])
         omega = x[10:13]
 
         # Constants
@@ -32,59 +394,242 @@ class PhysicsEngine:
 
         # Sum forces
         env_forces = self.env.get_forces(t, x, body)
-        control_forces = np.zeros(3)
+        control_forces = body.control_force # Held between control updates
 
         total_forces = env_forces + control_forces
         
         # Sum torques
         env_torques = self.env.get_torques(t, x, body)
-        control_torques = np.zeros(3)
+        control_torques = body.control_torque
 
         total_torques = env_torques + control_torques
         # print(total_torques)
         # Dynamics
         v_dot = total_forces / body.mass
-        omega_dot = np.linalg.inv(I) @ (total_torques - np.cross(omega, H))
+        omega_dot = body.inv_inertia @ (total_torques - np.cross(omega, H))
         # print('total torques: ', total_torques)
-        # Kinematics
-        r_dot = velocity
-        q_dot = attitude.rate_of_change(omega)
-        # print('qdot: ', q_dot)
-        # print('omegadot:, ', omega_dot)
 
         # Derivative of state for integration
-        dxdt = np.concatenate((r_dot, v_dot, q_dot, omega_dot))
+        dxdt = np.empty(13)
+        dxdt[0:3] = velocity # Kinematics
+        dxdt[3:6] = v_dot
+        quat_rate(attitude, omega, out=dxdt[6:10])
+        dxdt[10:13] = omega_dot
 
         return dxdt
     
-    def propagate(self, body, t, dt):
+    def propagate(self, body, t, dt, t_eval=None):
         """
         Updates the state of an body according to the physics applied over dt
         
         :param self: Description
         :param body: Description
         :param dt: Description
+        :param t_eval: Times inside the step to also return the state at, (T, 13), from the
+            integrator's dense output (None unless integrator.DENSE_OUTPUT)
         """
-        x0 = np.concatenate((body.position, body.velocity, body.attitude.q, body.angular_velocity))
+        # The satellite's state is integrated in place
+        sol = self.integrator.integrate(self.eom, t, t+dt, body.state, args=(body,), dense_output=t_eval is not None)
+        body.attitude.normalize()
+        if sol is not None:
+            samples = sol(np.asarray(t_eval, dtype=float)).T
+            quat_normalize(samples[:, 6:10], out=samples[:, 6:10])
+            return samples
+
+    def propagate_arc(self, body, t0, tf, t_eval, breakpoints=(), method='RK45', rtol=1e-10, atol=1e-9):
+        """
+        Propagates a body over the whole arc [t0, tf] with one adaptive solve
+        and samples the solver's dense output at t_eval.
+
+        The solver is only restarted at breakpoints (discontinuities such as
+        maneuvers), so it keeps its step-size adaptation along the arc. The
+        body is left at its state at tf. The default rtol is tighter than the
+        per-step path because the error is no longer reset every DT; it still
+        needs ~100x fewer RHS evaluations than restarting every second.
+
+        :param body: Body to propagate
+        :param t0: Start time (s)
+        :param tf: End time (s)
+        :param t_eval: Sample times inside [t0, tf]
+        :param breakpoints: Times at which the integration is restarted
+        :param method: solve_ivp method
+        :return: (len(t_eval), 13) array of states at t_eval
+        """
+        t_eval = np.asarray(t_eval, dtype=float)
+        edges = [t0] + sorted(b for b in breakpoints if t0 < b < tf) + [tf]
+        samples = np.empty((t_eval.size, 13))
+
+        x = body.state.copy()
+        for start, stop in zip(edges[:-1], edges[1:]):
+            sol = solve_ivp(
+                fun=self.eom,
+                t_span=(start, stop),
+                y0=x,
+                method=method,
+                args=(body,),
+                rtol=rtol,
+                atol=atol,
+                dense_output=True
+            )
+            mask = (t_eval >= start) & (t_eval <= stop)
+            if mask.any():
+                samples[mask] = sol.sol(t_eval[mask]).T
+            x = sol.y[:, -1]
+
+        # The dense output is not norm-preserving, renormalize the attitude
+        quat_normalize(samples[:, 6:10], out=samples[:, 6:10])
+        body.state = x
+        body.attitude.normalize()
+
+        return samples
+
+    def eom_batch(self, t, y, constellation):
+        """
+        Equations of motion for N bodies at once.
+
+        The state is the flattened (N, 13) stack so it can be handed to a
+        single integrator call.
+
+        :param t: Time (s)
+        :param y: Flattened state, shape (N*13,)
+        :param constellation: Constellation holding the bodies being propagated
+        """
+        x = y.reshape(len(constellation), 13)
+        velocity = x[:, 3:6]
+        attitude = quat_normalize(x[:, 6:10])
+        omega = x[:, 10:13]
+
+        # Sum forces and torques (control inputs held between control updates)
+        total_forces = self.env.get_forces_batch(t, x, constellation) + constellation.control_forces
+        total_torques = self.env.get_torques_batch(t, x, constellation) + constellation.control_torques
+
+        dxdt = np.empty_like(x)
+
+        # Kinematics
+        dxdt[:, 0:3] = velocity
+        quat_rate(attitude, omega, out=dxdt[:, 6:10])
 
+        # Dynamics
+        H = np.einsum('nij,nj->ni', constellation.inertias, omega)
+        dxdt[:, 3:6] = total_forces / constellation.masses[:, None]
+        dxdt[:, 10:13] = np.einsum('nij,nj->ni', constellation.inv_inertias, total_torques - np.cross(omega, H))
+
+        return dxdt.ravel()
+
+    def propagate_batch(self, constellation, t, dt, t_eval=None):
+        """
+        Updates the states of all bodies over dt with a single integrator call.
+
+        The constellation's (N, 13) state array is integrated in place.
+
+        :param constellation: Constellation to propagate
+        :param t: Start time (s)
+        :param dt: Step (s)
+        :param t_eval: Times inside the step to also return the states at, (T, N, 13), from the
+            integrator's dense output (None unless integrator.DENSE_OUTPUT)
+        """
+        states = constellation.states
+        sol = self.integrator.integrate(self.eom_batch, t, t+dt, states.reshape(-1), args=(constellation,),
+                                        dense_output=t_eval is not None)
+        quat_normalize(states[:, 6:10], out=states[:, 6:10])
+        if sol is not None:
+            samples = sol(np.asarray(t_eval, dtype=float)).T.reshape(len(t_eval), len(constellation), 13)
+            quat_normalize(samples[..., 6:10], out=samples[..., 6:10])
+            return samples
+
+    def eom_orbit(self, t, y, constellation, x):
+        """
+        Translational equations of motion for N bodies.
+
+        :param t: Time (s)
+        :param y: Flattened [r, v] states, shape (N*6,)
+        :param constellation: Constellation being propagated
+        :param x: (N, 13) scratch state; its attitude part is held fixed
+        """
+        x[:, 0:6] = y.reshape(-1, 6)
+        total_forces = self.env.get_forces_batch(t, x, constellation) + constellation.control_forces
+
+        dydt = np.empty((len(constellation), 6))
+        dydt[:, 0:3] = x[:, 3:6]
+        dydt[:, 3:6] = total_forces / constellation.masses[:, None]
+
+        return dydt.ravel()
+
+    def eom_attitude(self, t, y, constellation, orbit, x):
+        """
+        Rotational equations of motion for N bodies, with the position and
+        velocity taken from an orbit interpolant.
+
+        :param t: Time (s)
+        :param y: Flattened [q, w] states, shape (N*7,)
+        :param constellation: Constellation being propagated
+        :param orbit: Callable orbit(t) -> flattened (N*6,) [r, v] states
+        :param x: (N, 13) scratch state
+        """
+        x[:, 0:6] = orbit(t).reshape(-1, 6)
+        x[:, 6:13] = y.reshape(-1, 7)
+        attitude = quat_normalize(x[:, 6:10])
+        omega = x[:, 10:13]
+        total_torques = self.env.get_torques_batch(t, x, constellation) + constellation.control_torques
+
+        dydt = np.empty((len(constellation), 7))
+        quat_rate(attitude, omega, out=dydt[:, 0:4])
+        H = np.einsum('nij,nj->ni', constellation.inertias, omega)
+        dydt[:, 4:7] = np.einsum('nij,nj->ni', constellation.inv_inertias, total_torques - np.cross(omega, H))
+
+        return dydt.ravel()
+
+    def propagate_multirate(self, constellation, t, dt, rtol=1e-10, atol=1e-9, t_eval=None):
+        """
+        Propagates orbit and attitude at different rates.
+
+        The orbit of every body is advanced over dt with one adaptive solve
+        (free to take steps as long as dt). The attitude is then sub-cycled
+        with self.attitude_integrator, taking positions for the
+        gravity-gradient torque from the orbit's dense output, so a fast
+        spinner no longer forces small steps on the translational dynamics.
+        The saving is on the orbit side only: the attitude always costs
+        dt / ATTITUDE_DT integrator steps, so for slowly rotating bodies,
+        which an adaptive batch solve steps coarsely anyway, propagate_batch
+        is cheaper.
+
+        :param constellation: Constellation to propagate
+        :param t: Start time (s)
+        :param dt: Orbit step (s)
+        :param t_eval: Times inside the step to also return the states at, (T, N, 13): orbit
+            from the dense output, attitude from the sub-cycling (stopped at each time)
+        """
+        states = constellation.states
+        n = len(constellation)
+        x = states.copy()
+
+        # 1. Orbit with a large step
         sol = solve_ivp(
-            fun=self.eom,
+            fun=self.eom_orbit,
             t_span=(t, t+dt),
-            y0=x0,
-            method='RK45', 
-            args=(body,), 
-            rtol=1e-6,
-            atol=1e-9    
+            y0=states[:, 0:6].ravel(),
+            method='RK45',
+            args=(constellation, x),
+            rtol=rtol,
+            atol=atol,
+            dense_output=True
         )
 
-        final_state = sol.y[:, -1]
-        final_positon = final_state[0:3]
-        final_velocity = final_state[3:6]
-        final_attitude = final_state[6:10]
-        final_angular_velocity = final_state[10:13]
-        # print(final_attitude)
-
-        body.position = final_positon
-        body.velocity = final_velocity
-        body.attitude = Quaternion(*final_attitude)
-        body.angular_velocity = final_angular_velocity
\ No newline at end of file
+        # 2. Attitude sub-cycled along the orbit interpolant
+        y_attitude = states[:, 6:13].ravel()
+        t_eval = () if t_eval is None else np.asarray(t_eval, dtype=float)
+        samples = np.empty((len(t_eval), n, 13))
+        t_start = t
+        for k, t_sample in enumerate(t_eval):
+            self.attitude_integrator.integrate(self.eom_attitude, t_start, t_sample, y_attitude, args=(constellation, sol.sol, x))
+            samples[k, :, 6:13] = y_attitude.reshape(n, 7)
+            t_start = t_sample
+        self.attitude_integrator.integrate(self.eom_attitude, t_start, t+dt, y_attitude, args=(constellation, sol.sol, x))
+
+        states[:, 0:6] = sol.y[:, -1].reshape(n, 6)
+        states[:, 6:13] = y_attitude.reshape(n, 7)
+        quat_normalize(states[:, 6:10], out=states[:, 6:10])
+        if len(t_eval):
+            samples[..., 0:6] = sol.sol(t_eval).T.reshape(len(t_eval), n, 6)
+            quat_normalize(samples[..., 6:10], out=samples[..., 6:10])
+            return samples
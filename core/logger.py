@@ -1,45 +1,480 @@
 import csv
 import os
+import queue
+import threading
+from collections import deque
+
+import numpy as np
+
+# Columns of the 13-element state [r, v, q, w], in state order
+STATE_COLUMNS = [
+    'rx', 'ry', 'rz',
+    'vx', 'vy', 'vz',
+    'qw', 'qx', 'qy', 'qz',    # <--- NEW: Quaternion
+    'wx', 'wy', 'wz',          # <--- NEW: Angular Velocity
+]
+VALUE_COLUMNS = [*STATE_COLUMNS, 'mass', 'thrust_on']
+COLUMNS = ['time', 'name', *VALUE_COLUMNS]
+
+# Column groups that can be logged at their own rate (slices of VALUE_COLUMNS)
+CHANNEL_GROUPS = {
+    'orbit': slice(0, 6),
+    'attitude': slice(6, 13),
+    'mass': slice(13, 15),
+}
+
+NAME_WIDTH = 32 # bytes reserved for the satellite name in binary telemetry
+
+# Row layout of the binary (.npy) telemetry, same columns as the CSV
+TELEMETRY_DTYPE = np.dtype(
+    [('time', '<f8'), ('name', f'S{NAME_WIDTH}')]
+    + [(column, '<f8') for column in STATE_COLUMNS]
+    + [('mass', '<f8'), ('thrust_on', '<f8')]
+)
+
+
+class _CsvBackend:
+    """Text telemetry, one csv row per satellite per step."""
+    def __init__(self, filepath, mode):
+        self.file = open(filepath, mode, newline='')
+        self.writer = csv.writer(self.file)
+
+        # Write Header immediately (unless appending to an existing file)
+        if self.file.tell() == 0:
+            self.writer.writerow(COLUMNS)
+
+    def write_rows(self, times, names, values):
+        self.writer.writerows(
+            [time, name, *row]
+            for time, name, row in zip(times, names, values.tolist())
+        )
+
+    def flush(self):
+        self.file.flush()
+
+    def tell(self):
+        """Resume position: byte offset of the end of the written rows."""
+        self.flush()
+        return self.file.tell()
+
+    @staticmethod
+    def truncate(filepath, position):
+        with open(filepath, 'r+b') as f:
+            f.truncate(position)
+
+    def close(self):
+        self.file.close()
+
+
+class _NpyBackend:
+    """
+    Binary telemetry: a standard .npy file of TELEMETRY_DTYPE records.
+
+    Rows are buffered in a preallocated block and written a whole chunk at a
+    time. The header is fixed-size and rewritten with the final row count on
+    flush/close, so the file can be opened with np.load(mmap_mode='r').
+    """
+    HEADER_SIZE = 1024
+
+    def __init__(self, filepath, mode, chunk_rows=4096):
+        self.block = np.zeros(chunk_rows, dtype=TELEMETRY_DTYPE)
+        self.fill = 0
+        self._checked_names = set()
+
+        if mode == 'a' and os.path.exists(filepath):
+            self.file = open(filepath, 'r+b')
+            self.rows = _read_npy_rows(self.file)
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(filepath, 'w+b')
+            self.rows = 0
+            self._write_header()
+
+    def _write_header(self):
+        header = {
+            'descr': np.lib.format.dtype_to_descr(TELEMETRY_DTYPE),
+            'fortran_order': False,
+            'shape': (self.rows,),
+        }
+        text = repr(header).encode('latin1')
+        text = text + b' ' * (self.HEADER_SIZE - 10 - len(text) - 1) + b'\n'
+        position = self.file.tell()
+        self.file.seek(0)
+        self.file.write(b'\x93NUMPY\x01\x00' + len(text).to_bytes(2, 'little') + text)
+        self.file.seek(max(position, self.HEADER_SIZE))
+
+    def _reserve(self, n):
+        """Returns the slice of the block for the next n rows, flushing as needed."""
+        if self.fill + n > len(self.block):
+            self._flush_block()
+            if n > len(self.block):
+                self.block = np.zeros(n, dtype=TELEMETRY_DTYPE)
+        rows = self.block[self.fill:self.fill + n]
+        self.fill += n
+        return rows
+
+    def _check_names(self, names):
+        """Rejects names that do not fit the NAME_WIDTH field (numpy would cut them silently)."""
+        for name in set(names) - self._checked_names:
+            if len(str(name).encode()) > NAME_WIDTH:
+                raise ValueError(f"Satellite name '{name}' is longer than {NAME_WIDTH} bytes, "
+                                 f"the width of the name field in .npy telemetry")
+            self._checked_names.add(name)
+
+    def write_rows(self, times, names, values):
+        self._check_names(names)
+        rows = self._reserve(len(names))
+        rows['time'] = times
+        rows['name'] = names
+        for i, column in enumerate(VALUE_COLUMNS):
+            rows[column] = values[:, i]
+
+    def _flush_block(self):
+        if self.fill:
+            self.block[:self.fill].tofile(self.file)
+            self.rows += self.fill
+            self.fill = 0
+
+    def flush(self):
+        self._flush_block()
+        self._write_header()
+        self.file.flush()
+
+    def tell(self):
+        """Resume position: number of rows written."""
+        self.flush()
+        return self.rows
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    @classmethod
+    def truncate(cls, filepath, position):
+        backend = cls(filepath, 'a')
+        backend.rows = min(backend.rows, position)
+        backend.file.truncate(cls.HEADER_SIZE + backend.rows * TELEMETRY_DTYPE.itemsize)
+        backend.close() # Rewrites the header with the new row count
+
+
+def _read_npy_rows(file):
+    """Row count of an existing binary telemetry file (checks the layout)."""
+    file.seek(0)
+    np.lib.format.read_magic(file)
+    shape, _, dtype = np.lib.format.read_array_header_1_0(file)
+    if dtype != TELEMETRY_DTYPE:
+        raise ValueError(f"{file.name} does not hold telemetry records")
+    return shape[0]
+
+
+class _AsyncBackend:
+    """
+    Runs another backend on a background thread.
+
+    write_rows() only copies the data into a bounded queue; the thread
+    does the formatting and disk I/O. A full queue blocks the caller
+    (backpressure), so memory stays bounded. An exception in the writer
+    thread is re-raised in the caller on the next call.
+    """
+    _STOP = object()
+
+    def __init__(self, backend, queue_size=256):
+        self.backend = backend
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name='telemetry-writer', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is self._STOP:
+                    return
+                if self.error is None: # Otherwise keep draining so producers never block forever
+                    method, args = item
+                    method(*args)
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+
+    def _check(self):
+        if self.error is not None:
+            raise RuntimeError("Telemetry writer thread failed") from self.error
+
+    def _put(self, item):
+        self._check()
+        self.queue.put(item)
+
+    def write_rows(self, times, names, values):
+        self._put((self.backend.write_rows, (np.array(times, dtype=float), list(names), np.array(values, dtype=float))))
+
+    def flush(self):
+        """Waits until everything queued so far is on disk."""
+        self._put((self.backend.flush, ()))
+        self.queue.join()
+        self._check()
+
+    def tell(self):
+        self.flush()
+        return self.backend.tell()
+
+    def close(self):
+        """Drains the queue, stops the thread and closes the file."""
+        self.queue.put(self._STOP)
+        self.thread.join()
+        self.backend.close()
+        self._check()
+
+
+class LogPolicy:
+    """
+    Decides which rows and column groups of one satellite get logged.
+
+    :param rates: {group: period (s)} for the CHANNEL_GROUPS to log. Groups
+                  not listed are never logged; a period of 0 logs every call.
+    :param windows: [(t_start, t_end), ...] intervals logged at full rate
+    :param triggers: [Trigger or Trigger kwargs dict, ...] events that switch
+                     to full rate
+
+    A row is written when at least one group is due; columns of groups that
+    are not due are left as NaN, so the file keeps the usual schema.
+    """
+    def __init__(self, rates=None, windows=(), triggers=()):
+        if rates is None:
+            rates = {group: 0.0 for group in CHANNEL_GROUPS}
+        unknown = set(rates) - set(CHANNEL_GROUPS)
+        if unknown:
+            raise ValueError(f"Unknown column groups {sorted(unknown)}. Options: {list(CHANNEL_GROUPS)}")
+        self.rates = {group: float(period) for group, period in rates.items()}
+        self.windows = list(windows)
+        self.triggers = [t if isinstance(t, Trigger) else Trigger(**t) for t in triggers]
+
+        self._next = {group: -np.inf for group in self.rates}
+        self._full_rate_until = -np.inf
+        self._pre_trigger = max((trigger.pre for trigger in self.triggers), default=0.0)
+        self._recent = deque()
+
+    def _full_rate(self, time, values):
+        if any(start <= time <= stop for start, stop in self.windows):
+            return True
+        for trigger in self.triggers:
+            if trigger.condition(time, values):
+                self._full_rate_until = max(self._full_rate_until, time + trigger.post)
+        return time <= self._full_rate_until
+
+    def select(self, time, values):
+        """
+        Returns the [(time, masked values), ...] rows to write for this call
+        (buffered pre-trigger rows first), possibly empty.
+        """
+        rows = []
+        if self._full_rate(time, values):
+            # Release the rows kept from just before the event
+            rows.extend((row_time, self._mask(row, self.rates)) for row_time, row in self._recent)
+            self._recent.clear()
+            due = list(self.rates)
+        else:
+            due = [group for group in self.rates if time >= self._next[group] - 1e-9]
+            if self._pre_trigger > 0:
+                self._recent.append((time, values.copy()))
+                while self._recent and self._recent[0][0] < time - self._pre_trigger:
+                    self._recent.popleft()
+
+        if due:
+            for group in due:
+                self._next[group] = time + self.rates[group]
+            rows.append((time, self._mask(values, due)))
+            # Anything buffered is now older than a written row; releasing it
+            # later would break the time order of this satellite's rows
+            self._recent.clear()
+
+        return rows
+
+    def get_state(self):
+        """Internal state (rate timers, trigger window, pre-trigger buffer) for checkpoints."""
+        return {
+            'next': dict(self._next),
+            'full_rate_until': self._full_rate_until,
+            'recent': [(time, values.tolist()) for time, values in self._recent],
+        }
+
+    def set_state(self, state):
+        self._next.update(state['next'])
+        self._full_rate_until = state['full_rate_until']
+        self._recent = deque((time, np.array(values)) for time, values in state['recent'])
+
+    @staticmethod
+    def _mask(values, groups):
+        masked = np.full(len(VALUE_COLUMNS), np.nan)
+        for group in groups:
+            masked[CHANNEL_GROUPS[group]] = values[CHANNEL_GROUPS[group]]
+        return masked
+
+
+class Trigger:
+    """
+    Switches a LogPolicy to full rate around an event.
+
+    :param condition: Callable condition(time, values) -> bool, values being
+                      the VALUE_COLUMNS of the satellite at that time
+    :param pre: Seconds of full-rate rows kept in memory and written when the
+                condition fires
+    :param post: Seconds of full-rate logging after the condition last held
+    """
+    def __init__(self, condition, pre=0.0, post=60.0):
+        self.condition = condition
+        self.pre = pre
+        self.post = post
+
+
+BACKENDS = {
+    'csv': _CsvBackend,
+    'npy': _NpyBackend,
+}
+
 
 class DataLogger:
-    def __init__(self, filepath, mode='w'):
+    """
+    Writes telemetry rows (COLUMNS) to disk.
+
+    The format follows the file extension: '.csv' for text, '.npy' for the
+    binary record format (TELEMETRY_DTYPE), which is much faster to write and
+    to load back with visualization.plotter.load_data.
+
+    With asynchronous=True the formatting and disk I/O run on a background
+    thread, and the log_* calls only copy the data into a bounded queue.
+
+    policies ({satellite name or 'default': LogPolicy kwargs}) enables
+    decimated / event-triggered logging; None logs every row in full.
+    """
+    def __init__(self, filepath, mode='w', fmt=None, asynchronous=False, queue_size=256, policies=None):
         self.filepath = filepath
-        
+        self.fmt = fmt or os.path.splitext(filepath)[1].lstrip('.').lower()
+        if self.fmt not in BACKENDS:
+            raise ValueError(f"Unknown telemetry format '{self.fmt}'. Options: {list(BACKENDS)}")
+
         # Safety: Create directory if it doesn't exist (e.g., 'results/')
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        
+
         # Keep file open for performance (vs opening/closing every step)
-        self.file = open(filepath, mode, newline='')
-        self.writer = csv.writer(self.file)
-        
-        # Write Header immediately
-        self.writer.writerow([
-            'time', 'name',
-            'rx', 'ry', 'rz', 
-            'vx', 'vy', 'vz',
-            'qw', 'qx', 'qy', 'qz',    # <--- NEW: Quaternion
-            'wx', 'wy', 'wz',          # <--- NEW: Angular Velocity
-            'mass', 'thrust_on'
-        ])
+        self.backend = BACKENDS[self.fmt](filepath, mode)
+        if asynchronous:
+            self.backend = _AsyncBackend(self.backend, queue_size)
+
+        # {name or 'default': LogPolicy kwargs}; one LogPolicy is built per satellite
+        self.policies = policies
+        self._policy = {}
+
+    def _policy_for(self, name):
+        policy = self._policy.get(name)
+        if policy is None:
+            options = self.policies.get(name, self.policies.get('default', {}))
+            policy = self._policy[name] = LogPolicy(**options)
+        return policy
+
+    def _write(self, time, names, values):
+        if self.policies is None:
+            self.backend.write_rows(np.full(len(names), time, dtype=float), names, values)
+            return
+
+        times, kept_names, kept = [], [], []
+        for name, row in zip(names, values):
+            for row_time, masked in self._policy_for(name).select(time, row):
+                times.append(row_time)
+                kept_names.append(name)
+                kept.append(masked)
+        if kept:
+            self.backend.write_rows(np.array(times), kept_names, np.array(kept))
 
     def log_step(self, time, satellite):
-        rx, ry, rz = satellite.position
-        vx, vy, vz = satellite.velocity
-        qw, qx, qy, qz = satellite.attitude.q
-        wx, wy, wz = satellite.angular_velocity
-        
-        row = [
-            time, satellite.name,
-            rx, ry, rz,
-            vx, vy, vz,
-            qw, qx, qy, qz,   # <--- Log them
-            wx, wy, wz,       # <--- Log them
-            satellite.mass,
-            0
-            # int(satellite.thrust_is_on)
-        ]
-        self.writer.writerow(row)
+        self.log_state(time, satellite.name, satellite.state, satellite.mass)
+
+    def log_state(self, time, name, state, mass):
+        """
+        Logs a raw 13-element state [r, v, q, w] that is not attached to a
+        Satellite (e.g. a sample from a dense-output arc).
+        """
+        values = np.empty((1, len(VALUE_COLUMNS)))
+        values[0, 0:13] = state
+        values[0, 13] = mass
+        values[0, 14] = 0 # thrust_on: int(satellite.thrust_is_on)
+        self._write(time, [name], values)
+
+    def log_constellation(self, time, constellation, states=None):
+        """
+        Logs every satellite of a Constellation straight from its arrays.
+
+        :param states: (N, 13) states to log instead of the current ones (e.g. interpolated)
+        """
+        values = np.empty((len(constellation), len(VALUE_COLUMNS)))
+        values[:, 0:13] = constellation.states if states is None else states
+        values[:, 13] = constellation.masses
+        values[:, 14] = 0
+        self._write(time, constellation.names, values)
+
+    def log_trajectories(self, times, names, states, masses, block_rows=65536):
+        """
+        Logs precomputed trajectories (e.g. from core.analytic), in the same
+        time-major row order as logging a constellation step by step.
+
+        :param times: (T,) times
+        :param names: N satellite names
+        :param states: (N, T, 13) states
+        :param masses: (N,) masses
+        """
+        times = np.asarray(times, dtype=float)
+        N = len(names)
+        steps = max(1, block_rows // max(N, 1)) # Time steps per write
+        for start in range(0, len(times), steps):
+            block = states[:, start:start + steps].transpose(1, 0, 2) # (steps, N, 13)
+            values = np.empty(block.shape[:2] + (len(VALUE_COLUMNS),))
+            values[..., 0:13] = block
+            values[..., 13] = masses
+            values[..., 14] = 0
+            if self.policies is None:
+                self.backend.write_rows(np.repeat(times[start:start + steps], N), list(names) * len(block),
+                                        values.reshape(-1, len(VALUE_COLUMNS)))
+            else:
+                for time, rows in zip(times[start:start + steps], values):
+                    self._write(time, names, rows)
+
+    def flush(self):
+        """Pushes buffered rows to disk."""
+        self.backend.flush()
+
+    def get_state(self):
+        """
+        Everything needed to continue this file later (see resume): the
+        position after the rows written so far and the per-satellite policy
+        states. Flushes the file.
+        """
+        return {
+            'position': int(self.backend.tell()),
+            'policies': {name: policy.get_state() for name, policy in self._policy.items()},
+        }
+
+    @classmethod
+    def resume(cls, filepath, state, fmt=None, **kwargs):
+        """
+        Reopens a telemetry file at a get_state() position: rows written
+        after it are discarded and new rows are appended.
+        """
+        fmt = fmt or os.path.splitext(filepath)[1].lstrip('.').lower()
+        BACKENDS[fmt].truncate(filepath, state['position'])
+        logger = cls(filepath, mode='a', fmt=fmt, **kwargs)
+        for name, policy_state in state['policies'].items():
+            logger._policy_for(name).set_state(policy_state)
+        return logger
 
     def close(self):
         """Flush and close the file handler."""
-        self.file.close()
\ No newline at end of file
+        self.backend.close()
+
+
+def read_telemetry(filepath, mmap_mode='r'):
+    """
+    Opens binary telemetry as a (memory-mapped) structured array.
+    """
+    return np.load(filepath, mmap_mode=mmap_mode)
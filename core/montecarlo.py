@@ -0,0 +1,224 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import repeat
+
+import numpy as np
+
+from objects import Satellite
+from utils import Quaternion
+
+from .engine import PhysicsEngine
+from .logger import STATE_COLUMNS
+
+
+class Dispersion:
+    """
+    1-sigma dispersions applied around a nominal Satellite.
+
+    :param position: Position sigma per axis (m)
+    :param velocity: Velocity sigma per axis (m/s)
+    :param attitude: Attitude error sigma per axis, small-angle body rotation (rad)
+    :param angular_velocity: Angular velocity sigma per axis (rad/s)
+    :param mass: Relative mass sigma (fraction of nominal)
+    :param inertia: Relative sigma of each principal moment (fraction of nominal)
+    :param ballistic_coefficient: Relative ballistic coefficient sigma (fraction of nominal)
+    :param srp_area: Relative SRP area (Cr * A) sigma (fraction of nominal)
+    """
+    def __init__(self, position=0.0, velocity=0.0, attitude=0.0, angular_velocity=0.0, mass=0.0, inertia=0.0,
+                 ballistic_coefficient=0.0, srp_area=0.0):
+        self.position = position
+        self.velocity = velocity
+        self.attitude = attitude
+        self.angular_velocity = angular_velocity
+        self.mass = mass
+        self.inertia = inertia
+        self.ballistic_coefficient = ballistic_coefficient
+        self.srp_area = srp_area
+
+    def sample(self, nominal, rng):
+        """Returns a new Satellite drawn around `nominal`."""
+        rotation = rng.normal(0.0, self.attitude, 3)
+        angle = np.linalg.norm(rotation)
+        attitude = nominal.attitude @ Quaternion.from_axis_angle(rotation, angle)
+
+        # S I S keeps the inertia symmetric positive definite
+        scale = np.sqrt(np.clip(1.0 + rng.normal(0.0, self.inertia, 3), 1e-3, None))
+        inertia = scale[:, None] * nominal.inertia * scale[None, :]
+
+        return Satellite(
+            name=nominal.name,
+            mass=nominal.mass * max(1.0 + rng.normal(0.0, self.mass), 1e-3),
+            inertia=inertia,
+            position=nominal.position + rng.normal(0.0, self.position, 3),
+            velocity=nominal.velocity + rng.normal(0.0, self.velocity, 3),
+            attitude=attitude,
+            angular_velocity=nominal.angular_velocity + rng.normal(0.0, self.angular_velocity, 3),
+            ballistic_coefficient=nominal.ballistic_coefficient * max(1.0 + rng.normal(0.0, self.ballistic_coefficient), 1e-3),
+            center_of_pressure=nominal.center_of_pressure,
+            srp_area=nominal.srp_area * max(1.0 + rng.normal(0.0, self.srp_area), 0.0)
+        )
+
+
+class OnlineStatistics:
+    """
+    Streaming statistics of (T, C) samples (one trajectory per run).
+
+    Mean and covariance per output time use Welford/Chan updates, so partial
+    results from different workers can be merged. Percentiles come from
+    fixed-bin histograms per (time, channel) whose ranges are set once from a
+    warm-up set of runs; memory is O(T * C * (C + bins)) whatever the run count.
+    """
+    def __init__(self, lower, width, bins):
+        self.lower = lower
+        self.width = width
+        self.bins = bins
+        n_times, n_channels = lower.shape
+        self.count = 0
+        self.mean = np.zeros((n_times, n_channels))
+        self.m2 = np.zeros((n_times, n_channels, n_channels))
+        self.histogram = np.zeros((n_times, n_channels, bins), dtype=np.int32)
+        self._cells = np.arange(n_times * n_channels) * bins
+
+    @classmethod
+    def from_samples(cls, samples, bins=64, spread=6.0):
+        """
+        Sets the histogram ranges to mean +/- spread sigma of the warm-up
+        samples (R, T, C) and folds those samples in.
+        """
+        center = samples.mean(axis=0)
+        sigma = samples.std(axis=0)
+        # Floor the range so degenerate (zero-spread) cells still get a bin width
+        half_range = np.maximum(spread * sigma, 1e-9 * np.maximum(np.abs(center), 1.0))
+        stats = cls(center - half_range, 2 * half_range / bins, bins)
+        for sample in samples:
+            stats.update(sample)
+        return stats
+
+    def update(self, sample):
+        """Adds one (T, C) trajectory."""
+        self.count += 1
+        delta = sample - self.mean
+        self.mean += delta / self.count
+        self.m2 += np.einsum('tc,td->tcd', delta, sample - self.mean)
+
+        # Each cell receives exactly one value, so plain fancy indexing is safe
+        index = np.clip(((sample - self.lower) / self.width).astype(np.int64), 0, self.bins - 1)
+        self.histogram.reshape(-1)[self._cells + index.ravel()] += 1
+
+    def merge(self, other):
+        """Folds in statistics gathered elsewhere (same histogram ranges)."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + np.einsum('tc,td->tcd', delta, delta) * (self.count * other.count / total)
+        self.mean += delta * (other.count / total)
+        self.histogram += other.histogram
+        self.count = total
+
+    @property
+    def covariance(self):
+        return self.m2 / max(self.count - 1, 1)
+
+    def percentile(self, p):
+        """Approximate p-th percentile (T, C), interpolated inside the bins."""
+        cumulative = np.cumsum(self.histogram, axis=-1)
+        target = p / 100.0 * self.count
+        k = np.minimum((cumulative < target).sum(axis=-1), self.bins - 1)
+        below = np.take_along_axis(cumulative, k[..., None], axis=-1)[..., 0] - \
+            np.take_along_axis(self.histogram, k[..., None], axis=-1)[..., 0]
+        in_bin = np.maximum(np.take_along_axis(self.histogram, k[..., None], axis=-1)[..., 0], 1)
+        fraction = np.clip((target - below) / in_bin, 0.0, 1.0)
+        return self.lower + (k + fraction) * self.width
+
+
+class MonteCarloResult:
+    """
+    Envelopes of a Monte Carlo campaign at each output time.
+    """
+    def __init__(self, times, statistics, percentiles):
+        self.times = times
+        self.columns = list(STATE_COLUMNS)
+        self.n_runs = statistics.count
+        self.mean = statistics.mean
+        self.covariance = statistics.covariance
+        self.percentiles = {p: statistics.percentile(p) for p in percentiles}
+
+    def save(self, filepath):
+        """Writes the envelopes to a compressed .npz file."""
+        np.savez_compressed(
+            filepath,
+            times=self.times,
+            columns=np.array(self.columns),
+            n_runs=self.n_runs,
+            mean=self.mean,
+            covariance=self.covariance,
+            percentile_levels=np.array(list(self.percentiles)),
+            percentiles=np.array(list(self.percentiles.values()))
+        )
+
+
+def _run_one(nominal, dispersion, env, times, seed):
+    """Propagates one dispersed satellite and returns its (T, 13) trajectory."""
+    rng = np.random.default_rng(seed)
+    satellite = dispersion.sample(nominal, rng)
+    engine = PhysicsEngine(env)
+    return engine.propagate_arc(satellite, times[0], times[-1], times)
+
+
+def _run_chunk(nominal, dispersion, env, times, seeds, lower, width, bins):
+    """Runs a chunk of dispersions and reduces them inside the worker."""
+    stats = OnlineStatistics(lower, width, bins)
+    for seed in seeds:
+        stats.update(_run_one(nominal, dispersion, env, times, seed))
+    return stats
+
+
+def run_monte_carlo(nominal, dispersion, env, times, n_runs, seed=0, workers=None,
+                    chunk_size=16, warmup=32, bins=64, percentiles=(5, 50, 95)):
+    """
+    Runs n_runs dispersed propagations over a process pool.
+
+    Every run gets its own child of SeedSequence(seed), so results do not
+    depend on the number of workers or on the chunking. Runs are reduced on
+    the fly; only O(workers) chunks are in flight at any time.
+
+    :param nominal: Nominal Satellite
+    :param dispersion: Dispersion to apply
+    :param env: Environment (must be picklable)
+    :param times: Output times (s); the arc runs from times[0] to times[-1]
+    :param n_runs: Number of runs
+    :param seed: Campaign seed
+    :param workers: Worker processes (None = number of CPUs)
+    :param chunk_size: Runs per task
+    :param warmup: Runs used to set the percentile histogram ranges
+    :param bins: Histogram bins per (time, channel)
+    :return: MonteCarloResult
+    """
+    times = np.asarray(times, dtype=float)
+    seeds = np.random.SeedSequence(seed).spawn(n_runs)
+    n_warmup = min(warmup, n_runs)
+    workers = workers or os.cpu_count()
+
+    with ProcessPoolExecutor(workers) as pool:
+        # 1. Warm-up runs fix the histogram ranges
+        samples = list(pool.map(_run_one, repeat(nominal), repeat(dispersion), repeat(env), repeat(times), seeds[:n_warmup]))
+        stats = OnlineStatistics.from_samples(np.stack(samples), bins)
+        del samples
+
+        # 2. Remaining runs are reduced in the workers and merged here
+        max_in_flight = 2 * workers
+        in_flight = set()
+        for start in range(n_warmup, n_runs, chunk_size):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats.merge(future.result())
+            in_flight.add(pool.submit(
+                _run_chunk, nominal, dispersion, env, times,
+                seeds[start:start + chunk_size], stats.lower, stats.width, bins
+            ))
+        for future in in_flight:
+            stats.merge(future.result())
+
+    return MonteCarloResult(times, stats, percentiles)
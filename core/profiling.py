@@ -0,0 +1,239 @@
+import json
+import os
+import time
+from collections import defaultdict
+
+# Methods timed by Profiler.attach: (attribute, component name, kind)
+ENGINE_METHODS = [
+    ('propagate', 'engine.propagate', 'step'),
+    ('propagate_batch', 'engine.propagate_batch', 'step'),
+    ('propagate_multirate', 'engine.propagate_multirate', 'step'),
+    ('propagate_arc', 'engine.propagate_arc', 'step'),
+    ('eom', 'engine.eom', 'rhs'),
+    ('eom_batch', 'engine.eom_batch', 'rhs'),
+    ('eom_orbit', 'engine.eom_orbit', 'rhs'),
+    ('eom_attitude', 'engine.eom_attitude', 'rhs'),
+]
+ENVIRONMENT_METHODS = [
+    ('get_forces', 'env.get_forces', 'env'),
+    ('get_torques', 'env.get_torques', 'env'),
+    ('get_forces_batch', 'env.get_forces_batch', 'env'),
+    ('get_torques_batch', 'env.get_torques_batch', 'env'),
+]
+LOGGER_METHODS = [
+    ('write_rows', 'logger.write_rows', 'io'),
+    ('flush', 'logger.flush', 'io'),
+    ('close', 'logger.close', 'io'),
+]
+
+
+class Profiler:
+    """
+    Opt-in instrumentation of a simulation run.
+
+    attach() replaces the timed methods of a PhysicsEngine, its Environment
+    and a DataLogger's backend with timing wrappers set on the instances;
+    detach() removes them again. Nothing is patched until attach() is
+    called, so an unprofiled run pays no overhead at all.
+
+    Recorded:
+        - calls, total and self (exclusive) time per component, e.g. the
+          self time of engine.propagate is the integrator's own overhead
+        - RHS evaluations and accepted/rejected integrator steps per
+          propagate* call (steps are read from the engine's integrators;
+          the solve_ivp calls made directly by propagate_arc and by the
+          orbit half of propagate_multirate only report RHS evaluations;
+          rejected steps are None (n/a) as soon as an integrator cannot
+          count them, e.g. solve_ivp with an implicit method)
+        - time and RHS evaluations per satellite (a batched call is split
+          evenly between the satellites it advances)
+        - a Chrome trace (chrome://tracing, Perfetto, speedscope) with one
+          event per propagate*/logger call, and per RHS/environment call
+          when trace_rhs=True
+
+    :param trace: Keep trace events
+    :param trace_rhs: Also trace every RHS and environment call (large)
+    """
+    def __init__(self, trace=True, trace_rhs=False):
+        self.trace = trace
+        self.trace_rhs = trace_rhs
+        self.components = defaultdict(lambda: [0, 0.0, 0.0]) # name: [calls, total, self]
+        self.satellites = defaultdict(lambda: [0, 0.0, 0]) # name: [calls, time, rhs evals]
+        self.steps = [0, 0, 0, 0] # propagate* calls, rhs evals, accepted, rejected
+        self.rhs_evals = 0
+        self.events = []
+        self._children = [] # Child time of the open spans
+        self._patched = []
+        self._engine = None
+        self._t0 = time.perf_counter()
+
+    # 1. Attaching
+
+    def attach(self, engine=None, logger=None):
+        """
+        Instruments an engine (and its environment) and/or a logger.
+
+        :param engine: PhysicsEngine
+        :param logger: DataLogger
+        :return: self
+        """
+        if engine is not None:
+            self._engine = engine
+            for attr, name, kind in ENGINE_METHODS:
+                self._patch(engine, attr, name, kind)
+            for attr, name, kind in ENVIRONMENT_METHODS:
+                self._patch(engine.env, attr, name, kind)
+        if logger is not None:
+            for attr, name, kind in LOGGER_METHODS:
+                self._patch(logger.backend, attr, name, kind)
+        self._t0 = time.perf_counter()
+        return self
+
+    def detach(self):
+        """Restores the original methods."""
+        for obj, attr, original in reversed(self._patched):
+            if original is None:
+                delattr(obj, attr)
+            else:
+                setattr(obj, attr, original)
+        self._patched = []
+
+    def _patch(self, obj, attr, name, kind):
+        if not hasattr(obj, attr):
+            return
+        self._patched.append((obj, attr, obj.__dict__.get(attr)))
+        method = getattr(obj, attr)
+        if kind == 'step':
+            wrapper = self._step_wrapper(method, name)
+        else:
+            wrapper = self._span_wrapper(method, name, kind)
+        setattr(obj, attr, wrapper)
+
+    # 2. Wrappers
+
+    def _begin(self):
+        self._children.append(0.0)
+        return time.perf_counter()
+
+    def _end(self, name, category, start, args=None, traced=True):
+        end = time.perf_counter()
+        duration = end - start
+        child = self._children.pop()
+        if self._children:
+            self._children[-1] += duration
+
+        stats = self.components[name]
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] += duration - child
+
+        if self.trace and traced:
+            event = {
+                'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+                'ts': (start - self._t0) * 1e6, 'dur': duration * 1e6,
+            }
+            if args:
+                event['args'] = args
+            self.events.append(event)
+        return duration
+
+    def _span_wrapper(self, method, name, kind):
+        traced = kind == 'io' or self.trace_rhs
+
+        def wrapper(*args, **kwargs):
+            start = self._begin()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if kind == 'rhs':
+                    self.rhs_evals += 1
+                self._end(name, kind, start, traced=traced)
+        return wrapper
+
+    def _integrator_counts(self):
+        counts = [0, 0]
+        for integrator in (self._engine.integrator, self._engine.attitude_integrator):
+            counts[0] += integrator.naccept
+            counts[1] = None if counts[1] is None or integrator.nreject is None else counts[1] + integrator.nreject
+        return counts
+
+    def _step_wrapper(self, method, name):
+        def wrapper(body, t, *args, **kwargs):
+            rhs_before = self.rhs_evals
+            accepted_before, rejected_before = self._integrator_counts()
+            start = self._begin()
+            try:
+                return method(body, t, *args, **kwargs)
+            finally:
+                rhs = self.rhs_evals - rhs_before
+                accepted, rejected = self._integrator_counts()
+                accepted -= accepted_before
+                if rejected is not None:
+                    rejected -= rejected_before
+                # A Constellation has .names; a single body has .name
+                names = list(body.names) if hasattr(body, 'names') else [body.name]
+
+                args = {'t': t, 'satellites': names, 'rhs_evals': rhs,
+                        'accepted_steps': accepted, 'rejected_steps': rejected}
+                duration = self._end(name, 'step', start, args)
+
+                self.steps[0] += 1
+                self.steps[1] += rhs
+                self.steps[2] += accepted
+                self.steps[3] = None if self.steps[3] is None or rejected is None else self.steps[3] + rejected
+                for sat in names:
+                    stats = self.satellites[sat]
+                    stats[0] += 1
+                    stats[1] += duration / len(names)
+                    stats[2] += rhs
+        return wrapper
+
+    # 3. Reporting
+
+    def summary(self):
+        """Machine-readable summary of the run (JSON-serializable dict)."""
+        calls, rhs, accepted, rejected = self.steps
+        components = {
+            name: {'calls': n, 'total_s': total, 'self_s': own, 'mean_us': 1e6 * total / n}
+            for name, (n, total, own) in sorted(self.components.items(), key=lambda item: -item[1][2])
+        }
+        return {
+            'wall_s': time.perf_counter() - self._t0,
+            'components': components,
+            'propagation': {
+                'calls': calls,
+                'rhs_evals': rhs,
+                'accepted_steps': accepted,
+                'rejected_steps': rejected,
+                'rhs_evals_per_call': rhs / calls if calls else 0.0,
+            },
+            'satellites': {
+                name: {'calls': n, 'time_s': seconds, 'rhs_evals': evals}
+                for name, (n, seconds, evals) in self.satellites.items()
+            },
+        }
+
+    def save(self, summary_path, trace_path=None):
+        """
+        Writes the summary and, if trace_path is given, the Chrome trace
+        (Trace Event Format JSON).
+        """
+        os.makedirs(os.path.dirname(summary_path) or '.', exist_ok=True)
+        with open(summary_path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        if trace_path is not None:
+            with open(trace_path, 'w') as f:
+                json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+    def report(self, top=10):
+        """Human-readable table of the components with the most self time."""
+        summary = self.summary()
+        lines = [f"{'component':<28}{'calls':>10}{'total (s)':>12}{'self (s)':>12}{'mean (us)':>12}"]
+        for name, entry in list(summary['components'].items())[:top]:
+            lines.append(f"{name:<28}{entry['calls']:>10d}{entry['total_s']:>12.3f}"
+                         f"{entry['self_s']:>12.3f}{entry['mean_us']:>12.1f}")
+        prop = summary['propagation']
+        lines.append(f"propagate calls: {prop['calls']}, RHS evals: {prop['rhs_evals']}, "
+                     f"accepted/rejected steps: {prop['accepted_steps']}/"
+                     f"{'n/a' if prop['rejected_steps'] is None else prop['rejected_steps']}")
+        return '\n'.join(lines)
@@ -0,0 +1,178 @@
+import heapq
+
+
+class Task:
+    """
+    A periodic task of the Scheduler.
+
+    :param name: Task name
+    :param period: Period (s)
+    :param callback: Called as callback(t) at every activation
+    :param priority: Order of the tasks due at the same time (lowest first)
+    :param start: First activation time (s)
+    :param breaks_physics: The callback may change the inputs held by the
+        physics (e.g. control), so the integration stops at its activations.
+        False for tasks that only read the state (e.g. estimation), which
+        then run on the interpolated state without splitting the step
+    """
+    def __init__(self, name, period, callback, priority=0, start=0.0, breaks_physics=True):
+        if period <= 0:
+            raise ValueError(f"Task '{name}' needs a positive period, got {period}")
+        self.name = name
+        self.period = period
+        self.callback = callback
+        self.priority = priority
+        self.start = start
+        self.breaks_physics = breaks_physics
+        self.calls = 0
+
+    def time(self, k):
+        """Time of the k-th activation (no accumulated rounding)."""
+        return round(self.start + k * self.period, Scheduler.TIME_DECIMALS)
+
+
+class Scheduler:
+    """
+    Discrete-event simulation loop for tasks running at their own rates.
+
+    Activations are kept in a priority queue ordered by (time, priority),
+    ties going to the task added first, so a restored schedule replays in
+    exactly the same order.
+    The physics is not a task: before the tasks due at an event time run,
+    advance(t, dt) brings the dynamics from the previous event time to this
+    one (in steps of at most max_step). Whatever the tasks set in between
+    (e.g. control inputs) is therefore held constant over each integration
+    interval, a zero-order hold.
+
+    Only tasks that break the physics (Task.breaks_physics) end an
+    integration interval. With dense_output, the others are run after the
+    step that contains their activation and read the state there with
+    state_at(t), which the step returned from the integrator's dense output:
+    a 10 Hz estimator (or a logger inside a long orbit step) then costs one
+    interpolation per activation, not a solver restart. Without dense output
+    every task ends an interval (exact state, but the integrator restarts at
+    every activation).
+
+    :param advance: advance(t, dt, t_eval=None), propagates the physics over
+        [t, t + dt]; given t_eval (times inside the step) it returns the
+        states at those times, stacked along the first axis
+    :param t0: Start time (s)
+    :param max_step: Longest single physics step (s); None = event to event
+    :param sample: sample() -> current physics states, for state_at at the current time
+    :param dense_output: advance() accepts t_eval
+    """
+    TIME_DECIMALS = 9 # Event times are rounded to 1 ns so that equal times from different rates coincide
+
+    def __init__(self, advance, t0=0.0, max_step=None, sample=None, dense_output=False):
+        self.advance = advance
+        self.t = t0
+        self.max_step = max_step
+        self.sample = sample
+        self.dense_output = dense_output
+        self.tasks = {}
+        self._queue = []
+        self._samples = {} # time: states, inside the last physics step
+
+    def add_task(self, name, rate, callback, priority=0, start=None, breaks_physics=True):
+        """
+        Schedules callback(t) every 1 / rate seconds from `start` (default:
+        the current time).
+
+        :param rate: Frequency (Hz)
+        :param breaks_physics: See Task
+        :return: Task
+        """
+        task = Task(name, 1.0 / rate, callback, priority, self.t if start is None else start, breaks_physics)
+        task.order = len(self.tasks)
+        self.tasks[name] = task
+        self._push(task, 0)
+        return task
+
+    def _push(self, task, k):
+        heapq.heappush(self._queue, (task.time(k), task.priority, task.order, task, k))
+
+    def state(self):
+        """
+        Current time and the index of each task's next activation, for
+        checkpoints. Valid inside a callback too (the running task has
+        already been rescheduled).
+        """
+        return {'t': self.t, 'next': {task.name: k for _, _, _, task, k in self._queue}}
+
+    def restore(self, state):
+        """
+        Resumes from a state() snapshot; the same tasks must have been added
+        (their first activations are replaced). Tasks due at the snapshot
+        time that had not run yet run first.
+        """
+        self.t = state['t']
+        self._queue = []
+        self._samples = {}
+        for name, k in state['next'].items():
+            task = self.tasks[name]
+            task.calls = k
+            self._push(task, k)
+
+    def state_at(self, t):
+        """
+        Physics states at an activation time t, for tasks that do not break
+        the physics: the current states at the current time, else the
+        states the last physics step returned for t.
+        """
+        if t == self.t:
+            return self.sample()
+        if t not in self._samples:
+            raise ValueError(f"No physics state available at t = {t} (current time {self.t})")
+        return self._samples[t]
+
+    def _activations(self, t):
+        """Sorted activation times before t of the tasks that do not break the physics."""
+        times = set()
+        for time, _, _, task, k in self._queue:
+            while not task.breaks_physics and time < t:
+                times.add(time)
+                k += 1
+                time = task.time(k)
+        return sorted(times)
+
+    def _step_to(self, t, dense_output=False):
+        """One physics step towards t (at most max_step)."""
+        dt = t - self.t if self.max_step is None else min(self.max_step, t - self.t)
+        # Land exactly on t, whatever the rounding of the sub-steps
+        t_next = t if self.t + dt >= t - 1e-12 else self.t + dt
+        t_eval = self._activations(t_next) if dense_output else []
+        if t_eval:
+            self._samples = dict(zip(t_eval, self.advance(self.t, t_next - self.t, t_eval)))
+        else:
+            self._samples = {}
+            self.advance(self.t, t_next - self.t)
+        self.t = t_next
+
+    def _advance_to(self, t):
+        while self.t < t:
+            self._step_to(t)
+
+    def _next_break(self, tf):
+        """Time of the next activation that ends an integration interval (at most tf)."""
+        return min([time for time, _, _, task, _ in self._queue if task.breaks_physics] + [tf])
+
+    def run(self, tf):
+        """Processes every activation up to and including tf, then advances the physics to tf."""
+        while self._queue and self._queue[0][0] <= tf:
+            t_event, _, _, task, _ = self._queue[0]
+            if t_event > self.t:
+                if self.dense_output and not task.breaks_physics:
+                    # One step towards the next break; the activations it covers run on its interpolant
+                    self._step_to(self._next_break(tf), dense_output=True)
+                else:
+                    self._advance_to(t_event)
+                continue
+
+            # 1. Every task due now, by priority
+            while self._queue and self._queue[0][0] == t_event:
+                _, _, _, task, k = heapq.heappop(self._queue)
+                self._push(task, k + 1)
+                task.callback(t_event)
+                task.calls += 1
+
+        self._advance_to(tf)
@@ -0,0 +1,194 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.orbits import cartesian_to_kepler, true_to_mean
+
+from .logger import read_telemetry
+
+# Columns of osculating_elements (a in m, angles in deg)
+ELEMENT_COLUMNS = ['time', 'name', 'a', 'e', 'i', 'raan', 'arg_perigee', 'true_anomaly', 'mean_anomaly']
+
+
+def index_path(filepath):
+    """Sidecar index file of a binary telemetry file."""
+    return filepath + '.idx.json'
+
+
+def _row_runs(rows):
+    """
+    Compresses sorted row numbers into arithmetic runs [(start, stop, step)],
+    stop being one past the last row of the run.
+
+    Telemetry logged every step for a fixed set of satellites gives a single
+    run per satellite (start=k, step=N), which maps onto a strided view.
+    """
+    if rows.size == 0:
+        return []
+    if rows.size == 1:
+        return [(int(rows[0]), int(rows[0]) + 1, 1)]
+
+    steps = np.diff(rows)
+    # Segments of constant step in `steps`
+    seg_starts = np.concatenate(([0], np.flatnonzero(np.diff(steps) != 0) + 1))
+    seg_stops = np.concatenate((seg_starts[1:], [steps.size]))
+
+    runs = []
+    i = 0
+    while i < rows.size:
+        if i == rows.size - 1:
+            runs.append((int(rows[i]), int(rows[i]) + 1, 1))
+            break
+        k = np.searchsorted(seg_starts, i, side='right') - 1
+        j = seg_stops[k] # rows[i..j] share the step steps[i]
+        runs.append((int(rows[i]), int(rows[j]) + 1, int(steps[i])))
+        i = j + 1
+    return runs
+
+
+def build_index(records):
+    """
+    Index of a telemetry record array: per satellite, the arithmetic runs of
+    its rows and the time bounds of each run.
+    """
+    names, codes = np.unique(records['name'], return_inverse=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(names.size + 1))
+    times = records['time']
+
+    satellites = {}
+    for k, name in enumerate(names):
+        rows = order[bounds[k]:bounds[k + 1]]
+        runs = []
+        for start, stop, step in _row_runs(rows):
+            runs.append({
+                'start': start, 'stop': stop, 'step': step,
+                't_first': float(times[start]), 't_last': float(times[stop - 1]),
+            })
+        satellites[name.decode()] = {
+            'count': int(rows.size),
+            't_min': min(run['t_first'] for run in runs),
+            't_max': max(run['t_last'] for run in runs),
+            'runs': runs,
+        }
+
+    return {'rows': int(records.shape[0]), 'satellites': satellites}
+
+
+class TelemetryReader:
+    """
+    Random access to binary (.npy) telemetry through a memory map.
+
+    A sidecar index (<file>.idx.json, built on first open and rebuilt when
+    the file's row count, size or modification time changes) records where each satellite's rows are, so a query only
+    touches the rows it returns. Results are NumPy views of the memory map
+    whenever a satellite's rows form a single strided run (the usual case),
+    copies otherwise.
+    """
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.records = read_telemetry(filepath)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        path = index_path(self.filepath)
+        stat = os.stat(self.filepath)
+        # A file rewritten in place keeps its row count; size and mtime catch that
+        source = {'rows': self.records.shape[0], 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        if os.path.exists(path):
+            with open(path) as f:
+                index = json.load(f)
+            if all(index.get(key) == value for key, value in source.items()):
+                return index
+
+        index = dict(build_index(self.records), **source)
+        with open(path, 'w') as f:
+            json.dump(index, f)
+        return index
+
+    @property
+    def names(self):
+        return list(self.index['satellites'])
+
+    def time_bounds(self, name):
+        entry = self.index['satellites'][name]
+        return entry['t_min'], entry['t_max']
+
+    def satellite(self, name, columns=None, tstart=None, tend=None):
+        """
+        Rows of one satellite with tstart <= time <= tend, as a structured
+        array (restricted to `columns` if given).
+        """
+        tstart = -np.inf if tstart is None else tstart
+        tend = np.inf if tend is None else tend
+
+        pieces = []
+        for run in self.index['satellites'][name]['runs']:
+            if run['t_last'] < tstart or run['t_first'] > tend:
+                continue
+            view = self.records[run['start']:run['stop']:run['step']]
+            times = view['time']
+            lo = np.searchsorted(times, tstart, side='left')
+            hi = np.searchsorted(times, tend, side='right')
+            pieces.append(view[lo:hi])
+
+        if columns is not None:
+            pieces = [piece[list(columns)] for piece in pieces]
+        if len(pieces) == 1:
+            return pieces[0]
+        if not pieces:
+            return self.records[:0] if columns is None else self.records[:0][list(columns)]
+        return np.concatenate(pieces)
+
+    def query(self, names=None, columns=None, tstart=None, tend=None):
+        """{name: structured array} for the requested satellites."""
+        names = self.names if names is None else names
+        return {name: self.satellite(name, columns, tstart, tend) for name in names}
+
+    def to_frame(self, names=None, columns=None, tstart=None, tend=None):
+        """
+        Same query as a DataFrame in the load_data layout (with 'time' and
+        'name' columns).
+        """
+        if columns is not None:
+            columns = ['time'] + [c for c in columns if c not in ('time', 'name')]
+
+        frames = []
+        for name, rows in self.query(names, columns, tstart, tend).items():
+            frame = pd.DataFrame({column: rows[column] for column in rows.dtype.names if column != 'name'})
+            frame.insert(1, 'name', name)
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+
+
+def osculating_elements(data, mu=None):
+    """
+    Osculating Keplerian elements of every row of a telemetry table (a
+    load_data DataFrame or a read_telemetry record array), in one vectorized
+    conversion. Rows without an orbit sample (logging policies) are dropped.
+
+    :param mu: Gravitational parameter (default: Earth)
+    :return: DataFrame with ELEMENT_COLUMNS
+    """
+    rx = np.asarray(data['rx'], dtype=float)
+    keep = ~(np.isnan(rx) | np.isnan(np.asarray(data['vx'], dtype=float)))
+    positions = np.column_stack([np.asarray(data[c], dtype=float)[keep] for c in ('rx', 'ry', 'rz')])
+    velocities = np.column_stack([np.asarray(data[c], dtype=float)[keep] for c in ('vx', 'vy', 'vz')])
+    names = np.asarray(data['name'])[keep]
+    if names.dtype.kind == 'S':
+        names = np.char.decode(names)
+
+    a, e, i, raan, arg_perigee, nu = cartesian_to_kepler(positions, velocities, mu)
+    return pd.DataFrame({
+        'time': np.asarray(data['time'], dtype=float)[keep],
+        'name': names,
+        'a': a,
+        'e': e,
+        'i': np.degrees(i),
+        'raan': np.degrees(raan),
+        'arg_perigee': np.degrees(arg_perigee),
+        'true_anomaly': np.degrees(nu),
+        'mean_anomaly': np.degrees(true_to_mean(nu, e) % (2.0 * np.pi)),
+    }, columns=ELEMENT_COLUMNS)
@@ -1 +1,4 @@
-from .environment import TwoBodyJ2, CR3BP
\ No newline at end of file
+from .environment import TwoBodyJ2, CR3BP
+from .gravity import SphericalHarmonicGravity
+from .atmosphere import TabulatedAtmosphere
+from .ephemeris import ChebyshevEphemeris
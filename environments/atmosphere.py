@@ -0,0 +1,154 @@
+import math
+
+import numpy as np
+
+import config
+from utils import quat_rotate
+from utils.constants import EARTH_ROTATION_RATE
+
+# Exponential atmosphere (Vallado, Fundamentals of Astrodynamics, table 8-4):
+# base altitude (km), density at the base (kg/m^3), scale height (km)
+EXPONENTIAL_TABLE = np.array([
+    [0, 1.225, 7.249],
+    [25, 3.899e-2, 6.349],
+    [30, 1.774e-2, 6.682],
+    [40, 3.972e-3, 7.554],
+    [50, 1.057e-3, 8.382],
+    [60, 3.206e-4, 7.714],
+    [70, 8.770e-5, 6.549],
+    [80, 1.905e-5, 5.799],
+    [90, 3.396e-6, 5.382],
+    [100, 5.297e-7, 5.877],
+    [110, 9.661e-8, 7.263],
+    [120, 2.438e-8, 9.473],
+    [130, 8.484e-9, 12.636],
+    [140, 3.845e-9, 16.149],
+    [150, 2.070e-9, 22.523],
+    [180, 5.464e-10, 29.740],
+    [200, 2.789e-10, 37.105],
+    [250, 7.248e-11, 45.546],
+    [300, 2.418e-11, 53.628],
+    [350, 9.518e-12, 53.298],
+    [400, 3.725e-12, 58.515],
+    [450, 1.585e-12, 60.828],
+    [500, 6.967e-13, 63.822],
+    [600, 1.454e-13, 71.835],
+    [700, 3.614e-14, 88.667],
+    [800, 1.170e-14, 124.64],
+    [900, 5.245e-15, 181.05],
+    [1000, 3.019e-15, 268.00],
+])
+
+
+class TabulatedAtmosphere:
+    """
+    Piecewise-exponential density model on altitude bands.
+
+    Each band k covers [base[k], base[k+1]) with rho = rho0[k] *
+    exp(-(h - base[k]) / H[k]); the last band extends upwards. A uniform
+    altitude grid maps any altitude to its band, so a lookup is an index
+    computation and one exponential, whatever the number of bands. Scalar
+    altitudes take a pure-Python path (no array overhead per call).
+
+    :param base: Band base altitudes (m), increasing
+    :param rho0: Density at each band base (kg/m^3)
+    :param scale_height: Scale height of each band (m)
+    :param resolution: Spacing of the lookup grid (m); must not exceed the
+        narrowest band
+    """
+    def __init__(self, base, rho0, scale_height, resolution=1000.0):
+        self.base = np.asarray(base, dtype=float)
+        self.rho0 = np.asarray(rho0, dtype=float)
+        self.scale_height = np.asarray(scale_height, dtype=float)
+        self.resolution = resolution
+        if np.min(np.diff(self.base)) < resolution:
+            raise ValueError("Lookup resolution is coarser than the narrowest altitude band")
+
+        # Band of every grid cell. Band edges are multiples of the resolution
+        # in the usual tables; otherwise a cell straddling an edge takes the
+        # lower band, which is continuous up to the table's own accuracy.
+        grid = self.base[0] + resolution * np.arange(int(np.ceil((self.base[-1] - self.base[0]) / resolution)) + 1)
+        self._band = np.searchsorted(self.base, grid + 1e-9 * resolution, side='right') - 1
+        self._inv_scale = 1.0 / self.scale_height
+        self._scalar_tables = (self._band.tolist(), self.base.tolist(), self.rho0.tolist(), self._inv_scale.tolist())
+
+    @classmethod
+    def exponential(cls, resolution=1000.0):
+        """The standard exponential atmosphere (EXPONENTIAL_TABLE)."""
+        return cls(EXPONENTIAL_TABLE[:, 0] * 1e3, EXPONENTIAL_TABLE[:, 1], EXPONENTIAL_TABLE[:, 2] * 1e3, resolution)
+
+    @classmethod
+    def from_profile(cls, altitudes, densities, resolution=1000.0):
+        """
+        Piecewise-exponential fit of a sampled density profile: each
+        interval between samples gets the scale height that matches both
+        end densities.
+        """
+        altitudes = np.asarray(altitudes, dtype=float)
+        densities = np.asarray(densities, dtype=float)
+        scale_height = np.diff(altitudes) / np.log(densities[:-1] / densities[1:])
+        # The top sample continues with the last fitted scale height
+        return cls(altitudes, densities, np.append(scale_height, scale_height[-1]), resolution)
+
+    def density(self, altitude):
+        """Density (kg/m^3) at altitude (m); scalar or array."""
+        if isinstance(altitude, float):
+            band, base, rho0, inv_scale = self._scalar_tables
+            cell = min(max(int((altitude - base[0]) / self.resolution), 0), len(band) - 1)
+            k = band[cell]
+            return rho0[k] * math.exp((base[k] - altitude) * inv_scale[k])
+
+        cell = ((np.asarray(altitude) - self.base[0]) * (1.0 / self.resolution)).astype(np.intp)
+        k = self._band[np.clip(cell, 0, self._band.size - 1)]
+        return self.rho0[k] * np.exp((self.base[k] - altitude) * self._inv_scale[k])
+
+
+def drag_force(atmosphere, states, masses, ballistic_coefficients, radius=config.EARTH_RADIUS,
+               rotation_rate=EARTH_ROTATION_RATE):
+    """
+    Drag force in the inertial frame, F = -1/2 rho |v_rel| v_rel m / B, with
+    the atmosphere co-rotating with the Earth and B = m / (Cd A) the
+    ballistic coefficient (B = inf disables drag). Altitudes are taken above
+    a sphere of the given radius.
+
+    :param states: (13,) state or (N, 13) stacked states
+    :param masses: Mass(es) (kg)
+    :param ballistic_coefficients: Ballistic coefficient(s) (kg/m^2)
+    :return: (3,) or (N, 3) force (N)
+    """
+    if states.ndim == 1:
+        # Single body: plain floats are much cheaper than 3-element arrays
+        x, y, z, vx, vy, vz = states[0:6].tolist()
+        vx += rotation_rate * y # Velocity relative to the rotating atmosphere: v - w_E x r
+        vy -= rotation_rate * x
+        altitude = math.sqrt(x*x + y*y + z*z) - radius
+        scale = -0.5 * atmosphere.density(altitude) * math.sqrt(vx*vx + vy*vy + vz*vz) * (masses / ballistic_coefficients)
+        return np.array((scale * vx, scale * vy, scale * vz))
+
+    r = states[:, 0:3]
+    v_rel = states[:, 3:6].copy()
+    v_rel[:, 0] += rotation_rate * r[:, 1]
+    v_rel[:, 1] -= rotation_rate * r[:, 0]
+    altitude = np.sqrt(np.einsum('ij,ij->i', r, r)) - radius
+    speed = np.sqrt(np.einsum('ij,ij->i', v_rel, v_rel))
+
+    v_rel *= (-0.5 * atmosphere.density(altitude) * speed * (masses / ballistic_coefficients))[:, None]
+    return v_rel
+
+
+def drag_torque(force, attitude, centers_of_pressure):
+    """
+    Body-frame torque of the drag force applied at the center of pressure
+    (body-frame offset from the center of mass).
+
+    :param force: (3,) or (N, 3) inertial drag force (N)
+    :param attitude: (4,) or (N, 4) unit attitude quaternion(s)
+    :param centers_of_pressure: (3,) or (N, 3) offsets (m)
+    :return: (3,) or (N, 3) torque (N m)
+    """
+    force_body = quat_rotate(attitude, force, inverse=True)
+    if force.ndim == 1:
+        fx, fy, fz = force_body.tolist()
+        cx, cy, cz = centers_of_pressure.tolist()
+        return np.array((cy*fz - cz*fy, cz*fx - cx*fz, cx*fy - cy*fx))
+    return np.cross(centers_of_pressure, force_body)
@@ -1,6 +1,8 @@
 import numpy as np
 import config
-from utils import Quaternion
+from utils import quat_normalize, quat_rotate
+from .atmosphere import drag_force, drag_torque
+from .ephemeris import perturbation_force
 
 class Environment:
     def get_forces(self, t, state, body):
@@ -23,14 +25,62 @@ class Environment:
         """
         raise NotImplementedError
 
+    def get_forces_batch(self, t, states, bodies):
+        """
+        Forces on every body of a batch, shape (N, 3).
+
+        Falls back to calling get_forces once per body; environments with
+        array-wide kernels override this.
+
+        :param t: Time (s)
+        :param states: (N, 13) stacked state array
+        :param bodies: Constellation (iterable of bodies, with masses/inertias arrays)
+        """
+        return np.array([self.get_forces(t, x, body) for x, body in zip(states, bodies)])
+
+    def get_torques_batch(self, t, states, bodies):
+        """
+        Torques on every body of a batch, shape (N, 3).
+
+        Falls back to calling get_torques once per body; environments with
+        array-wide kernels override this.
+
+        :param t: Time (s)
+        :param states: (N, 13) stacked state array
+        :param bodies: Constellation (iterable of bodies, with masses/inertias arrays)
+        """
+        return np.array([self.get_torques(t, x, body) for x, body in zip(states, bodies)])
+
 class TwoBodyJ2(Environment):
     """
     Docstring for LEO
+
+    :param atmosphere: Density model (e.g. atmosphere.TabulatedAtmosphere)
+        for drag on bodies with a finite ballistic coefficient; None = no drag
+    :param ephemeris: Sun/Moon ephemeris (ephemeris.ChebyshevEphemeris) for
+        third-body gravity and SRP on bodies with an srp_area; None = neither
+    :param shadow: Earth shadow model for SRP, 'conical' or 'cylindrical'
     """
-    def __init__(self, radius, mass, j2):
+    def __init__(self, radius, mass, j2, atmosphere=None, ephemeris=None, shadow='conical'):
         self.mass = mass
         self.radius = radius
         self.j2 = j2
+        self.atmosphere = atmosphere
+        self.ephemeris = ephemeris
+        self.shadow = shadow
+        self._drag = None # (key, force) of the last drag_force call
+
+    def _drag_force(self, states, masses, ballistic_coefficients):
+        """
+        drag_force, remembered for the last state it was evaluated at, so
+        that the torques of an RHS evaluation reuse the force from the forces.
+
+        :param states: (13,) state or (N, 13) stacked states
+        """
+        key = (states.tobytes(), np.asarray(masses).tobytes(), np.asarray(ballistic_coefficients).tobytes())
+        if self._drag is None or self._drag[0] != key:
+            self._drag = (key, drag_force(self.atmosphere, states, masses, ballistic_coefficients, self.radius))
+        return self._drag[1]
 
     def get_forces(self, t, state, body):
         """
@@ -41,9 +91,6 @@ class TwoBodyJ2(Environment):
         :param state: Description
         """
         r_vec = state[0:3]
-        velocity = state[3:6]
-        attitude = Quaternion(*state[6:10]) # Normalized at initialization
-        omega = state[10:13]
 
         # Precomputations
         x, y, z = r_vec
@@ -64,12 +111,17 @@ class TwoBodyJ2(Environment):
 
         f_j2 = np.array([t_xy * x, t_xy * y, t_z * z])
 
-        # TODO: Drag
-        # TODO: SRP
-
         # Sum all forces
         total_force = f_gravity + f_j2 # In the inertial frame
 
+        # Drag
+        if self.atmosphere is not None:
+            total_force += self._drag_force(state, m_body, body.ballistic_coefficient)
+
+        # Third bodies and SRP
+        if self.ephemeris is not None:
+            total_force += perturbation_force(self.ephemeris, t, r_vec, m_body, body.srp_area, self.shadow, self.radius)
+
         return total_force
     
     def get_torques(self, t, state, body):
@@ -83,20 +135,86 @@ class TwoBodyJ2(Environment):
         """
 
         r_inertial = state[0:3]
-        attitude = Quaternion(*state[6:10]) 
+        attitude = quat_normalize(state[6:10])
         I = body.inertia 
         mu = config.G * config.EARTH_MASS
-        r5 = np.linalg.norm(r_inertial) ** 5
-        r_body = attitude.conjugate().rotate_vector(r_inertial) 
+        r5 = (r_inertial @ r_inertial) ** 2.5
+        r_body = quat_rotate(attitude, r_inertial, inverse=True)
 
         tau_gg = 3*mu * np.cross(r_body, I @ r_body) / r5
 
         tau_total = tau_gg
-        
-        # TODO: Drag
+
+        # Drag
+        if self.atmosphere is not None:
+            f_drag = self._drag_force(state, body.mass, body.ballistic_coefficient)
+            tau_total += drag_torque(f_drag, attitude, body.center_of_pressure)
 
         return tau_total
 
+    def get_forces_batch(self, t, states, bodies):
+        """
+        Vectorized get_forces over all bodies at once.
+
+        :param t: Time (s)
+        :param states: (N, 13) stacked state array
+        :param bodies: Constellation exposing a (N,) masses array
+        """
+        r_vec = states[:, 0:3]
+        z = states[:, 2]
+
+        # Precomputations
+        r_sq = np.einsum('ij,ij->i', r_vec, r_vec)
+        r_mag = np.sqrt(r_sq)
+        m_body = bodies.masses
+        mu_r3 = config.G * self.mass * m_body / (r_mag**3)
+        j2_factor = 1.5 * self.j2 * config.G * self.mass * (self.radius**2) * m_body
+        zr2 = (z**2) / r_sq
+        r5 = r_mag**5
+
+        # Central gravity
+        total_force = -mu_r3[:, None] * r_vec
+
+        # J2
+        t_xy = -j2_factor * (1 - 5*zr2) / r5
+        t_z = -j2_factor * (3 - 5*zr2) / r5
+        total_force[:, 0:2] += t_xy[:, None] * r_vec[:, 0:2]
+        total_force[:, 2] += t_z * z
+
+        # Drag
+        if self.atmosphere is not None:
+            total_force += self._drag_force(states, m_body, bodies.ballistic_coefficients)
+
+        # Third bodies and SRP
+        if self.ephemeris is not None:
+            total_force += perturbation_force(self.ephemeris, t, r_vec, m_body, bodies.srp_areas, self.shadow, self.radius)
+
+        return total_force
+
+    def get_torques_batch(self, t, states, bodies):
+        """
+        Vectorized get_torques over all bodies at once.
+
+        :param t: Time (s)
+        :param states: (N, 13) stacked state array
+        :param bodies: Constellation exposing a (N, 3, 3) inertias array
+        """
+        r_inertial = states[:, 0:3]
+        attitude = quat_normalize(states[:, 6:10])
+        I = bodies.inertias
+        mu = config.G * config.EARTH_MASS
+        r5 = np.einsum('ij,ij->i', r_inertial, r_inertial) ** 2.5
+        r_body = quat_rotate(attitude, r_inertial, inverse=True)
+
+        tau_gg = 3*mu * np.cross(r_body, np.einsum('nij,nj->ni', I, r_body)) / r5[:, None]
+
+        # Drag
+        if self.atmosphere is not None:
+            f_drag = self._drag_force(states, bodies.masses, bodies.ballistic_coefficients)
+            tau_gg += drag_torque(f_drag, attitude, bodies.centers_of_pressure)
+
+        return tau_gg
+
 
 class CR3BP(Environment):
     """
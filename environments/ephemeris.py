@@ -0,0 +1,295 @@
+import math
+from datetime import datetime, timezone
+
+import numpy as np
+
+from utils.constants import (AU, EARTH_RADIUS, JD_J2000, MOON_MU, OBLIQUITY_J2000, SOLAR_PRESSURE,
+                             SUN_MU, SUN_RADIUS)
+
+ARCSEC = np.pi / (180.0 * 3600.0)
+
+
+def julian_date(epoch):
+    """
+    Julian date of an epoch given as an ISO 8601 string or a datetime
+    (naive datetimes are taken as UTC; the UTC/TT offset is ignored, which
+    is well below the accuracy of the analytic series).
+    """
+    if isinstance(epoch, str):
+        epoch = datetime.fromisoformat(epoch)
+    if epoch.tzinfo is None:
+        epoch = epoch.replace(tzinfo=timezone.utc)
+    return 2440587.5 + epoch.timestamp() / 86400.0
+
+
+def _ecliptic_to_equatorial(x, y, z):
+    c, s = np.cos(OBLIQUITY_J2000), np.sin(OBLIQUITY_J2000)
+    return np.stack((x, c*y - s*z, s*y + c*z), axis=-1)
+
+
+def sun_position(jd):
+    """
+    Geocentric Sun position (m, mean equator and equinox of J2000) from the
+    low-precision series of Montenbruck & Gill (Satellite Orbits, 3.3.2),
+    ~0.1% in distance and ~1 arcmin in direction. jd may be an array.
+    """
+    T = (np.asarray(jd, dtype=float) - JD_J2000) / 36525.0
+    M = np.radians(357.5256 + 35999.049 * T)
+    lon = np.radians(282.9400) + M + (6892.0 * np.sin(M) + 72.0 * np.sin(2*M)) * ARCSEC
+    r = (149.619 - 2.499 * np.cos(M) - 0.021 * np.cos(2*M)) * 1e9
+    return _ecliptic_to_equatorial(r * np.cos(lon), r * np.sin(lon), np.zeros_like(r))
+
+
+def moon_position(jd):
+    """
+    Geocentric Moon position (m, mean equator and equinox of J2000) from the
+    low-precision series of Montenbruck & Gill (Satellite Orbits, 3.3.2),
+    a few hundred km. jd may be an array.
+    """
+    T = (np.asarray(jd, dtype=float) - JD_J2000) / 36525.0
+    L0 = np.radians(218.31617 + 481267.88088 * T - 1.3972 * T) # Mean longitude
+    l = np.radians(134.96292 + 477198.86753 * T) # Moon mean anomaly
+    lp = np.radians(357.52543 + 35999.04944 * T) # Sun mean anomaly
+    F = np.radians(93.27283 + 483202.01873 * T) # Argument of latitude
+    D = np.radians(297.85027 + 445267.11135 * T) # Elongation from the Sun
+
+    lon = L0 + ARCSEC * (
+        22640*np.sin(l) + 769*np.sin(2*l) - 4586*np.sin(l - 2*D) + 2370*np.sin(2*D)
+        - 668*np.sin(lp) - 412*np.sin(2*F) - 212*np.sin(2*l - 2*D) - 206*np.sin(l + lp - 2*D)
+        + 192*np.sin(l + 2*D) - 165*np.sin(lp - 2*D) + 148*np.sin(l - lp) - 125*np.sin(D)
+        - 110*np.sin(l + lp) - 55*np.sin(2*F - 2*D)
+    )
+    lat = ARCSEC * (
+        18520*np.sin(F + lon - L0 + ARCSEC * (412*np.sin(2*F) + 541*np.sin(lp)))
+        - 526*np.sin(F - 2*D) + 44*np.sin(l + F - 2*D) - 31*np.sin(-l + F - 2*D)
+        - 25*np.sin(-2*l + F) - 23*np.sin(lp + F - 2*D) + 21*np.sin(-l + F) + 11*np.sin(-lp + F - 2*D)
+    )
+    r = (385000 - 20905*np.cos(l) - 3699*np.cos(2*D - l) - 2956*np.cos(2*D) - 570*np.cos(2*l)
+         + 246*np.cos(2*l - 2*D) - 205*np.cos(lp - 2*D) - 171*np.cos(l + 2*D) - 152*np.cos(l + lp - 2*D)) * 1e3
+    return _ecliptic_to_equatorial(r * np.cos(lon) * np.cos(lat), r * np.sin(lon) * np.cos(lat), r * np.sin(lat))
+
+
+# body: (analytic series, segment length (s), Chebyshev degree)
+BODIES = {
+    'sun': (sun_position, 8 * 86400.0, 10),
+    'moon': (moon_position, 86400.0, 12),
+}
+
+
+class ChebyshevEphemeris:
+    """
+    Sun and Moon positions over a simulation span, as piecewise Chebyshev
+    fits of the analytic series.
+
+    Each body's span is cut into fixed-length segments (BODIES); the series
+    is sampled once at the Chebyshev nodes of every segment, so an
+    evaluation is an O(1) segment lookup and a short polynomial sum. The
+    last few requested times are memoized, since the force and torque
+    models ask for the same time several times per RHS call. Times outside
+    the fitted span fall back to the analytic series.
+
+    :param epoch: Date of sim time t = 0 (ISO string or datetime, UTC)
+    :param t0: Span start (s from epoch)
+    :param tf: Span end (s from epoch)
+    :param bodies: Bodies to fit (keys of BODIES)
+    :param cache_size: Number of memoized times
+    """
+    def __init__(self, epoch, t0, tf, bodies=('sun', 'moon'), cache_size=32):
+        self.epoch = epoch
+        self.jd0 = julian_date(epoch)
+        self.t0 = float(t0)
+        self.tf = float(tf)
+        self.bodies = tuple(bodies)
+        self.cache_size = cache_size
+        self._cache = {}
+        self._fits = {body: self._fit(*BODIES[body]) for body in self.bodies}
+
+    def _fit(self, series, segment, degree):
+        """Chebyshev coefficients (n_segments, degree + 1, 3) of a series."""
+        n_segments = max(1, int(math.ceil((self.tf - self.t0) / segment)))
+        k = np.arange(degree + 1)
+        theta = np.pi * (k + 0.5) / (degree + 1)
+        nodes = np.cos(theta) # on [-1, 1]
+
+        # Sample times of every segment at once: (n_segments, degree + 1)
+        starts = self.t0 + segment * np.arange(n_segments)
+        times = starts[:, None] + 0.5 * segment * (nodes[None, :] + 1.0)
+        samples = series(self.jd0 + times / 86400.0) # (n_segments, degree + 1, 3)
+
+        # c_j = 2/(n) sum_k f(x_k) cos(j theta_k), c_0 halved
+        basis = np.cos(np.outer(k, theta)) * (2.0 / (degree + 1))
+        basis[0] *= 0.5
+        coefficients = np.einsum('jk,skc->sjc', basis, samples)
+        return series, segment, n_segments, coefficients
+
+    def _evaluate(self, body, t):
+        series, segment, n_segments, coefficients = self._fits[body]
+        s = (t - self.t0) / segment
+        if not (0.0 <= s <= n_segments):
+            return series(self.jd0 + t / 86400.0)
+        i = min(int(s), n_segments - 1)
+        x = 2.0 * (s - i) - 1.0
+
+        # T_k(x) by recurrence in plain floats, then one small product
+        degree = coefficients.shape[1]
+        T = [1.0, x]
+        for _ in range(degree - 2):
+            T.append(2.0 * x * T[-1] - T[-2])
+        return np.dot(T[:degree], coefficients[i])
+
+    def positions(self, t):
+        """{body: (3,) geocentric position (m)} at sim time t (s), memoized."""
+        result = self._cache.get(t)
+        if result is None:
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            result = self._cache[t] = {body: self._evaluate(body, t) for body in self.bodies}
+        return result
+
+    def position(self, body, t):
+        """Geocentric position (m) of one body at sim time t (s)."""
+        return self.positions(t)[body]
+
+
+# Gravitational parameters of the third bodies
+BODY_MU = {'sun': SUN_MU, 'moon': MOON_MU}
+
+
+def third_body_acceleration(r, body_position, mu):
+    """
+    Perturbing acceleration of a third body on an Earth orbiter,
+    mu * ((s - r) / |s - r|^3 - s / |s|^3).
+
+    :param r: (3,) or (N, 3) geocentric positions (m)
+    :param body_position: (3,) geocentric position of the third body (m)
+    :param mu: Gravitational parameter of the third body (m^3/s^2)
+    """
+    d = body_position - r
+    d3 = np.sum(d * d, axis=-1, keepdims=True) ** 1.5
+    s3 = (body_position @ body_position) ** 1.5
+    return mu * (d / d3 - body_position / s3)
+
+
+def shadow_fraction(r, sun_position, model='conical', radius=EARTH_RADIUS):
+    """
+    Fraction of the solar disk visible from r (1 = sunlit, 0 = umbra).
+
+    'cylindrical' treats the Earth's shadow as a cylinder (no penumbra);
+    'conical' models umbra and penumbra from the apparent overlap of the
+    solar and Earth disks (Montenbruck & Gill, 3.4.2).
+
+    :param r: (3,) or (N, 3) geocentric positions (m)
+    :param sun_position: (3,) geocentric Sun position (m)
+    """
+    if model == 'cylindrical':
+        u = sun_position / np.sqrt(sun_position @ sun_position)
+        along = r @ u
+        across = np.sqrt(np.maximum(np.sum(r * r, axis=-1) - along**2, 0.0))
+        return np.where((along < 0.0) & (across < radius), 0.0, 1.0)
+
+    d = sun_position - r
+    r_mag = np.sqrt(np.sum(r * r, axis=-1))
+    d_mag = np.sqrt(np.sum(d * d, axis=-1))
+    a = np.arcsin(np.minimum(SUN_RADIUS / d_mag, 1.0)) # Apparent solar radius
+    b = np.arcsin(np.minimum(radius / r_mag, 1.0)) # Apparent Earth radius
+    c = np.arccos(np.clip(-np.sum(r * d, axis=-1) / (r_mag * d_mag), -1.0, 1.0)) # Separation
+
+    # Partial overlap of the two disks
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = (c*c + a*a - b*b) / (2.0 * c)
+        y = np.sqrt(np.maximum(a*a - x*x, 0.0))
+        overlap = a*a * np.arccos(np.clip(x / a, -1.0, 1.0)) + b*b * np.arccos(np.clip((c - x) / b, -1.0, 1.0)) - c*y
+    fraction = 1.0 - overlap / (np.pi * a*a)
+
+    fraction = np.where(c < a - b, 1.0 - (b*b) / (a*a), fraction) # Earth disk inside the Sun's
+    fraction = np.where(c < b - a, 0.0, fraction) # Umbra
+    return np.where(c >= a + b, 1.0, fraction) # No overlap
+
+
+def srp_force(r, sun_position, srp_areas, model='conical', radius=EARTH_RADIUS):
+    """
+    Solar radiation pressure force on a cannonball of area Cr * A,
+    F = nu P (AU / d)^2 Cr A (r - s) / |r - s|, with nu the shadow fraction.
+
+    :param r: (3,) or (N, 3) geocentric positions (m)
+    :param sun_position: (3,) geocentric Sun position (m)
+    :param srp_areas: Cr * A of each body (m^2); 0 disables SRP
+    :param model: Shadow model, 'conical' or 'cylindrical'
+    :return: (3,) or (N, 3) force (N)
+    """
+    away = r - sun_position
+    d2 = np.sum(away * away, axis=-1, keepdims=True)
+    nu = np.expand_dims(shadow_fraction(r, sun_position, model, radius), -1)
+    return (nu * SOLAR_PRESSURE * AU**2 * np.expand_dims(srp_areas, -1)) * away / (d2 * np.sqrt(d2))
+
+
+def _shadow_fraction_scalar(x, y, z, sx, sy, sz, model, radius):
+    """shadow_fraction for one position, in plain floats."""
+    if model == 'cylindrical':
+        s = math.sqrt(sx*sx + sy*sy + sz*sz)
+        along = (x*sx + y*sy + z*sz) / s
+        across_sq = x*x + y*y + z*z - along*along
+        return 0.0 if along < 0.0 and across_sq < radius*radius else 1.0
+
+    dx, dy, dz = sx - x, sy - y, sz - z
+    r_mag = math.sqrt(x*x + y*y + z*z)
+    d_mag = math.sqrt(dx*dx + dy*dy + dz*dz)
+    a = math.asin(min(SUN_RADIUS / d_mag, 1.0))
+    b = math.asin(min(radius / r_mag, 1.0))
+    c = math.acos(min(max(-(x*dx + y*dy + z*dz) / (r_mag * d_mag), -1.0), 1.0))
+    if c >= a + b:
+        return 1.0
+    if c < b - a:
+        return 0.0
+    if c < a - b:
+        return 1.0 - (b*b) / (a*a)
+    u = (c*c + a*a - b*b) / (2.0 * c)
+    v = math.sqrt(max(a*a - u*u, 0.0))
+    overlap = a*a * math.acos(min(max(u / a, -1.0), 1.0)) + b*b * math.acos(min(max((c - u) / b, -1.0), 1.0)) - c*v
+    return 1.0 - overlap / (math.pi * a*a)
+
+
+def perturbation_force(ephemeris, t, r, masses, srp_areas, shadow='conical', radius=EARTH_RADIUS):
+    """
+    Third-body gravity of every ephemeris body plus solar radiation pressure
+    (when the Sun is in the ephemeris and srp_areas is non-zero).
+
+    :param ephemeris: ChebyshevEphemeris
+    :param t: Sim time (s)
+    :param r: (3,) or (N, 3) geocentric positions (m)
+    :param masses: Mass(es) (kg)
+    :param srp_areas: Cr * A of each body (m^2)
+    :param shadow: Shadow model, 'conical' or 'cylindrical'
+    :return: (3,) or (N, 3) force (N)
+    """
+    positions = ephemeris.positions(t)
+    if r.ndim == 1:
+        # Single body: plain floats, as in atmosphere.drag_force
+        x, y, z = r.tolist()
+        fx = fy = fz = 0.0
+        for name, position in positions.items():
+            sx, sy, sz = position.tolist()
+            dx, dy, dz = sx - x, sy - y, sz - z
+            d3 = (dx*dx + dy*dy + dz*dz) ** 1.5
+            s3 = (sx*sx + sy*sy + sz*sz) ** 1.5
+            mu = BODY_MU[name] * masses
+            fx += mu * (dx / d3 - sx / s3)
+            fy += mu * (dy / d3 - sy / s3)
+            fz += mu * (dz / d3 - sz / s3)
+            if name == 'sun' and srp_areas > 0.0:
+                nu = _shadow_fraction_scalar(x, y, z, sx, sy, sz, shadow, radius)
+                if nu > 0.0:
+                    d2 = dx*dx + dy*dy + dz*dz
+                    scale = -nu * SOLAR_PRESSURE * AU**2 * srp_areas / (d2 * math.sqrt(d2)) # d points to the Sun
+                    fx += scale * dx
+                    fy += scale * dy
+                    fz += scale * dz
+        return np.array((fx, fy, fz))
+
+    force = np.zeros_like(r)
+    for name, position in positions.items():
+        force += third_body_acceleration(r, position, BODY_MU[name])
+    force *= np.asarray(masses)[:, None]
+    if 'sun' in positions and np.any(srp_areas):
+        force += srp_force(r, positions['sun'], srp_areas, shadow, radius)
+    return force
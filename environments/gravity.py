@@ -0,0 +1,278 @@
+import numpy as np
+
+import config
+from utils.constants import EARTH_ROTATION_RATE
+
+from .ephemeris import perturbation_force
+from .environment import TwoBodyJ2
+
+
+def read_coefficients(filepath, max_degree=None):
+    """
+    Reads fully normalized Stokes coefficients from a local file.
+
+    Supported formats:
+        - ICGEM .gfc (header with earth_gravity_constant / radius, then
+          'gfc n m C S ...' lines)
+        - plain text tables of 'n m C S ...' rows (e.g. the EGM96/EGM2008
+          coefficient files; Fortran 'D' exponents are accepted)
+        - .npz archives with square 'C' and 'S' arrays and optional 'mu'
+          and 'radius' entries
+
+    :param filepath: Coefficient file
+    :param max_degree: Only keep degrees <= max_degree
+    :return: (C, S, mu, radius); mu and radius are None when the file does
+        not say
+    """
+    if filepath.endswith('.npz'):
+        with np.load(filepath) as data:
+            C, S = data['C'], data['S']
+            mu = float(data['mu']) if 'mu' in data else None
+            radius = float(data['radius']) if 'radius' in data else None
+        if max_degree is not None:
+            C, S = C[:max_degree + 1, :max_degree + 1], S[:max_degree + 1, :max_degree + 1]
+        return C.astype(float), S.astype(float), mu, radius
+
+    mu = radius = None
+    rows = []
+    with open(filepath) as f:
+        lines = iter(f)
+        # 1. Optional ICGEM header
+        for line in lines:
+            fields = line.split()
+            if not fields:
+                continue
+            key = fields[0].lower()
+            if key == 'earth_gravity_constant':
+                mu = float(fields[1].replace('D', 'E').replace('d', 'e'))
+            elif key == 'radius':
+                radius = float(fields[1].replace('D', 'E').replace('d', 'e'))
+            elif key == 'end_of_head':
+                break
+            elif key == 'gfc' or key[0].isdigit():
+                rows.append(fields)
+                break
+
+        # 2. Coefficient rows
+        for line in lines:
+            fields = line.split()
+            if fields:
+                rows.append(fields)
+
+    n_max = 0
+    table = []
+    for fields in rows:
+        if fields[0].lower() in ('gfc', 'gfct'):
+            fields = fields[1:]
+        n, m = int(fields[0]), int(fields[1])
+        if max_degree is not None and n > max_degree:
+            continue
+        c, s = (float(v.replace('D', 'E').replace('d', 'e')) for v in fields[2:4])
+        table.append((n, m, c, s))
+        n_max = max(n_max, n)
+
+    C = np.zeros((n_max + 1, n_max + 1))
+    S = np.zeros((n_max + 1, n_max + 1))
+    for n, m, c, s in table:
+        C[n, m] = c
+        S[n, m] = s
+    return C, S, mu, radius
+
+
+class SphericalHarmonicGravity(TwoBodyJ2):
+    """
+    Degree/order-N gravity field from fully normalized Stokes coefficients.
+
+    The acceleration uses the Cunningham V/W recursion on normalized
+    V_nm/W_nm terms (carried as Z = V + iW), which is Cartesian (no
+    singularity at the poles) and stays within floating point range at high
+    degree. Every recursion and
+    acceleration factor depends only on (n, m), so they are tabulated once
+    per truncation; an evaluation is then a loop over the degree,
+    vectorized over the orders and over all positions at once.
+
+    The field is evaluated in the Earth-fixed frame, rotated from the
+    inertial frame at EARTH_ROTATION_RATE (X axes aligned at t=0, as in
+    utils.frames). Torques (gravity gradient), drag, third bodies and SRP
+    are those of TwoBodyJ2.
+
+    :param C: Normalized cosine coefficients, C[n, m] (C[0, 0] = 1 is assumed when zero)
+    :param S: Normalized sine coefficients, S[n, m]
+    :param radius: Reference radius of the coefficients (m)
+    :param mass: Central body mass (kg)
+    :param degree: Degree truncation (default: every degree in C)
+    :param order: Order truncation (default: degree)
+    :param rotation_rate: Rotation rate of the body-fixed frame (rad/s)
+    :param atmosphere: Density model for drag (see TwoBodyJ2)
+    :param ephemeris: Sun/Moon ephemeris for third bodies and SRP (see TwoBodyJ2)
+    :param shadow: Earth shadow model for SRP (see TwoBodyJ2)
+    """
+    def __init__(self, C, S, radius, mass, degree=None, order=None, rotation_rate=EARTH_ROTATION_RATE, atmosphere=None,
+                 ephemeris=None, shadow='conical'):
+        self.C = np.array(C, dtype=float)
+        self.S = np.array(S, dtype=float)
+        if self.C[0, 0] == 0.0:
+            self.C[0, 0] = 1.0
+        j2 = -np.sqrt(5.0) * self.C[2, 0] if self.C.shape[0] > 2 else 0.0
+        super().__init__(radius, mass, j2, atmosphere, ephemeris, shadow)
+        self.rotation_rate = rotation_rate
+        self.truncate(degree, order)
+
+    @classmethod
+    def from_file(cls, filepath, degree=None, order=None, radius=None, mass=None, **kwargs):
+        """
+        Builds the field from a coefficient file (see read_coefficients).
+        Only degrees up to `degree` are read. The radius and mass default to
+        the file's values, then to config.EARTH_RADIUS / config.EARTH_MASS.
+        """
+        C, S, mu, file_radius = read_coefficients(filepath, degree)
+        if radius is None:
+            radius = file_radius if file_radius is not None else config.EARTH_RADIUS
+        if mass is None:
+            mass = mu / config.G if mu is not None else config.EARTH_MASS
+        return cls(C, S, radius, mass, degree, order, **kwargs)
+
+    def truncate(self, degree=None, order=None):
+        """
+        Sets the degree/order used from now on and rebuilds the tables.
+
+        :param degree: Maximum degree (<= the loaded degree)
+        :param order: Maximum order (default: degree)
+        """
+        loaded = self.C.shape[0] - 1
+        degree = loaded if degree is None else degree
+        if degree > loaded:
+            raise ValueError(f"Degree {degree} requested but the coefficients stop at degree {loaded}")
+        order = degree if order is None else min(order, degree)
+        self.degree = degree
+        self.order = order
+
+        N = degree
+        n = np.arange(N + 2, dtype=float)[:, None]
+        m = np.arange(N + 2, dtype=float)[None, :]
+        lower = m < n
+
+        # 1. Recursion factors for V_nm, m < n (zero where undefined)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            A = np.sqrt((2*n + 1) * (2*n - 1) / ((n - m) * (n + m)))
+            B = np.sqrt((2*n + 1) * (n + m - 1) * (n - m - 1) / ((2*n - 3) * (n + m) * (n - m)))
+        # Stored complex with a trailing axis so the loop multiplies without casts
+        self._A = np.where(lower, A, 0.0).astype(complex)[:, :, None]
+        self._B = np.where(lower & (n >= 2), np.nan_to_num(B), 0.0).astype(complex)[:, :, None]
+
+        # Sectoral factors V_mm <- V_(m-1)(m-1)
+        k = np.arange(2, N + 2, dtype=float)
+        self._sectoral = np.concatenate(([0.0, np.sqrt(3.0)], np.sqrt((2*k + 1) / (2*k))))
+
+        # 2. Acceleration factors for degrees 0..N, orders 0..N
+        n, m = n[:N + 1, :N + 1], m[:, :N + 1]
+        valid = (m <= n) & (m <= order)
+        delta_m0 = (m == 0)
+        delta_m1 = (m == 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # x/y terms in V_(n+1)(m+1), V_(n+1)(m-1) and z term in V_(n+1)m
+            p1 = np.sqrt((2 - delta_m0) / 2 * (2*n + 1) / (2*n + 3) * (n + m + 1) * (n + m + 2))
+            p1 = np.where(delta_m0, p1, 0.5 * p1)
+            p2 = 0.5 * (n - m + 2) * (n - m + 1) * np.sqrt(
+                2 / (2 - delta_m1) * (2*n + 1) / ((2*n + 3) * (n - m + 2) * (n - m + 1)))
+            p3 = (n - m + 1) * np.sqrt((2*n + 1) / (2*n + 3) * (n + m + 1) / (n - m + 1))
+        p2 = np.where(delta_m0, 0.0, p2)
+
+        # Coefficients folded with the factors, combined as C - iS / C + iS
+        # so the V/W sums become complex products with Z = V + iW. Each
+        # table is laid out over the full (n + 1, 0..N + 1) rows of Z, so
+        # the sums are plain products with a contiguous block of Z.
+        C = np.where(valid, self.C[:N + 1, :N + 1], 0.0)
+        S = np.where(valid, self.S[:N + 1, :N + 1], 0.0)
+        K = np.zeros((3, N + 1, N + 2), dtype=complex)
+        K[0, :, 1:] = np.nan_to_num(p1 * (C - 1j*S)) # Z_(n+1)(m+1)
+        K[1, :, :N + 1] = np.nan_to_num(p3 * (C - 1j*S)) # Z_(n+1)m
+        K[2, :, :N] = np.nan_to_num(p2 * (C + 1j*S))[:, 1:].conj() # conj(Z_(n+1)(m-1))
+        self._K = K.reshape(3, -1)
+
+        self._buffers = {}
+
+    def _harmonics(self, r_fixed):
+        """
+        Normalized Z_nm = V_nm + i W_nm for n, m <= degree + 1 at (P, 3)
+        Earth-fixed positions, shape (degree + 2, degree + 2, P).
+        """
+        P = r_fixed.shape[0]
+        N = self.degree + 1
+        if P not in self._buffers:
+            self._buffers[P] = (np.zeros((N + 1, N + 1, P), dtype=complex), np.empty((N + 1, P), dtype=complex))
+        Z, scratch = self._buffers[P]
+
+        x, y, z = r_fixed.T
+        r_sq = x*x + y*y + z*z
+        R = self.radius
+        zR = ((R / r_sq) * z).astype(complex)
+        R2 = (R * R / r_sq).astype(complex)
+        xyR = self._sectoral[:, None] * ((R / r_sq) * (x + 1j*y))
+        A, B = self._A, self._B
+
+        Z[0, 0] = R / np.sqrt(r_sq)
+        for n in range(1, N + 1):
+            # Zonal and tesseral terms (m < n), all orders at once
+            row = Z[n, :n]
+            np.multiply(Z[n - 1, :n], zR, out=row)
+            row *= A[n, :n]
+            if n >= 2:
+                term = scratch[:n]
+                np.multiply(Z[n - 2, :n], R2, out=term)
+                term *= B[n, :n]
+                row -= term
+            # Sectoral term
+            np.multiply(Z[n - 1, n - 1], xyR[n], out=Z[n, n])
+        return Z
+
+    def acceleration_fixed(self, r_fixed):
+        """
+        Gravitational acceleration (P, 3) at Earth-fixed positions (P, 3).
+        """
+        r_fixed = np.atleast_2d(r_fixed)
+        Z = self._harmonics(r_fixed)
+        P = r_fixed.shape[0]
+
+        # Rows n + 1 = 1..N + 1 of Z, all orders (a view, no copy)
+        sums = self._K @ Z[1:].reshape(-1, P)
+        a_xy = sums[2].conj() - sums[0] # ax + i ay
+        a_z = -sums[1].real
+
+        scale = config.G * self.mass / self.radius**2
+        return scale * np.stack((a_xy.real, a_xy.imag, a_z), axis=1)
+
+    def acceleration(self, t, r_inertial):
+        """Gravitational acceleration (P, 3) at inertial positions (P, 3) and time t."""
+        theta = self.rotation_rate * t
+        c, s = np.cos(theta), np.sin(theta)
+        r_inertial = np.atleast_2d(r_inertial)
+
+        r_fixed = np.empty_like(r_inertial)
+        r_fixed[:, 0] = c * r_inertial[:, 0] + s * r_inertial[:, 1]
+        r_fixed[:, 1] = -s * r_inertial[:, 0] + c * r_inertial[:, 1]
+        r_fixed[:, 2] = r_inertial[:, 2]
+
+        a_fixed = self.acceleration_fixed(r_fixed)
+        a_inertial = np.empty_like(a_fixed)
+        a_inertial[:, 0] = c * a_fixed[:, 0] - s * a_fixed[:, 1]
+        a_inertial[:, 1] = s * a_fixed[:, 0] + c * a_fixed[:, 1]
+        a_inertial[:, 2] = a_fixed[:, 2]
+        return a_inertial
+
+    def get_forces(self, t, state, body):
+        force = self.acceleration(t, state[0:3])[0] * body.mass
+        if self.atmosphere is not None:
+            force += self._drag_force(state, body.mass, body.ballistic_coefficient)
+        if self.ephemeris is not None:
+            force += perturbation_force(self.ephemeris, t, state[0:3], body.mass, body.srp_area, self.shadow, self.radius)
+        return force
+
+    def get_forces_batch(self, t, states, bodies):
+        forces = self.acceleration(t, states[:, 0:3]) * bodies.masses[:, None]
+        if self.atmosphere is not None:
+            forces += self._drag_force(states, bodies.masses, bodies.ballistic_coefficients)
+        if self.ephemeris is not None:
+            forces += perturbation_force(self.ephemeris, t, states[:, 0:3], bodies.masses, bodies.srp_areas,
+                                         self.shadow, self.radius)
+        return forces
@@ -1,25 +1,58 @@
+import argparse
 import os
+import shutil
 from datetime import datetime
 
 import numpy as np
 
 import config as cfig
-from core import DataLogger, PhysicsEngine
-from objects import Satellite
+from core import DataLogger, PhysicsEngine, make_integrator
+from core.analytic import MeanElementPropagator
+from core.cache import SOURCE_PACKAGES, ResultCache, run_definition
+from core.checkpoint import load_checkpoint, restore_checkpoint, save_checkpoint
+from core.scheduler import Scheduler
+from core.profiling import Profiler
+from objects import Constellation, Satellite
 from utils import Quaternion
-from environments import TwoBodyJ2
+from environments import ChebyshevEphemeris, SphericalHarmonicGravity, TabulatedAtmosphere, TwoBodyJ2
 
 # The main caller script for my satellite simulation
 
+# GNC hooks of the scheduled loop (run when config.EST_FREQ / CONT_FREQ are set)
+def estimate(t, states):
+    """
+    Estimation step. Placeholder: no estimator is implemented yet, so the
+    states are not used.
+
+    :param t: Sim time (s)
+    :param states: (N, 13) states at t, interpolated inside a physics step (read only)
+    """
+
+def control(t, constellation):
+    """
+    Control step. Placeholder: leaves the held inputs unchanged. A controller
+    sets constellation.control_forces (inertial, N) and control_torques
+    (body, N m), which are held until its next call.
+
+    :param t: Sim time (s)
+    """
+
 # Main loop
-def main():
+def main(resume=None):
+    """
+    :param resume: Checkpoint file (<output>.ckpt.npz) to continue from; the
+        telemetry is appended to that run's file
+    """
     # Initialize the sim
-    output_path = os.path.join("data", f"sim_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-    logger = DataLogger(output_path)
-
-    env = TwoBodyJ2(cfig.EARTH_RADIUS, cfig.EARTH_MASS, cfig.EARTH_J2)
+    atmosphere = TabulatedAtmosphere.exponential() if cfig.ATMOSPHERE == 'exponential' else None
+    ephemeris = ChebyshevEphemeris(cfig.EPOCH, cfig.T0, cfig.TF, cfig.THIRD_BODIES) if cfig.THIRD_BODIES else None
+    if cfig.GRAVITY_FIELD is not None:
+        env = SphericalHarmonicGravity.from_file(cfig.GRAVITY_FIELD, cfig.GRAVITY_DEGREE, cfig.GRAVITY_ORDER, atmosphere=atmosphere,
+                                                 ephemeris=ephemeris, shadow=cfig.SHADOW_MODEL)
+    else:
+        env = TwoBodyJ2(cfig.EARTH_RADIUS, cfig.EARTH_MASS, cfig.EARTH_J2, atmosphere, ephemeris, cfig.SHADOW_MODEL)
 
-    engine = PhysicsEngine(env)
+    engine = PhysicsEngine(env, make_integrator(cfig.INTEGRATOR, **cfig.INTEGRATOR_OPTIONS))
 
     sat1 = Satellite(
         name='Sat1', 
@@ -28,7 +61,10 @@ def main():
         position=np.array((0, 0, 1500000 + cfig.EARTH_RADIUS)), 
         velocity=np.array((9000, 0, 0)),
         attitude=Quaternion(1, 2, 3, 4),
-        angular_velocity=[0.000, 0.000, 0.000]
+        angular_velocity=[0.000, 0.000, 0.000],
+        ballistic_coefficient=150.0,
+        center_of_pressure=(0.0, 0.0, 0.05),
+        srp_area=1.2
     )
     sat2 = Satellite(
         name='Sat2', 
@@ -37,7 +73,10 @@ def main():
         position=np.array((0, 0, 400000 + cfig.EARTH_RADIUS)), 
         velocity=np.array((7800*np.cos(45), 7800*np.sin(45), 0)),
         attitude=Quaternion(1, 2, 3, 4),
-        angular_velocity=[1e-6, 3e-6, -1e-6]
+        angular_velocity=[1e-6, 3e-6, -1e-6],
+        ballistic_coefficient=60.0,
+        center_of_pressure=(0.1, 0.0, 0.0),
+        srp_area=3.0
     )
     sat3 = Satellite(
         name='Sat3', 
@@ -46,35 +85,153 @@ def main():
         position=np.array((8328870.,       0.,       0.)),
         velocity=np.array((    0.       , -5281.6014113,  4521.0159543)),
         attitude=Quaternion(1, 2, 3, 4), 
-        angular_velocity=np.array((1e-12, 0, 0))
+        angular_velocity=np.array((1e-12, 0, 0)),
+        ballistic_coefficient=150.0,
+        center_of_pressure=(0.0, 0.0, 0.05),
+        srp_area=1.2
     )
 
-    constellation = [sat1, sat2, sat3]
+    constellation = Constellation([sat1, sat2, sat3])
+
+    output_path = os.path.join("data", f"sim_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{cfig.LOG_FORMAT}")
+    restart = resume # Checkpoint to continue from
+
+    # Result cache: a run with the same definition reuses the stored telemetry,
+    # continuing from its final state when this run goes further
+    cache = None
+    if cfig.CACHE_DIR is not None and resume is None and cfig.PROPAGATION_MODE not in ('arc', 'analytic'):
+        cache = ResultCache(cfig.CACHE_DIR, cfig.CACHE_MAX_BYTES)
+        key = cache.key(run_definition(constellation, engine, cfig, SOURCE_PACKAGES + ('main.py',)))
+        entry = cache.lookup(key)
+        if entry is not None and entry['tf'] == cfig.TF:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            shutil.copyfile(entry['telemetry'], output_path)
+            print(f"Cache hit: telemetry copied to {output_path}")
+            return
+        elif entry is not None and entry['tf'] < cfig.TF:
+            print(f"Cache hit up to t = {entry['tf']:g} s, continuing")
+            restart = entry['checkpoint']
+        elif entry is not None:
+            cache = None # Only a longer run is cached: run this one without replacing it
+
+    if restart is None:
+        logger = DataLogger(output_path, asynchronous=cfig.LOG_ASYNC, policies=cfig.LOG_POLICY)
+    else:
+        if cfig.PROPAGATION_MODE in ('arc', 'analytic'):
+            raise ValueError(f"Cannot resume in '{cfig.PROPAGATION_MODE}' mode (no checkpoints)")
+        telemetry = load_checkpoint(restart)[0]['telemetry']
+        if resume is not None:
+            output_path = telemetry['filepath']
+        else:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            shutil.copyfile(entry['telemetry'], output_path)
+        logger = DataLogger.resume(output_path, telemetry, fmt=telemetry['fmt'], asynchronous=cfig.LOG_ASYNC,
+                                   policies=cfig.LOG_POLICY)
+    checkpoint_path = os.path.splitext(output_path)[0] + '.ckpt.npz'
+    final_path = os.path.splitext(output_path)[0] + '.final.ckpt.npz'
+
+    profiler = Profiler().attach(engine, logger) if cfig.PROFILE else None
 
     try:
         print(f"Running Sim")
-        logger.log_step(-1, sat1)
-        logger.log_step(-1, sat2)
-        logger.log_step(-1, sat3)
-
-        t = cfig.T0
-        while t < cfig.TF:
-            for sat in constellation:
-                # GNC Step
-
-                # Physics Step
-                engine.propagate(sat, t, cfig.DT)
-
-                # Log the telemetry
-                logger.log_step(t, sat)
-
-
-            t += cfig.DT
+        if restart is None:
+            logger.log_constellation(-1, constellation)
+
+        if cfig.PROPAGATION_MODE == 'arc':
+            # Physics over the whole arc, sampled at the end of every DT step
+            # (same time tags as the step loop below)
+            log_times = np.arange(cfig.T0, cfig.TF, cfig.DT)
+            tracks = [
+                engine.propagate_arc(sat, cfig.T0, log_times[-1] + cfig.DT, log_times + cfig.DT)
+                for sat in constellation
+            ]
+
+            # Log the telemetry
+            for k, t in enumerate(log_times):
+                for sat, track in zip(constellation, tracks):
+                    logger.log_state(t, sat.name, track[k], sat.mass)
+        elif cfig.PROPAGATION_MODE == 'analytic':
+            # Every satellite at every log time in one vectorized call
+            # (J2 secular drift only; attitude is held)
+            log_times = np.arange(cfig.T0, cfig.TF, cfig.DT)
+            propagator = MeanElementPropagator(cfig.EARTH_RADIUS, cfig.EARTH_MASS, cfig.EARTH_J2)
+            states = propagator.propagate_constellation(constellation, cfig.T0, log_times + cfig.DT)
+
+            # Log the telemetry
+            logger.log_trajectories(log_times, constellation.names, states, constellation.masses)
+        else:
+            # Discrete-event loop: GNC and logging run at their own rates and
+            # the physics integrates between their event times, with the
+            # control inputs held in between (zero-order hold)
+            def physics(t, dt, t_eval=None):
+                # Given t_eval, returns the (T, N, 13) states at those times inside the step
+                if cfig.PROPAGATION_MODE == 'batch':
+                    # All satellites in one integrator call
+                    return engine.propagate_batch(constellation, t, dt, t_eval)
+                elif cfig.PROPAGATION_MODE == 'multirate':
+                    # Orbit over dt, attitude sub-cycled
+                    return engine.propagate_multirate(constellation, t, dt, t_eval=t_eval)
+                else:
+                    samples = [engine.propagate(sat, t, dt, t_eval) for sat in constellation]
+                    if t_eval is not None:
+                        return np.stack(samples, axis=1)
+
+            def estimation(t):
+                # Reads the states at t (see Scheduler.state_at), never changes them
+                estimate(t, scheduler.state_at(t))
+
+            def controller(t):
+                # Changes the held inputs, so the physics step ends here
+                control(t, constellation)
+
+            def telemetry(t):
+                # Same time tags as the other modes (state at the end of each DT step)
+                logger.log_constellation(t - cfig.DT, constellation, scheduler.state_at(t))
+
+            def checkpoint(t):
+                # After every other task due at t, so the snapshot is the state between two events
+                save_checkpoint(checkpoint_path, t, constellation, engine, logger, scheduler)
+
+            # Dense output lets the estimator (and, with ORBIT_DT, the logger) run between physics steps
+            dense_output = cfig.PROPAGATION_MODE == 'multirate' or engine.integrator.DENSE_OUTPUT
+            long_orbit_step = cfig.PROPAGATION_MODE == 'multirate' and cfig.ORBIT_DT is not None
+            scheduler = Scheduler(physics, cfig.T0, max_step=cfig.ORBIT_DT if long_orbit_step else cfig.DT,
+                                  sample=lambda: constellation.states.copy(), dense_output=dense_output)
+            if cfig.EST_FREQ:
+                scheduler.add_task('estimator', cfig.EST_FREQ, estimation, priority=0, breaks_physics=False)
+            if cfig.CONT_FREQ:
+                scheduler.add_task('controller', cfig.CONT_FREQ, controller, priority=1)
+            scheduler.add_task('logger', 1.0 / cfig.DT, telemetry, priority=2, start=cfig.T0 + cfig.DT,
+                               breaks_physics=not long_orbit_step)
+            if cfig.CHECKPOINT_INTERVAL:
+                scheduler.add_task('checkpoint', 1.0 / cfig.CHECKPOINT_INTERVAL, checkpoint, priority=3,
+                                   start=cfig.T0 + cfig.CHECKPOINT_INTERVAL)
+            if restart is not None:
+                t_resume = restore_checkpoint(restart, constellation, engine, scheduler)['t']
+                print(f"Resuming from {restart} at t = {t_resume:g} s")
+            scheduler.run(cfig.TF)
+
+            if cache is not None:
+                save_checkpoint(final_path, cfig.TF, constellation, engine, logger, scheduler)
 
     finally:
         logger.close()
         print(f"Telemetry saved to {output_path}")
 
+        if profiler is not None:
+            base = os.path.splitext(output_path)[0]
+            profiler.save(base + '.profile.json', base + '.trace.json')
+            print(profiler.report())
+            print(f"Profile saved to {base}.profile.json (trace: {base}.trace.json)")
+
+    if cache is not None:
+        cache.store(key, cfig.TF, output_path, final_path)
+        print(f"Result cached in {cfig.CACHE_DIR}")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the satellite simulation")
+    parser.add_argument('--resume', type=str, default=None, metavar='CHECKPOINT',
+                        help='Continue an interrupted run from its .ckpt.npz checkpoint')
+    args = parser.parse_args()
+    main(resume=args.resume)
\ No newline at end of file
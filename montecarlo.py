@@ -0,0 +1,66 @@
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+import config as cfig
+from core.montecarlo import Dispersion, run_monte_carlo
+from environments import ChebyshevEphemeris, TabulatedAtmosphere, TwoBodyJ2
+from objects import Satellite
+from utils import Quaternion
+
+# Monte Carlo dispersion campaign around a nominal satellite
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo dispersion runs")
+    parser.add_argument('--runs', '-n', type=int, default=1000, help='Number of dispersed runs')
+    parser.add_argument('--workers', '-j', type=int, default=None, help='Worker processes (default: all CPUs)')
+    parser.add_argument('--seed', type=int, default=0, help='Campaign seed')
+    parser.add_argument('--tf', type=float, default=cfig.TF, help='End time (s)')
+    parser.add_argument('--output-dt', type=float, default=60.0, help='Spacing of the statistics output times (s)')
+    args = parser.parse_args()
+
+    atmosphere = TabulatedAtmosphere.exponential() if cfig.ATMOSPHERE == 'exponential' else None
+    ephemeris = ChebyshevEphemeris(cfig.EPOCH, cfig.T0, args.tf, cfig.THIRD_BODIES) if cfig.THIRD_BODIES else None
+    env = TwoBodyJ2(cfig.EARTH_RADIUS, cfig.EARTH_MASS, cfig.EARTH_J2, atmosphere, ephemeris, cfig.SHADOW_MODEL)
+
+    nominal = Satellite(
+        name='Sat2',
+        mass=500,
+        inertia=np.diag([400, 300, 500]),
+        position=np.array((0, 0, 400000 + cfig.EARTH_RADIUS)),
+        velocity=np.array((7800*np.cos(45), 7800*np.sin(45), 0)),
+        attitude=Quaternion(1, 2, 3, 4),
+        angular_velocity=[1e-6, 3e-6, -1e-6],
+        ballistic_coefficient=60.0,
+        center_of_pressure=(0.1, 0.0, 0.0),
+        srp_area=3.0
+    )
+    dispersion = Dispersion(
+        position=100.0,         # m
+        velocity=0.1,           # m/s
+        attitude=np.radians(1), # rad
+        angular_velocity=1e-4,  # rad/s
+        mass=0.02,
+        inertia=0.05,
+        ballistic_coefficient=0.1,
+        srp_area=0.1
+    )
+
+    times = np.arange(cfig.T0, args.tf + args.output_dt / 2, args.output_dt)
+
+    print(f"Running {args.runs} dispersed runs")
+    start = time.perf_counter()
+    result = run_monte_carlo(nominal, dispersion, env, times, args.runs, seed=args.seed, workers=args.workers)
+    print(f"Done in {time.perf_counter() - start:.1f} s")
+
+    output_path = os.path.join("data", f"mc_{datetime.now().strftime('%Y%m%d_%H%M%S')}.npz")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    result.save(output_path)
+    print(f"Statistics saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
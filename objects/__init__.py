@@ -1,3 +1,4 @@
+from .constellation import Constellation
 from .satellite import Satellite
 
-__all__ = ['Satellite']
\ No newline at end of file
+__all__ = ['Constellation', 'Satellite']
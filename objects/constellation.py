@@ -0,0 +1,183 @@
+import numpy as np
+
+import config
+from utils.orbits import kepler_to_cartesian, mean_to_true
+
+from .satellite import Satellite
+
+
+class Constellation:
+    """
+    Structure-of-arrays store for a set of satellites.
+
+    States, masses, inertias, drag and radiation properties of all bodies
+    live in contiguous arrays (states is (N, 13), masses (N,), inertias
+    (N, 3, 3), ballistic_coefficients (N,), centers_of_pressure (N, 3),
+    srp_areas (N,), control_forces (N, 3), control_torques (N, 3)). The Satellite
+    objects handed to the constellation are rebound as views into these
+    arrays, so per-satellite and whole-constellation code see the same data.
+    """
+    def __init__(self, satellites=()):
+        self._satellites = []
+        self._capacity = 0
+        self._states = np.empty((0, 13))
+        self._masses = np.empty(0)
+        self._inertias = np.empty((0, 3, 3))
+        self._inv_inertias = np.empty((0, 3, 3))
+        self._ballistic_coefficients = np.empty(0)
+        self._centers_of_pressure = np.empty((0, 3))
+        self._srp_areas = np.empty(0)
+        self._control_forces = np.empty((0, 3))
+        self._control_torques = np.empty((0, 3))
+        self._index = {}
+
+        satellites = list(satellites)
+        self._grow(len(satellites))
+        for sat in satellites:
+            self.add(sat)
+
+    def add(self, satellite):
+        """
+        Copies a satellite's data into the store and rebinds it as a view.
+        """
+        n = len(self._satellites)
+        if n == self._capacity:
+            self._grow(max(1, 2 * self._capacity))
+
+        self._states[n] = satellite.state
+        self._masses[n] = satellite.mass
+        self._inertias[n] = satellite.inertia
+        self._inv_inertias[n] = satellite.inv_inertia
+        self._ballistic_coefficients[n] = satellite.ballistic_coefficient
+        self._centers_of_pressure[n] = satellite.center_of_pressure
+        self._srp_areas[n] = satellite.srp_area
+        self._control_forces[n] = satellite.control_force
+        self._control_torques[n] = satellite.control_torque
+
+        self._satellites.append(satellite)
+        self._index[satellite.name] = n
+        self._bind(n)
+
+    @classmethod
+    def walker(cls, total, planes, phasing, altitude, inclination, mass, inertia, pattern='delta', eccentricity=0.0,
+               arg_perigee=0.0, raan0=0.0, prefix='WALKER', mu=None, **satellite):
+        """
+        Walker constellation i: t/p/f of identical satellites, built in one
+        vectorized element-to-state conversion.
+
+        The t satellites are spread over p planes (t/p each, evenly in mean
+        anomaly); the planes' RAANs span 360 deg ('delta') or 180 deg
+        ('star'), and plane j is phased by j * f * 360 / t deg in mean anomaly.
+        Satellites are named <prefix>-<plane>-<slot>, counting from 1.
+
+        :param total: Number of satellites t
+        :param planes: Number of planes p (must divide t)
+        :param phasing: Phasing factor f (0 to p - 1)
+        :param altitude: Semi-major axis above config.EARTH_RADIUS (m)
+        :param inclination: Inclination (deg)
+        :param pattern: 'delta' or 'star'
+        :param eccentricity: Eccentricity of every orbit
+        :param arg_perigee: Argument of perigee (deg)
+        :param raan0: RAAN of the first plane (deg)
+        :param mu: Gravitational parameter (default: Earth)
+        :param satellite: Further Satellite kwargs, shared by all (ballistic_coefficient, srp_area, ...)
+        :return: Constellation
+        """
+        if total % planes:
+            raise ValueError(f"Walker pattern needs the {planes} planes to divide the {total} satellites")
+        if pattern not in ('delta', 'star'):
+            raise ValueError(f"Unknown Walker pattern '{pattern}' (expected 'delta' or 'star')")
+        per_plane = total // planes
+        plane = np.repeat(np.arange(planes), per_plane)
+        slot = np.tile(np.arange(per_plane), planes)
+
+        # 1. Elements of every satellite
+        spread = 2.0 * np.pi if pattern == 'delta' else np.pi
+        raan = np.radians(raan0) + spread * plane / planes
+        mean_anomaly = 2.0 * np.pi * (slot / per_plane + phasing * plane / total)
+        nu = mean_to_true(mean_anomaly, eccentricity)
+
+        # 2. States, all at once
+        positions, velocities = kepler_to_cartesian(config.EARTH_RADIUS + altitude, eccentricity, np.radians(inclination),
+                                                    raan, np.radians(arg_perigee), nu, mu)
+
+        return cls(
+            Satellite(f"{prefix}-{j + 1}-{k + 1}", mass, inertia, positions[n], velocities[n], **satellite)
+            for n, (j, k) in enumerate(zip(plane, slot))
+        )
+
+    def _grow(self, capacity):
+        """Reallocates the arrays and rebinds every satellite to them."""
+        if capacity <= self._capacity:
+            return
+        n = len(self._satellites)
+        for name in ('_states', '_masses', '_inertias', '_inv_inertias', '_ballistic_coefficients', '_centers_of_pressure',
+                     '_srp_areas', '_control_forces', '_control_torques'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:])
+            new[:n] = old[:n]
+            setattr(self, name, new)
+        self._capacity = capacity
+        for i in range(n):
+            self._bind(i)
+
+    def _bind(self, i):
+        self._satellites[i]._bind(
+            self._states[i], self._masses[i:i+1], self._inertias[i], self._inv_inertias[i],
+            self._ballistic_coefficients[i:i+1], self._centers_of_pressure[i],
+            self._srp_areas[i:i+1], self._control_forces[i], self._control_torques[i]
+        )
+
+    # --- Whole-constellation arrays (views) ---
+    @property
+    def states(self):
+        return self._states[:len(self._satellites)]
+
+    @property
+    def masses(self):
+        return self._masses[:len(self._satellites)]
+
+    @property
+    def inertias(self):
+        return self._inertias[:len(self._satellites)]
+
+    @property
+    def inv_inertias(self):
+        return self._inv_inertias[:len(self._satellites)]
+
+    @property
+    def ballistic_coefficients(self):
+        return self._ballistic_coefficients[:len(self._satellites)]
+
+    @property
+    def centers_of_pressure(self):
+        return self._centers_of_pressure[:len(self._satellites)]
+
+    @property
+    def srp_areas(self):
+        return self._srp_areas[:len(self._satellites)]
+
+    @property
+    def control_forces(self):
+        return self._control_forces[:len(self._satellites)]
+
+    @property
+    def control_torques(self):
+        return self._control_torques[:len(self._satellites)]
+
+    @property
+    def names(self):
+        return [sat.name for sat in self._satellites]
+
+    # --- Container protocol ---
+    def __len__(self):
+        return len(self._satellites)
+
+    def __iter__(self):
+        return iter(self._satellites)
+
+    def __getitem__(self, key):
+        """Satellite by position or by name."""
+        if isinstance(key, str):
+            key = self._index[key]
+        return self._satellites[key]
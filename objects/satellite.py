@@ -3,19 +3,37 @@ from utils import Quaternion
 
 class Satellite:
     """
-    Docstring for Satellite
+    A single rigid body.
+
+    All state lives in flat arrays: the 13-element state [r, v, q, w], the
+    mass, the inertia and the drag properties. A standalone Satellite owns
+    its arrays; once added to a Constellation it becomes a view into the
+    constellation's arrays, so reads and writes go straight to the shared
+    storage without copies.
+
+    The ballistic coefficient is m / (Cd A) in kg/m^2 (inf = no drag); the
+    center of pressure is its body-frame offset from the center of mass (m).
+    The SRP area is Cr * A in m^2 (0 = no solar radiation pressure).
+
+    The control force (inertial frame, N) and torque (body frame, N m) are
+    the commanded inputs, held constant by the integrator between control
+    updates (zero-order hold).
     """
+    __slots__ = ('name', '_state', '_mass', '_inertia', '_inv_inertia', '_ballistic_coefficient', '_center_of_pressure',
+                 '_srp_area', '_control_force', '_control_torque')
 
-    def __init__(self, name, mass, inertia, position, velocity, attitude=None, angular_velocity=None):
+    def __init__(self, name, mass, inertia, position, velocity, attitude=None, angular_velocity=None,
+                 ballistic_coefficient=np.inf, center_of_pressure=(0.0, 0.0, 0.0), srp_area=0.0):
         self.name = name
+        self._bind(np.empty(13), np.empty(1), np.empty((3, 3)), np.empty((3, 3)), np.empty(1), np.empty(3), np.empty(1),
+                   np.zeros(3), np.zeros(3))
+
         self.mass = mass
-        self.inertia = np.array(inertia)
-        self.position = np.array(position)
-        self.velocity = np.array(velocity)
+        self.inertia = inertia
+        self.position = position
+        self.velocity = velocity
         if attitude is None:
             self.attitude = Quaternion()
-        elif isinstance(attitude, (list, np.ndarray, tuple)):
-            self.attitude = Quaternion(*attitude)
         else:
             self.attitude = attitude
 
@@ -23,11 +41,135 @@ class Satellite:
         if angular_velocity is None:
             self.angular_velocity = np.zeros(3)
         else:
-            self.angular_velocity = np.array(angular_velocity)
+            self.angular_velocity = angular_velocity
+
+        self.ballistic_coefficient = ballistic_coefficient
+        self.center_of_pressure = center_of_pressure
+        self.srp_area = srp_area
+
+    def _bind(self, state, mass, inertia, inv_inertia, ballistic_coefficient, center_of_pressure, srp_area,
+              control_force, control_torque):
+        """Points the satellite at new storage (views into a Constellation)."""
+        self._state = state
+        self._mass = mass
+        self._inertia = inertia
+        self._inv_inertia = inv_inertia
+        self._ballistic_coefficient = ballistic_coefficient
+        self._center_of_pressure = center_of_pressure
+        self._srp_area = srp_area
+        self._control_force = control_force
+        self._control_torque = control_torque
+
+    # --- Views into the state ---
+    @property
+    def state(self):
+        """Full state [r, v, q, w] (13,), a view."""
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        self._state[:] = value
+
+    @property
+    def position(self):
+        return self._state[0:3]
+
+    @position.setter
+    def position(self, value):
+        self._state[0:3] = value
+
+    @property
+    def velocity(self):
+        return self._state[3:6]
+
+    @velocity.setter
+    def velocity(self, value):
+        self._state[3:6] = value
+
+    @property
+    def attitude(self):
+        """Quaternion wrapping the attitude slice of the state (no copy)."""
+        return Quaternion.from_array(self._state[6:10])
+
+    @attitude.setter
+    def attitude(self, value):
+        if isinstance(value, Quaternion):
+            self._state[6:10] = value.q
+        else:
+            self._state[6:10] = Quaternion(*value).q
+
+    @property
+    def angular_velocity(self):
+        return self._state[10:13]
+
+    @angular_velocity.setter
+    def angular_velocity(self, value):
+        self._state[10:13] = value
+
+    # --- Mass properties ---
+    @property
+    def mass(self):
+        return self._mass[0]
+
+    @mass.setter
+    def mass(self, value):
+        self._mass[0] = value
+
+    @property
+    def inertia(self):
+        return self._inertia
+
+    @inertia.setter
+    def inertia(self, value):
+        self._inertia[:] = value
+        self._inv_inertia[:] = np.linalg.inv(self._inertia)
+
+    @property
+    def inv_inertia(self):
+        return self._inv_inertia
+
+    # --- Drag properties ---
+    @property
+    def ballistic_coefficient(self):
+        return self._ballistic_coefficient[0]
+
+    @ballistic_coefficient.setter
+    def ballistic_coefficient(self, value):
+        self._ballistic_coefficient[0] = value
+
+    @property
+    def center_of_pressure(self):
+        return self._center_of_pressure
+
+    @center_of_pressure.setter
+    def center_of_pressure(self, value):
+        self._center_of_pressure[:] = value
+
+    # --- Radiation properties ---
+    @property
+    def srp_area(self):
+        return self._srp_area[0]
+
+    @srp_area.setter
+    def srp_area(self, value):
+        self._srp_area[0] = value
+
+    # --- Control inputs (zero-order hold) ---
+    @property
+    def control_force(self):
+        return self._control_force
+
+    @control_force.setter
+    def control_force(self, value):
+        self._control_force[:] = value
 
-        # Define the state
-        self.state = np.concatenate((self.position, self.velocity))
+    @property
+    def control_torque(self):
+        return self._control_torque
 
+    @control_torque.setter
+    def control_torque(self, value):
+        self._control_torque[:] = value
 
     def get_thrust_vector(self, current_velocity=None): # TODO: This should really be attitude, not velocity eventually
         """
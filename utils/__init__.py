@@ -1 +1,2 @@
-from .quaternions import Quaternion
\ No newline at end of file
+from .quaternions import (Quaternion, quat_conjugate, quat_multiply,
+                          quat_normalize, quat_rate, quat_rotate, quat_to_dcm)
\ No newline at end of file
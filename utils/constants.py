@@ -5,4 +5,14 @@ G = 6.67430e-11
 EARTH_MASS = 5.972e24
 J2 = 1.08263e-3
 EARTH_RADIUS = 6378137.0  # m (Equatorial)
-EARTH_ROTATION_RATE = 7.2921159e-5  # rad/s (w_e)
\ No newline at end of file
+EARTH_FLATTENING = 1.0 / 298.257223563  # WGS84
+EARTH_ROTATION_RATE = 7.2921159e-5  # rad/s (w_e)
+
+# Third bodies and radiation
+SUN_MU = 1.32712440018e20  # m^3/s^2
+MOON_MU = 4.9028000661e12  # m^3/s^2
+SUN_RADIUS = 6.957e8  # m
+AU = 1.495978707e11  # m
+SOLAR_PRESSURE = 4.56e-6  # N/m^2, solar radiation pressure at 1 AU
+OBLIQUITY_J2000 = np.radians(23.43929111)  # rad, obliquity of the ecliptic
+JD_J2000 = 2451545.0  # Julian date of the J2000 epoch
@@ -1,34 +1,98 @@
 import numpy as np
-from .constants import EARTH_ROTATION_RATE
+from .constants import EARTH_FLATTENING, EARTH_RADIUS, EARTH_ROTATION_RATE
 
 def eci_to_ecef(position_eci, t):
     """
-    Rotates a position vector from Earth-Centered Inertial (ECI) 
+    Rotates position vectors from Earth-Centered Inertial (ECI)
     to Earth-Centered Earth-Fixed (ECEF) frames based on time t.
     Assumes t=0 aligns the X-axes.
+
+    Works on a single (3,) vector at a scalar time or on (..., 3) arrays
+    with times broadcasting against the leading axes, e.g. (T, 3) positions
+    with (T,) times.
     """
-    theta = EARTH_ROTATION_RATE * t
-    
-    # Rotation matrix around Z-axis
+    theta = EARTH_ROTATION_RATE * np.asarray(t, dtype=float)
     c, s = np.cos(theta), np.sin(theta)
-    R = np.array([
-        [ c, s, 0],
-        [-s, c, 0],
-        [ 0, 0, 1]
-    ])
-    
-    return R @ position_eci
+    position_eci = np.asarray(position_eci, dtype=float)
+
+    # Rotation around the Z-axis, applied component-wise
+    x, y = position_eci[..., 0], position_eci[..., 1]
+    position_ecef = np.empty(np.broadcast_shapes(position_eci.shape, np.shape(theta) + (3,)))
+    position_ecef[..., 0] = c * x + s * y
+    position_ecef[..., 1] = -s * x + c * y
+    position_ecef[..., 2] = position_eci[..., 2]
+    return position_ecef
 
 def ecef_to_eci(position_ecef, t):
-    """Inverse rotation (ECEF -> ECI)."""
-    theta = EARTH_ROTATION_RATE * t
-    c, s = np.cos(theta), np.sin(theta)
-    
-    # Transpose of rotation matrix is the inverse
-    R = np.array([
-        [ c, -s, 0],
-        [ s,  c, 0],
-        [ 0,  0, 1]
-    ])
-    
-    return R @ position_ecef
\ No newline at end of file
+    """Inverse rotation (ECEF -> ECI), same shapes as eci_to_ecef."""
+    # The inverse rotation is the rotation by -theta
+    return eci_to_ecef(position_ecef, -np.asarray(t, dtype=float))
+
+def ecef_to_geodetic(position_ecef, radius=EARTH_RADIUS, flattening=EARTH_FLATTENING):
+    """
+    Geodetic latitude, longitude (rad) and altitude (m) of (..., 3) ECEF
+    positions on the reference ellipsoid (Bowring's method, two iterations:
+    sub-millimeter for Earth orbits).
+
+    :return: (latitude, longitude, altitude), each (...)
+    """
+    position_ecef = np.asarray(position_ecef, dtype=float)
+    x, y, z = position_ecef[..., 0], position_ecef[..., 1], position_ecef[..., 2]
+    e2 = flattening * (2.0 - flattening)
+    b = radius * (1.0 - flattening)
+    ep2 = e2 / (1.0 - e2)
+
+    p = np.hypot(x, y)
+    longitude = np.arctan2(y, x)
+    beta = np.arctan2(z, (1.0 - flattening) * p) # Reduced latitude
+    for _ in range(2):
+        latitude = np.arctan2(z + ep2 * b * np.sin(beta)**3, p - e2 * radius * np.cos(beta)**3)
+        beta = np.arctan2((1.0 - flattening) * np.sin(latitude), np.cos(latitude))
+
+    sin_lat = np.sin(latitude)
+    N = radius / np.sqrt(1.0 - e2 * sin_lat**2)
+    altitude = p * np.cos(latitude) + (z + e2 * N * sin_lat) * sin_lat - N
+    return latitude, longitude, altitude
+
+def geodetic_to_ecef(latitude, longitude, altitude, radius=EARTH_RADIUS, flattening=EARTH_FLATTENING):
+    """ECEF position (..., 3) of geodetic coordinates (rad, rad, m)."""
+    e2 = flattening * (2.0 - flattening)
+    sin_lat, cos_lat = np.sin(latitude), np.cos(latitude)
+    N = radius / np.sqrt(1.0 - e2 * sin_lat**2)
+    return np.stack((
+        (N + altitude) * cos_lat * np.cos(longitude),
+        (N + altitude) * cos_lat * np.sin(longitude),
+        (N * (1.0 - e2) + altitude) * sin_lat,
+    ), axis=-1)
+
+def eci_to_geodetic(position_eci, t):
+    """Geodetic latitude, longitude (rad) and altitude (m) of ECI positions at times t."""
+    return ecef_to_geodetic(eci_to_ecef(position_eci, t))
+
+def enu_basis(latitude, longitude):
+    """
+    Local East, North, Up unit vectors (ECEF) at geodetic coordinates,
+    as a (..., 3, 3) array with rows E, N, U.
+    """
+    sin_lat, cos_lat = np.sin(latitude), np.cos(latitude)
+    sin_lon, cos_lon = np.sin(longitude), np.cos(longitude)
+    zero = np.zeros_like(sin_lat * sin_lon)
+    return np.stack((
+        np.stack((-sin_lon + zero, cos_lon + zero, zero), axis=-1),
+        np.stack((-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat + zero), axis=-1),
+        np.stack((cos_lat * cos_lon, cos_lat * sin_lon, sin_lat + zero), axis=-1),
+    ), axis=-2)
+
+def look_angles(site_ecef, basis, target_ecef):
+    """
+    Azimuth (rad, from North towards East), elevation (rad) and range (m)
+    of ECEF targets seen from a site.
+
+    :param site_ecef: (3,) site position (ECEF)
+    :param basis: (3, 3) ENU basis of the site (enu_basis)
+    :param target_ecef: (..., 3) target positions (ECEF)
+    """
+    east, north, up = np.moveaxis((np.asarray(target_ecef) - site_ecef) @ basis.T, -1, 0)
+    horizontal = np.hypot(east, north)
+    azimuth = np.arctan2(east, north) % (2.0 * np.pi)
+    return azimuth, np.arctan2(up, horizontal), np.hypot(horizontal, up)
@@ -0,0 +1,134 @@
+import numpy as np
+
+import config
+
+
+def _mu(mu):
+    return config.G * config.EARTH_MASS if mu is None else mu
+
+
+def solve_kepler(M, e, tol=1e-12, max_iter=30):
+    """
+    Eccentric anomaly E (rad) solving Kepler's equation M = E - e sin(E) for
+    elliptic orbits, vectorized over any broadcastable M and e. Newton
+    iterations from Danby's starter E0 = M + 0.85 e sign(sin M) converge in
+    a handful of steps for every e < 1.
+
+    :param M: Mean anomaly (rad)
+    :param e: Eccentricity
+    :return: E, wrapped like M to [-pi, pi)
+    """
+    M = np.remainder(np.asarray(M, dtype=float) + np.pi, 2.0 * np.pi) - np.pi
+    e = np.asarray(e, dtype=float)
+    E = M + 0.85 * e * np.sign(np.sin(M))
+    for _ in range(max_iter):
+        step = (E - e * np.sin(E) - M) / (1.0 - e * np.cos(E))
+        E = E - step
+        if np.all(np.abs(step) < tol):
+            break
+    return E
+
+
+def eccentric_to_true(E, e):
+    """True anomaly (rad) from the eccentric anomaly."""
+    return 2.0 * np.arctan2(np.sqrt(1.0 + e) * np.sin(0.5 * E), np.sqrt(1.0 - e) * np.cos(0.5 * E))
+
+
+def true_to_eccentric(nu, e):
+    """Eccentric anomaly (rad) from the true anomaly."""
+    return 2.0 * np.arctan2(np.sqrt(1.0 - e) * np.sin(0.5 * nu), np.sqrt(1.0 + e) * np.cos(0.5 * nu))
+
+
+def mean_to_true(M, e):
+    """True anomaly (rad) from the mean anomaly."""
+    return eccentric_to_true(solve_kepler(M, e), e)
+
+
+def true_to_mean(nu, e):
+    """Mean anomaly (rad) from the true anomaly."""
+    E = true_to_eccentric(nu, e)
+    return E - e * np.sin(E)
+
+
+def kepler_to_cartesian(a, e, i, Omega, omega, nu, mu=None):
+    """
+    Converts Keplerian Orbital Elements to Cartesian State Vectors (Inertial Frame).
+
+    Every element may be a scalar or an array; they broadcast together.
+
+    :param a: Semi-major axis (meters)
+    :param e: Eccentricity (dimensionless)
+    :param i: Inclination (radians)
+    :param Omega: Right Ascension of Ascending Node (RAAN) (radians)
+    :param omega: Argument of Perigee (radians)
+    :param nu: True Anomaly (radians)
+    :param mu: Gravitational Parameter (GM). Defaults to Earth if None.
+    :return: (r_vec, v_vec), each (..., 3) in the Inertial Frame
+    """
+    mu = _mu(mu)
+    a, e, i, Omega, omega, nu = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (a, e, i, Omega, omega, nu)))
+
+    # 1. Perifocal (PQW) position and velocity
+    p = a * (1 - e**2) # Semi-latus rectum
+    r_mag = p / (1 + e * np.cos(nu))
+    coeff = np.sqrt(mu / p)
+    r_p, r_q = r_mag * np.cos(nu), r_mag * np.sin(nu)
+    v_p, v_q = -coeff * np.sin(nu), coeff * (e + np.cos(nu))
+
+    # 2. Columns P and Q of R_z(-Omega) @ R_x(-i) @ R_z(-omega)
+    cO, sO = np.cos(Omega), np.sin(Omega)
+    co, so = np.cos(omega), np.sin(omega)
+    ci, si = np.cos(i), np.sin(i)
+    P = np.stack((cO*co - sO*so*ci, sO*co + cO*so*ci, so*si), axis=-1)
+    Q = np.stack((-cO*so - sO*co*ci, -sO*so + cO*co*ci, co*si), axis=-1)
+
+    # 3. Transform
+    r_eci = r_p[..., None] * P + r_q[..., None] * Q
+    v_eci = v_p[..., None] * P + v_q[..., None] * Q
+    return r_eci, v_eci
+
+
+def cartesian_to_kepler(r_vec, v_vec, mu=None, tol=1e-11):
+    """
+    Osculating Keplerian elements of (..., 3) inertial position/velocity
+    arrays.
+
+    Singular geometries follow the usual conventions: for equatorial orbits
+    (i < tol) Omega = 0 and omega is measured from the X axis; for circular
+    orbits (e < tol) omega = 0 and nu is the argument of latitude (the true
+    longitude when also equatorial).
+
+    :return: (a, e, i, Omega, omega, nu), each (...)
+    """
+    mu = _mu(mu)
+    r_vec = np.asarray(r_vec, dtype=float)
+    v_vec = np.asarray(v_vec, dtype=float)
+    r = np.linalg.norm(r_vec, axis=-1)
+    v2 = np.einsum('...i,...i->...', v_vec, v_vec)
+    rv = np.einsum('...i,...i->...', r_vec, v_vec)
+
+    h_vec = np.cross(r_vec, v_vec)
+    h = np.linalg.norm(h_vec, axis=-1)
+    e_vec = ((v2 - mu / r)[..., None] * r_vec - rv[..., None] * v_vec) / mu
+    e = np.linalg.norm(e_vec, axis=-1)
+    a = 1.0 / (2.0 / r - v2 / mu)
+    i = np.arccos(np.clip(h_vec[..., 2] / h, -1.0, 1.0))
+
+    # Node vector k x h
+    n_vec = np.stack((-h_vec[..., 1], h_vec[..., 0], np.zeros_like(h)), axis=-1)
+    n = np.linalg.norm(n_vec, axis=-1)
+    equatorial = n < tol * h
+    circular = e < tol
+    n_hat = np.where(equatorial[..., None], np.array((1.0, 0.0, 0.0)), n_vec / np.where(equatorial, 1.0, n)[..., None])
+    Omega = np.where(equatorial, 0.0, np.arctan2(n_hat[..., 1], n_hat[..., 0]) % (2.0 * np.pi))
+
+    # Angles in the orbit plane measured from the node line, signed with h
+    def plane_angle(u):
+        cos = np.einsum('...i,...i->...', n_hat, u)
+        sin = np.einsum('...i,...i->...', np.cross(n_hat, u), h_vec) / h
+        return np.arctan2(sin, cos) % (2.0 * np.pi)
+
+    e_hat = e_vec / np.where(circular, 1.0, e)[..., None]
+    omega = np.where(circular, 0.0, plane_angle(e_hat))
+    nu = (plane_angle(r_vec / r[..., None]) - omega) % (2.0 * np.pi)
+    return a, e, i, Omega, omega, nu
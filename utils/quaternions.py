@@ -1,5 +1,104 @@
 import numpy as np
 
+# Functional kernels
+# ------------------
+# All kernels work on raw arrays, either a single quaternion (4,) or a stack
+# (N, 4), scalar first [w, x, y, z]. Results are written into `out` when
+# given (it must not alias the inputs, except for quat_normalize), otherwise
+# a new array is returned.
+# Single quaternions take a scalar path: unpacking through tolist() is much
+# cheaper than indexing numpy scalars one by one.
+
+def _components(a):
+    if a.ndim == 1:
+        return a.tolist()
+    return [a[..., i] for i in range(a.shape[-1])]
+
+def quat_multiply(p, q, out=None):
+    """Hamilton product p * q."""
+    if out is None:
+        out = np.empty(np.broadcast_shapes(np.shape(p), np.shape(q)))
+    w1, x1, y1, z1 = _components(p)
+    w2, x2, y2, z2 = _components(q)
+
+    out[..., 0] = w1*w2 - x1*x2 - y1*y2 - z1*z2
+    out[..., 1] = w1*x2 + x1*w2 + y1*z2 - z1*y2
+    out[..., 2] = w1*y2 - x1*z2 + y1*w2 + z1*x2
+    out[..., 3] = w1*z2 + x1*y2 - y1*x2 + z1*w2
+    return out
+
+def quat_conjugate(q, out=None):
+    """Conjugate (inverse rotation for unit quaternions)."""
+    if out is None:
+        out = np.empty(np.shape(q))
+    out[..., 0] = q[..., 0]
+    np.negative(q[..., 1:], out=out[..., 1:])
+    return out
+
+def quat_normalize(q, out=None):
+    """Scales to unit magnitude."""
+    if out is None:
+        out = np.empty(np.shape(q))
+    if q.ndim == 1:
+        np.divide(q, np.sqrt(q @ q), out=out)
+    else:
+        np.divide(q, np.sqrt(np.einsum('...i,...i->...', q, q))[..., None], out=out)
+    return out
+
+def quat_rotate(q, v, out=None, inverse=False):
+    """
+    Rotates 3-vectors v (3,) or (N, 3) by unit quaternions q: v' = q * v * q_conj.
+    With inverse=True applies q_conj * v * q instead (e.g. inertial -> body).
+    """
+    if out is None:
+        out = np.empty(np.broadcast_shapes(np.shape(q)[:-1] + (3,), np.shape(v)))
+    w, ux, uy, uz = _components(q)
+    if inverse:
+        ux, uy, uz = -ux, -uy, -uz
+    vx, vy, vz = _components(v)
+
+    # t = 2 u x v,  v' = v + w t + u x t
+    tx = 2.0 * (uy*vz - uz*vy)
+    ty = 2.0 * (uz*vx - ux*vz)
+    tz = 2.0 * (ux*vy - uy*vx)
+    out[..., 0] = vx + w*tx + uy*tz - uz*ty
+    out[..., 1] = vy + w*ty + uz*tx - ux*tz
+    out[..., 2] = vz + w*tz + ux*ty - uy*tx
+    return out
+
+def quat_to_dcm(q, out=None):
+    """Rotation matrix (3, 3) or (N, 3, 3) such that R @ v == quat_rotate(q, v)."""
+    if out is None:
+        out = np.empty(np.shape(q)[:-1] + (3, 3))
+    w, x, y, z = _components(q)
+
+    out[..., 0, 0] = 1 - 2*(y*y + z*z)
+    out[..., 0, 1] = 2*(x*y - w*z)
+    out[..., 0, 2] = 2*(x*z + w*y)
+    out[..., 1, 0] = 2*(x*y + w*z)
+    out[..., 1, 1] = 1 - 2*(x*x + z*z)
+    out[..., 1, 2] = 2*(y*z - w*x)
+    out[..., 2, 0] = 2*(x*z - w*y)
+    out[..., 2, 1] = 2*(y*z + w*x)
+    out[..., 2, 2] = 1 - 2*(x*x + y*y)
+    return out
+
+def quat_rate(q, omega, out=None):
+    """
+    Kinematic rate q_dot = 0.5 * q * (0, omega), omega in the BODY frame.
+    """
+    if out is None:
+        out = np.empty(np.broadcast_shapes(np.shape(q), np.shape(omega)[:-1] + (4,)))
+    w, x, y, z = _components(q)
+    wx, wy, wz = _components(omega)
+
+    out[..., 0] = -0.5 * (x*wx + y*wy + z*wz)
+    out[..., 1] = 0.5 * (w*wx + y*wz - z*wy)
+    out[..., 2] = 0.5 * (w*wy - x*wz + z*wx)
+    out[..., 3] = 0.5 * (w*wz + x*wy - y*wx)
+    return out
+
+
 class Quaternion:
     def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0, normalize=True):
         # We store it as a numpy array for easy math later
@@ -10,49 +109,40 @@ class Quaternion:
 
     def normalize(self):
         """Ensures the quaternion has unit magnitude."""
-        norm = np.linalg.norm(self.q)
+        norm = np.sqrt(self.q @ self.q)
         if norm > 1e-9:
             self.q /= norm
         else:
             # Fallback to identity if we get a zero vector (avoids NaN)
-            self.q = np.array([1.0, 0.0, 0.0, 0.0])
+            self.q[:] = (1.0, 0.0, 0.0, 0.0)
 
     def rotate_vector(self, vector):
         """
         Rotates a 3D vector using this quaternion.
         Formula: v' = q * v * q_conjugate
         """
-        # 1. Convert vector to pure quaternion (0, vx, vy, vz)
-        v_quat = Quaternion(0, vector[0], vector[1], vector[2], normalize=False)
-        
-        # 2. q * v
-        temp = self @ v_quat
-        
-        # 3. (q * v) * q_inv
-        rotated = temp @ self.conjugate()
-        
-        # Return just the vector part (x, y, z)
-        return rotated.q[1:]
+        return quat_rotate(self.q, np.asarray(vector, dtype=float))
 
     def conjugate(self):
         """Returns the inverse rotation."""
-        w, x, y, z = self.q
-        return Quaternion(w, -x, -y, -z, normalize=False)
+        return Quaternion.from_array(quat_conjugate(self.q))
 
     def __matmul__(self, other):
         """
         Implements the '@' operator for Quaternion Multiplication (Hamilton Product).
         """
-        w1, x1, y1, z1 = self.q
-        w2, x2, y2, z2 = other.q
-        
-        w = w1*w2 - x1*x2 - y1*y2 - z1*z2
-        x = w1*x2 + x1*w2 + y1*z2 - z1*y2
-        y = w1*y2 - x1*z2 + y1*w2 + z1*x2
-        z = w1*z2 + x1*y2 - y1*x2 + z1*w2
-        
-        # Return a new Quaternion object (auto-normalized by init)
-        return Quaternion(w, x, y, z, normalize=False)
+        return Quaternion.from_array(quat_multiply(self.q, other.q))
+
+    @staticmethod
+    def from_array(q):
+        """Wraps an existing (4,) array without copying or normalizing it."""
+        quat = Quaternion.__new__(Quaternion)
+        quat.q = q
+        return quat
+
+    def to_dcm(self):
+        """Rotation matrix (body -> inertial)."""
+        return quat_to_dcm(self.q)
 
     def __repr__(self):
         return f"Quat({self.q[0]:.3f}, [{self.q[1]:.3f}, {self.q[2]:.3f}, {self.q[3]:.3f}])"
@@ -80,15 +170,9 @@ class Quaternion:
         :param omega_vector: Angular velocity (rad/s) in BODY frame [wx, wy, wz]
         :return: A numpy array representing dq/dt (4 elements)
         """
-        # Convert angular velocity vector to a pure quaternion (0, wx, wy, wz)
-        w_quat = Quaternion(0, *omega_vector)
-        
-        # Apply the kinematic equation: q_dot = 0.5 * q * w
-        # Note: We use self @ w_quat because the omega is usually in the Body frame
-        # If omega is in Inertial frame, use w_quat @ self
-        q_dot = (self @ w_quat).q * 0.5
-        
-        return q_dot
+        # Apply the kinematic equation: q_dot = 0.5 * q * (0, w)
+        # Note: omega is in the Body frame, hence q on the left
+        return quat_rate(self.q, np.asarray(omega_vector, dtype=float))
     
     def to_euler(self):
         """
@@ -1,3 +1,8 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
 import matplotlib.animation as animation
 import matplotlib.pyplot as plt
 import numpy as np
@@ -5,22 +10,134 @@ import pandas as pd
 from utils import Quaternion
 
 import config
+from core.telemetry import TelemetryReader, osculating_elements
+
+
+def load_data(filepath, names=None, tstart=None, tend=None):
+    """
+    Loads telemetry into a DataFrame, optionally only some satellites and a
+    time window. Binary (.npy) telemetry is read through the indexed memory
+    map (core.telemetry.TelemetryReader), so only the requested rows are
+    touched; anything else is parsed as CSV and filtered afterwards.
+    """
+    if filepath.endswith('.npy'):
+        return TelemetryReader(filepath).to_frame(names, tstart=tstart, tend=tend)
+
+    data = pd.read_csv(filepath)
+    if names is not None:
+        data = data[data['name'].isin(names)]
+    if tstart is not None:
+        data = data[data['time'] >= tstart]
+    if tend is not None:
+        data = data[data['time'] <= tend]
+    return data
+
+def minmax_indices(y, n_out):
+    """
+    Indices of a min/max decimation of y: the series is cut into n_out // 2
+    equal buckets and the extremes of each are kept (in order), plus the
+    first and last samples. Peaks and jumps (e.g. attitude wraps) survive
+    because both sides of a jump are a bucket's min and max.
+
+    :param y: Samples (n,) or (n, k); for several columns the extremes of
+        every column are kept
+    :param n_out: Point budget
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    y = y.reshape(n, -1)
+    size = -(-n // max(n_out // 2, 1))
+    m = n - n % size
+    blocks = y[:m].reshape(-1, size, y.shape[1])
+    offsets = np.arange(0, m, size)[:, None]
+
+    picks = [offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1)]
+    if m < n:
+        tail = y[m:]
+        picks.append(m + np.concatenate((tail.argmin(axis=0), tail.argmax(axis=0)))[None, :])
+    picks = [pick.ravel() for pick in picks]
+    return np.unique(np.concatenate(picks + [np.array([0, n - 1])]))
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices of a Largest-Triangle-Three-Buckets decimation of (x, y): in
+    each bucket the point forming the largest triangle with the previous
+    pick and the next bucket's mean is kept. Follows the shape of smooth
+    series more closely than min/max, but may drop one side of a jump.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    picks = np.empty(n_out, dtype=int)
+    picks[0], picks[-1] = 0, n - 1
+
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        nxt = slice(hi, edges[k + 2]) if k + 2 < n_out - 1 else slice(n - 1, n)
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        picks[k + 1] = a
+    return picks
+
+def _pixel_budget(ax, max_points=None):
+    """Point budget of a series: two points per horizontal pixel of the axes."""
+    if max_points is not None:
+        return max_points
+    return max(2 * int(ax.get_window_extent().width), 200)
+
+def plot_decimated(ax, x, y, max_points=None, method='minmax', **kwargs):
+    """
+    Plots a time series decimated to the pixel budget of `ax`, and
+    re-decimates it from the full-resolution arrays whenever the x limits
+    change, so zooming into a window brings the detail back.
+
+    :param x: Sorted sample times
+    :param y: Sample values
+    :param max_points: Point budget (default: from the axes width)
+    :param method: 'minmax' (keeps peaks and jumps) or 'lttb'
+    :return: The Line2D
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    def select(lo, hi):
+        i0 = max(np.searchsorted(x, lo, side='left') - 1, 0)
+        i1 = min(np.searchsorted(x, hi, side='right') + 1, x.size)
+        budget = _pixel_budget(ax, max_points)
+        if method == 'lttb':
+            idx = lttb_indices(x[i0:i1], y[i0:i1], budget)
+        else:
+            idx = minmax_indices(y[i0:i1], budget)
+        return x[i0 + idx], y[i0 + idx]
+
+    line, = ax.plot(*select(-np.inf, np.inf), **kwargs)
 
+    def on_xlim(axes):
+        lo, hi = sorted(axes.get_xlim())
+        line.set_data(*select(lo, hi))
 
-def load_data(filepath):
-    return pd.read_csv(filepath)
+    ax.callbacks.connect('xlim_changed', on_xlim)
+    return line
 
-def plot_orbit_3d(data, ax=None):
+def plot_orbit_3d(data, ax=None, max_points=4000):
     """
     Accepts data and an optional Matplotlib Axis object.
+
+    :param max_points: Points per satellite track (min/max decimated per axis)
     """
     if ax is None:
         fig = plt.figure(figsize=(10, 8))
         ax = fig.add_subplot(111, projection='3d')
     
-    # Plot each satellite
-    for name, group in data.groupby('name'):
-        ax.plot(group['rx'], group['ry'], group['rz'], label=name)
+    # Plot each satellite (skipping rows where the orbit was not logged)
+    for name, group in data.dropna(subset=['rx']).groupby('name'):
+        xyz = group.sort_values('time', kind='stable')[['rx', 'ry', 'rz']].to_numpy()
+        xyz = xyz[minmax_indices(xyz, max_points)]
+        ax.plot(xyz[:, 0], xyz[:, 1], xyz[:, 2], label=name)
     
     # Add a wireframe earth for context
     u, v = np.mgrid[0:2*np.pi:20j, 0:np.pi:10j]
@@ -40,20 +157,24 @@ def plot_orbit_3d(data, ax=None):
     
     return ax
 
-def plot_telemetry(data):
+def plot_telemetry(data, max_points=None):
     """
     Creates a 2-panel figure: Altitude and Velocity vs Time.
+
+    :param max_points: Points per series (default: from the axes width);
+        see plot_decimated
     """
     fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(10, 8))
     
     # NEW: Groupby loop
-    for name, group in data.groupby('name'):
+    for name, group in data.dropna(subset=['rx', 'vx']).groupby('name'):
+        group = group.sort_values('time', kind='stable')
         r_mag = np.sqrt(group['rx']**2 + group['ry']**2 + group['rz']**2)
         alt = (r_mag - config.EARTH_RADIUS) / 1000.0
         v_mag = np.sqrt(group['vx']**2 + group['vy']**2 + group['vz']**2)
         
-        ax1.plot(group['time'], alt, label=name)
-        ax2.plot(group['time'], v_mag, label=name)
+        plot_decimated(ax1, group['time'], alt, max_points, label=name)
+        plot_decimated(ax2, group['time'], v_mag, max_points, label=name)
     
     ax1.set_ylabel('Altitude (km)')
     ax1.legend() # Add legend so we know which is which
@@ -64,98 +185,226 @@ def plot_telemetry(data):
     
     plt.tight_layout()
 
-def animate_orbit(data, save_path=None):
+def plot_elements(data, max_points=None):
     """
-    Animates the trajectory of satellites in 3D.
+    Plots the osculating semi-major axis, eccentricity, inclination and RAAN
+    of each satellite vs time (core.telemetry.osculating_elements).
+
+    :param max_points: Points per series (default: from the axes width);
+        see plot_decimated
     """
+    fig, axes = plt.subplots(4, 1, sharex=True, figsize=(10, 12))
+    elements = osculating_elements(data)
+
+    for name, group in elements.groupby('name'):
+        group = group.sort_values('time', kind='stable')
+        plot_decimated(axes[0], group['time'], (group['a'] - config.EARTH_RADIUS) / 1000.0, max_points, label=name)
+        plot_decimated(axes[1], group['time'], group['e'], max_points, label=name)
+        plot_decimated(axes[2], group['time'], group['i'], max_points, label=name)
+        plot_decimated(axes[3], group['time'], group['raan'], max_points, label=name)
+
+    axes[0].set_ylabel('a - R_E (km)')
+    axes[0].set_title('Osculating Elements')
+    axes[0].legend()
+    axes[1].set_ylabel('Eccentricity')
+    axes[2].set_ylabel('Inclination (deg)')
+    axes[3].set_ylabel('RAAN (deg)')
+    axes[3].set_xlabel('Time (s)')
+    for ax in axes:
+        ax.grid(True)
+
+    plt.tight_layout()
+
+def _orbit_tracks(data):
+    """Per-satellite (name, time, xyz) NumPy arrays, sorted by time."""
+    tracks = []
+    for name, group in data.dropna(subset=['rx']).groupby('name'):
+        group = group.sort_values('time', kind='stable')
+        tracks.append((name, group['time'].to_numpy(), group[['rx', 'ry', 'rz']].to_numpy()))
+    return tracks
+
+def _trail_lengths(data, tracks, trail_length):
+    """
+    Per-track trail length (s): trail_length itself, or for 'orbit' one
+    orbital period of each satellite (vis-viva at its first row; whole
+    history if the orbit is not bound or the velocity was not loaded).
+    """
+    if trail_length != 'orbit':
+        return [trail_length] * len(tracks)
+    if not {'vx', 'vy', 'vz'}.issubset(data.columns):
+        return [None] * len(tracks)
+    first = data.dropna(subset=['rx', 'vx']).sort_values('time', kind='stable').groupby('name').first()
+    r = np.linalg.norm(first[['rx', 'ry', 'rz']].to_numpy(), axis=1)
+    v = np.linalg.norm(first[['vx', 'vy', 'vz']].to_numpy(), axis=1)
+    mu = config.G * config.EARTH_MASS
+    a = 1.0 / (2.0 / r - v**2 / mu)
+    periods = dict(zip(first.index, 2 * np.pi * np.sqrt(np.abs(a)**3 / mu)))
+    bound = dict(zip(first.index, a > 0))
+    return [periods[name] if bound.get(name, False) else None for name, _, _ in tracks]
+
+def _frame_rows(tracks, frame_times, trail_lengths):
+    """
+    Precomputes, for every satellite and frame, the row slice [start, stop)
+    of its trail: stop is one past the last row at or before the frame time,
+    start drops rows older than the satellite's trail length in seconds
+    (None = whole history).
+    """
+    rows = []
+    for (_, times, _), trail_length in zip(tracks, trail_lengths):
+        stop = np.searchsorted(times, frame_times, side='right')
+        if trail_length is None:
+            start = np.zeros_like(stop)
+        else:
+            start = np.searchsorted(times, frame_times - trail_length, side='left')
+        rows.append((start, stop))
+    return rows
+
+def _setup_orbit_figure(tracks):
+    """Figure with the Earth, one trail line and head marker per satellite."""
     # 1. Setup the Figure and 3D Axis
     fig = plt.figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
-    
+
     # 2. Plot Static Earth (Wireframe)
     u, v = np.mgrid[0:2*np.pi:20j, 0:np.pi:10j]
     x = config.EARTH_RADIUS * np.cos(u) * np.sin(v)
     y = config.EARTH_RADIUS * np.sin(u) * np.sin(v)
     z = config.EARTH_RADIUS * np.cos(v)
     ax.plot_wireframe(x, y, z, color='gray', alpha=0.3)
-    
+
     # 3. Initialize Lines (Trails) and Points (Current Position)
-    lines = {}
-    points = {}
-    
-    # Group data by satellite so we can access it easily
-    # Dictionary format: {'Sat1': dataframe, 'Sat2': dataframe}
-    sat_groups = {name: group for name, group in data.groupby('name')}
-    
-    # Create empty plot objects for each satellite
-    colors = plt.cm.jet(np.linspace(0, 1, len(sat_groups)))
-    
-    for (name, group), color in zip(sat_groups.items(), colors):
+    colors = plt.cm.jet(np.linspace(0, 1, len(tracks)))
+    lines, points = [], []
+    for (name, _, _), color in zip(tracks, colors):
         # Line: The history trail
         line, = ax.plot([], [], [], lw=1, color=color, label=name)
-        lines[name] = line
-        
+        lines.append(line)
+
         # Point: The current head
         point, = ax.plot([], [], [], marker='o', color=color)
-        points[name] = point
+        points.append(point)
 
     # 4. Set Axis Limits (Crucial! Otherwise the camera jumps around)
     # We find the max extent of ALL data to keep the scale fixed
-    max_val = data[['rx', 'ry', 'rz']].abs().max().max()
+    max_val = max(np.abs(xyz).max() for _, _, xyz in tracks)
     limit = max_val * 1.1 # Add 10% buffer
     ax.set_xlim(-limit, limit)
     ax.set_ylim(-limit, limit)
     ax.set_zlim(-limit, limit)
     ax.set_title("Orbit Animation")
     ax.legend()
-    
+
     # Add a text element for Time
     time_text = ax.text2D(0.05, 0.95, '', transform=ax.transAxes)
 
+    return fig, lines, points, time_text
+
+def _draw_frame(k, frame_times, tracks, rows, lines, points, time_text):
+    """Points the artists at frame k's slices of the track arrays."""
+    time_text.set_text(f"Time: {frame_times[k]:.1f} s")
+    for (_, _, xyz), (start, stop), line, point in zip(tracks, rows, lines, points):
+        s, e = start[k], stop[k]
+        if e == 0:
+            continue # Satellite has no data yet
+        trail = xyz[s:e]
+        line.set_data_3d(trail[:, 0], trail[:, 1], trail[:, 2])
+        point.set_data_3d(xyz[e-1:e, 0], xyz[e-1:e, 1], xyz[e-1:e, 2])
+    return lines + points + [time_text]
+
+def _render_frames(tracks, frame_times, rows, frame_ids, out_dir):
+    """Worker: renders a chunk of frames to PNG files (headless)."""
+    plt.switch_backend('Agg')
+    fig, lines, points, time_text = _setup_orbit_figure(tracks)
+    paths = []
+    for k in frame_ids:
+        _draw_frame(k, frame_times, tracks, rows, lines, points, time_text)
+        path = os.path.join(out_dir, f"frame_{k:06d}.png")
+        fig.savefig(path)
+        paths.append(path)
+    plt.close(fig)
+    return paths
+
+def export_animation(data, save_path, frame_step=50, trail_length='orbit', workers=None, fps=30):
+    """
+    Renders the orbit animation headless, with frames split over worker
+    processes.
+
+    :param save_path: '.gif' to assemble an animated GIF, otherwise a
+                      directory that receives one PNG per frame
+    :param frame_step: Use every frame_step-th logged time as a frame
+    :param trail_length: Trail length in seconds, 'orbit' for one orbital
+                         period per satellite, or None for the whole history
+    :param workers: Worker processes (None = number of CPUs)
+    """
+    tracks = _orbit_tracks(data)
+    frame_times = np.unique(data['time'])[::frame_step]
+    rows = _frame_rows(tracks, frame_times, _trail_lengths(data, tracks, trail_length))
+
+    as_gif = save_path.lower().endswith('.gif')
+    out_dir = tempfile.mkdtemp() if as_gif else save_path
+    os.makedirs(out_dir, exist_ok=True)
+
+    workers = workers or os.cpu_count()
+    chunks = [c for c in np.array_split(np.arange(frame_times.size), workers) if c.size]
+    with ProcessPoolExecutor(len(chunks)) as pool:
+        futures = [pool.submit(_render_frames, tracks, frame_times, rows, chunk, out_dir) for chunk in chunks]
+        paths = [path for future in futures for path in future.result()]
+
+    if as_gif:
+        from PIL import Image
+        frames = [Image.open(path) for path in paths]
+        frames[0].save(save_path, save_all=True, append_images=frames[1:], duration=1000 / fps, loop=0)
+        shutil.rmtree(out_dir)
+    return save_path
+
+def animate_orbit(data, save_path=None, frame_step=50, trail_length='orbit', workers=None):
+    """
+    Animates the trajectory of satellites in 3D.
+
+    Each frame only re-slices per-satellite arrays at precomputed row
+    indices. With the default one-orbit trail a frame draws a bounded number
+    of points, so its cost does not grow with the run length; with
+    trail_length=None it draws the whole history up to the frame time, which
+    grows linearly over the animation.
+
+    :param save_path: Export headless instead of returning the animation
+                      (see export_animation)
+    :param frame_step: Use every frame_step-th logged time as a frame
+    :param trail_length: Trail length in seconds, 'orbit' for one orbital
+                         period per satellite, or None for the whole history
+    """
+    if save_path:
+        print(f"Saving animation to {save_path}...")
+        return export_animation(data, save_path, frame_step, trail_length, workers)
+
+    tracks = _orbit_tracks(data)
+    frame_times = np.unique(data['time'])[::frame_step]
+    rows = _frame_rows(tracks, frame_times, _trail_lengths(data, tracks, trail_length))
+    fig, lines, points, time_text = _setup_orbit_figure(tracks)
+
     # 5. The Update Function (Called every frame)
-    # We get unique timestamps to drive the animation
-    unique_times = data['time'].unique()
-    
-    def update(frame_time):
-        time_text.set_text(f"Time: {frame_time:.1f} s")
-        
-        for name, group in sat_groups.items():
-            # Get data up to this time (Trail)
-            # Optimization: logic can be slow for huge DFs, but fine for MVP
-            history = group[group['time'] <= frame_time]
-            current = group[group['time'] == frame_time]
-            
-            if not current.empty:
-                # Update Line (History)
-                lines[name].set_data(history['rx'], history['ry'])
-                lines[name].set_3d_properties(history['rz'])
-                
-                # Update Point (Head)
-                points[name].set_data(current['rx'], current['ry'])
-                points[name].set_3d_properties(current['rz'])
-                
-        return list(lines.values()) + list(points.values()) + [time_text]
+    def update(k):
+        return _draw_frame(k, frame_times, tracks, rows, lines, points, time_text)
 
     # 6. Create Animation
     # interval=20 means 20ms between frames (50 fps)
-    # frames=unique_times[::10] skips every 10th step to speed up playback
     ani = animation.FuncAnimation(
-        fig, update, frames=unique_times[::50], interval=20, blit=False
+        fig, update, frames=frame_times.size, interval=20, blit=True
     )
+    return ani
     
-    if save_path:
-        print(f"Saving animation to {save_path}...")
-        ani.save(save_path, writer='pillow', fps=30)
-    else:
-        return ani
-    
-def plot_attitude(data):
+def plot_attitude(data, max_points=None):
     """
     Plots Roll, Pitch, and Yaw over time for each satellite.
+
+    :param max_points: Points per series (default: from the axes width);
+        see plot_decimated
     """
     fig, (ax1, ax2, ax3) = plt.subplots(3, 1, sharex=True, figsize=(10, 10))
     
-    for name, group in data.groupby('name'):
+    for name, group in data.dropna(subset=['qw']).groupby('name'):
+        group = group.sort_values('time', kind='stable')
+
         # 1. Extract Quaternion Columns as a Matrix (N, 4)
         q_data = group[['qw', 'qx', 'qy', 'qz']].to_numpy()
         
@@ -166,9 +415,10 @@ def plot_attitude(data):
         euler_deg = np.degrees(euler_rad)
         roll, pitch, yaw = euler_deg[:, 0], euler_deg[:, 1], euler_deg[:, 2]
         
-        ax1.plot(group['time'], roll, label=name)
-        ax2.plot(group['time'], pitch, label=name)
-        ax3.plot(group['time'], yaw, label=name)
+        # 4. Min/max decimation keeps the +/-180 deg wraps as vertical jumps
+        plot_decimated(ax1, group['time'], roll, max_points, label=name)
+        plot_decimated(ax2, group['time'], pitch, max_points, label=name)
+        plot_decimated(ax3, group['time'], yaw, max_points, label=name)
         
     ax1.set_ylabel('Roll (deg)')
     ax1.set_title('Satellite Attitude')